@@ -22,16 +22,26 @@ from AppKit import (
     NSRect,
     NSShiftKeyMask,
     NSString,
+    NSUnionRect,
 )
-from GlyphsApp import MOUSEMOVED, WINDOW_MENU, Glyphs
+from GlyphsApp import MOUSEMOVED, WINDOW_MENU, Glyphs, GetSaveFile
 from GlyphsApp.plugins import ReporterPlugin
+from redArrow.backgroundCheck import BackgroundCheck
+from redArrow.cache import ContourCache
+from redArrow.diskCache import ResultIndex, index_path
 from redArrow.defaults import default_checks, default_options, typechecked_options
 from redArrow.outlineTestGlyphs import OutlineCheck
+from redArrow.pointGrid import PointGrid
+from redArrow.report import ReportWriter
+from redArrow.scan import report_snapshots, scan_snapshots
+from redArrow.snapshot import BaseBoundsCache, LayerSnapshot
+from redArrow.stats import CheckStats
 
 if TYPE_CHECKING:
-    from AppKit import NSPoint
-    from GlyphsApp import GSLayer
+    from AppKit import NSPoint, NSSize
+    from GlyphsApp import GSFont, GSLayer
     from redArrow.outlineTestGlyphs import OutlineError, OutlineWarning
+    from redArrow.scan import GlyphVerdictTuple
     from redArrow.typing import PointTuple, RedArrowOptionsDict
 
 
@@ -55,6 +65,69 @@ def full_libkey(key):
     return "%s.%s" % (plugin_id, key)
 
 
+def make_unit_arrow() -> "NSBezierPath":
+    """
+    Return the outline of an arrow of length 1, pointing right to the origin.
+    """
+    head_ratio = 0.7
+    w = 0.5
+    tail_width = 0.3
+    chin = 0.5 * (w - w * tail_width)  # part under the head
+
+    path = NSBezierPath.alloc().init()
+    path.moveToPoint_((0, 0))
+    path.relativeLineToPoint_((-head_ratio, w * 0.5))
+    path.relativeLineToPoint_((0, -chin))
+    path.relativeLineToPoint_((-(1 - head_ratio), 0))
+    path.relativeLineToPoint_((0, -w * tail_width))
+    path.relativeLineToPoint_((1 - head_ratio, 0))
+    path.relativeLineToPoint_((0, -chin))
+    path.closePath()
+    return path
+
+
+class ErrorMarker:
+    """
+    What is drawn for the errors at one position. It is computed once per check
+    result, so that drawing only needs to apply the zoom-dependent size.
+    """
+
+    __slots__ = ("position", "label", "level", "angle", "transform", "unspecified")
+
+    def __init__(
+        self,
+        position: "NSPoint",
+        label: str,
+        level: str,
+        vector: "PointTuple | None",
+        unspecified: bool = False,
+    ) -> None:
+        """
+        Args:
+            position (NSPoint): The position of the arrow tip or circle center
+            label (str): The label text
+            level (str): "e" if any of the errors is an error, "w" for warnings
+            vector (PointTuple | None): The vector the arrow points along
+            unspecified (bool, optional): Whether the errors have no position and
+                are shown as a circle beside the glyph. Defaults to False.
+        """
+        if vector is None:
+            vector = normal_vector
+        self.position = position
+        self.label = label
+        self.level = level
+        # The angle of the arrow, which also decides the side of the label
+        self.angle = atan2(vector[0], -vector[1])
+        self.unspecified = unspecified
+        # Moves and rotates the arrow and the label to the error position
+        self.transform = NSAffineTransform.transform()
+        self.transform.translateXBy_yBy_(position.x, position.y)
+        if unspecified:
+            self.transform.rotateByRadians_(atan2(vector[1], vector[0]))
+        else:
+            self.transform.rotateByRadians_(self.angle)
+
+
 class RedArrow(ReporterPlugin):
     @objc.python_method
     def settings(self) -> None:
@@ -91,14 +164,40 @@ class RedArrow(ReporterPlugin):
 
     @objc.python_method
     def start(self) -> None:
+        # Timing statistics of the checks, only collected if enabled
+        self.check_stats = None
+        if Glyphs.defaults.get(full_libkey("collectStats"), False):
+            self.check_stats = CheckStats()
         self.add_menu_item()
         self.add_window_menu_item()
         self.options = default_options
         self.run_checks = default_checks
         self.errors: "list[OutlineError | OutlineWarning]" = []
+        # The drawing data of the errors, by rounded position
+        self.markers: "dict[tuple[int, int] | None, ErrorMarker]" = {}
+        # The error positions, to find the labels near the mouse pointer
+        self.error_grid = PointGrid(())
+        # The area of the labels near the mouse pointer in view coordinates
+        self.hover_rect: "NSRect | None" = None
         self.mouse_position = NSMakePoint(0, 0)
         self.last_change_date = 0
         self.current_layer: "GSLayer | None" = None
+        # The results of contours, shared by all outline checks
+        self.contour_cache = ContourCache()
+        # The bounds of base glyphs, for reading composites
+        self.base_bounds = BaseBoundsCache()
+        # Checks the current layer on a worker thread, if enabled
+        self.background_check: "BackgroundCheck | None" = None
+        # Drawing resources that are the same for every arrow
+        self.unit_arrow = make_unit_arrow()
+        self.arrow_colors = {
+            "e": NSColor.colorWithCalibratedRed_green_blue_alpha_(*error_color),
+            "w": NSColor.colorWithCalibratedRed_green_blue_alpha_(*warning_color),
+        }
+        # The string, attributes and size of each label text and font size, for
+        # the current zoom level
+        self.label_cache: "dict[tuple[str, float], tuple[NSString, dict, NSSize]]" = {}
+        self.label_cache_scale = None
         self.load_defaults()
 
     @objc.python_method
@@ -119,6 +218,34 @@ class RedArrow(ReporterPlugin):
         newMenuItem.setTarget_(self)
         mainMenu.itemAtIndex_(2).submenu().insertItem_atIndex_(newMenuItem, 12)
 
+        s = objc.selector(self.selectGlyphsWithErrorsInAllLayers, signature=b"v@:@")
+        newMenuItem = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_(
+            Glyphs.localize(
+                {
+                    "en": "Select Glyphs With Outline Errors In All Layers",
+                    "de": "Glyphen mit Outlinefehlern in allen Ebenen auswählen",
+                }
+            ),
+            s,
+            "",
+        )
+        newMenuItem.setTarget_(self)
+        mainMenu.itemAtIndex_(2).submenu().insertItem_atIndex_(newMenuItem, 13)
+
+        s = objc.selector(self.exportOutlineErrors, signature=b"v@:@")
+        newMenuItem = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_(
+            Glyphs.localize(
+                {
+                    "en": "Export Outline Errors…",
+                    "de": "Outlinefehler exportieren …",
+                }
+            ),
+            s,
+            "",
+        )
+        newMenuItem.setTarget_(self)
+        mainMenu.itemAtIndex_(2).submenu().insertItem_atIndex_(newMenuItem, 14)
+
     @objc.python_method
     def add_window_menu_item(self) -> None:
         newMenuItem = NSMenuItem.alloc().init()
@@ -134,6 +261,33 @@ class RedArrow(ReporterPlugin):
         newMenuItem.setTarget_(self)
         Glyphs.menu[WINDOW_MENU].append(newMenuItem)
 
+        newMenuItem = NSMenuItem.alloc().init()
+        newMenuItem.setTitle_(
+            Glyphs.localize(
+                {
+                    "en": "Collect Red Arrow Statistics",
+                    "de": "Red-Arrow-Statistik sammeln",
+                }
+            )
+        )
+        newMenuItem.setAction_(self.toggleStats_)
+        newMenuItem.setTarget_(self)
+        newMenuItem.setState_(int(self.check_stats is not None))
+        Glyphs.menu[WINDOW_MENU].append(newMenuItem)
+
+        newMenuItem = NSMenuItem.alloc().init()
+        newMenuItem.setTitle_(
+            Glyphs.localize(
+                {
+                    "en": "Show Red Arrow Statistics",
+                    "de": "Red-Arrow-Statistik anzeigen",
+                }
+            )
+        )
+        newMenuItem.setAction_(self.showStats_)
+        newMenuItem.setTarget_(self)
+        Glyphs.menu[WINDOW_MENU].append(newMenuItem)
+
     @objc.python_method
     def load_defaults(self) -> None:
         options = {
@@ -142,10 +296,32 @@ class RedArrow(ReporterPlugin):
         }
         self.options = typechecked_options(options)
         self.run_checks = Glyphs.defaults.get(full_libkey("run-tests"), default_checks)
-        self.outline_check = OutlineCheck(None, self.options, self.run_checks)
-        self.current_layer = None
+        self._make_outline_check()
         Glyphs.redraw()
 
+    @objc.python_method
+    def _make_outline_check(self) -> None:
+        """
+        Set up the outline check for the current options, and the background check
+        if it is enabled. The current layer is checked again at the next redraw.
+        """
+        self.outline_check = OutlineCheck(
+            None, self.options, self.run_checks, self.contour_cache, self.check_stats
+        )
+        if self.background_check is not None:
+            self.background_check.stop()
+            self.background_check = None
+        if Glyphs.defaults.get(full_libkey("backgroundCheck"), False):
+            # The contour cache is not thread-safe, the worker gets its own
+            self.background_check = BackgroundCheck(
+                self.options,
+                self.run_checks,
+                ContourCache(),
+                self.check_stats,
+                self._background_check_finished,
+            )
+        self.current_layer = None
+
     @objc.python_method
     def save_defaults(self, options, run_checks) -> None:
         for k, v in default_options.items():
@@ -154,13 +330,75 @@ class RedArrow(ReporterPlugin):
 
     def mouseDidMove_(self, notification) -> None:
         try:
-            notification.object().window().windowController().activeEditViewController().graphicView().setNeedsDisplay_(
-                True
+            view = (
+                notification.object()
+                .window()
+                .windowController()
+                .activeEditViewController()
+                .graphicView()
             )
         except Exception:
             import traceback
 
             print(traceback.format_exc())
+            return
+
+        # Only the labels near the previous and the current mouse position change
+        try:
+            location = view.getActiveLocation_(Glyphs.currentEvent())
+            rect = self._hover_rect(view, location)
+        except Exception as e:
+            self.logToConsole("mouseDidMove_: %s" % str(e))
+            view.setNeedsDisplay_(True)
+            return
+
+        dirty = self.hover_rect
+        if rect is not None:
+            dirty = rect if dirty is None else NSUnionRect(dirty, rect)
+        self.hover_rect = rect
+        if dirty is not None:
+            view.setNeedsDisplayInRect_(dirty)
+
+    @objc.python_method
+    def _hover_rect(self, view, location: "NSPoint") -> "NSRect | None":
+        """
+        Return the rectangle in view coordinates that contains the labels within
+        range of a mouse position.
+
+        Args:
+            view (GSGlyphEditView): The edit view
+            location (NSPoint): The mouse position relative to the active layer
+
+        Returns:
+            NSRect | None: The rectangle, or None if no label is in range
+        """
+        scale = view.scale()
+        size = Glyphs.defaults.get(full_libkey("arrowSize"), 10) / scale
+        labels = [
+            (self.markers[pos], 2 * size)
+            for pos in self.error_grid.query(location.x, location.y, 1.8 * size)
+        ]
+        marker = self.markers.get(None)
+        if marker is not None:
+            if points_distance(location, marker.position) < 0.9 * size:
+                labels.append((marker, size))
+        if not labels:
+            return None
+
+        rect = None
+        for marker, label_size in labels:
+            _, _, rr = self._label_rect(marker, label_size, scale)
+            # Include the background box of the label
+            box = NSInsetRect(rr, -8 / scale, -6 / scale)
+            rect = box if rect is None else NSUnionRect(rect, box)
+
+        origin = view.activePosition()
+        return NSMakeRect(
+            origin.x + rect.origin.x * scale,
+            origin.y + rect.origin.y * scale,
+            rect.size.width * scale,
+            rect.size.height * scale,
+        )
 
     def willActivate(self) -> None:
         try:
@@ -184,6 +422,8 @@ class RedArrow(ReporterPlugin):
             return
 
         self._update_outline_check(layer)
+        if self.background_check is not None:
+            self._take_background_result()
         # self.logToConsole("foreground: Errors: %s" % self.errors )
 
         try:
@@ -241,12 +481,41 @@ class RedArrow(ReporterPlugin):
         """
         Selects all glyphs with errors in the active layer
         """
+        self._select_glyphs_with_errors()
+
+    def selectGlyphsWithErrorsInAllLayers(self) -> None:
+        """
+        Selects all glyphs with errors in any master or special layer, and prints
+        the layers with errors to the Macro panel
+        """
+        self._select_glyphs_with_errors(all_layers=True)
+
+    def exportOutlineErrors(self) -> None:
+        """
+        Writes the errors of all master and special layers to a JSON Lines or CSV
+        file, and selects the glyphs with errors
+        """
+        self._select_glyphs_with_errors(all_layers=True, export=True)
+
+    @objc.python_method
+    def _select_glyphs_with_errors(
+        self, all_layers: bool = False, export: bool = False
+    ) -> None:
         font = Glyphs.font
         if font is None:
             return None
 
         self.options["grid_length"] = font.gridLength
-        save_global, options, run_checks = self.select_glyphs_options()
+        if export:
+            save_global, options, run_checks = self.select_glyphs_options(
+                title="Export Outline Errors"
+            )
+        elif all_layers:
+            save_global, options, run_checks = self.select_glyphs_options(
+                title="Select Glyphs With Errors In All Layers"
+            )
+        else:
+            save_global, options, run_checks = self.select_glyphs_options()
         if run_checks is None:
             return
         if options is None:
@@ -257,26 +526,159 @@ class RedArrow(ReporterPlugin):
 
         options = typechecked_options(options)
 
+        report = None
+        if export:
+            # The errors are written while the layers are checked, so the errors
+            # of large fonts don't need to be kept in memory
+            report_path = GetSaveFile(
+                message="Export Outline Errors",
+                ProposedFileName="%s errors.jsonl" % font.familyName,
+                filetypes=["jsonl", "csv"],
+            )
+            if not report_path:
+                return
+            try:
+                report = ReportWriter(report_path)
+            except OSError as e:
+                print("Red Arrow: Could not write the report: %s" % e)
+                Glyphs.showMacroWindow()
+                return
+
         font.disableUpdateInterface()
         mid = font.selectedFontMaster.id
         glyphlist = font.glyphs.keys()
+
+        # Read the geometry first, the checks don't need the Glyphs API
+        snapshots = []
+        layer_ids = []
+        layer_names = []
         for glyph_name in glyphlist:
             glyph = font.glyphs[glyph_name]
-            layer = glyph.layers[mid]
-            if layer is not None:
-                outline_check = OutlineCheck(layer, options, run_checks)
+            if all_layers:
+                layers = [
+                    layer
+                    for layer in glyph.layers
+                    if layer.isMasterLayer or layer.isSpecialLayer
+                ]
+            else:
+                layer = glyph.layers[mid]
+                layers = [] if layer is None else [layer]
+            # One snapshot of each topology of the glyph
+            topologies: "list[LayerSnapshot]" = []
+            for layer in layers:
                 try:
-                    outline_check.check_layer()
-                    if len(outline_check.errors) > 0:
-                        glyph.selected = True
-                    else:
-                        glyph.selected = False
+                    snapshot = LayerSnapshot.from_layer(layer, self.base_bounds)
                 except Exception as e:
                     self.logToConsole(
-                        "selectGlyphsWithErrors: Layer '%s': %s" % (glyph_name, str(e))
+                        "selectGlyphsWithErrors: Glyph '%s', layer '%s': %s"
+                        % (glyph_name, layer.name, str(e))
+                    )
+                    continue
+
+                # Compatible layers share the work that depends on the topology
+                if not any(snapshot.share_topology(other) for other in topologies):
+                    topologies.append(snapshot)
+                snapshots.append((glyph_name, snapshot))
+                layer_ids.append(layer.layerId)
+                layer_names.append(layer.name)
+
+        if report is None:
+            verdicts = self._scan_font(
+                font, snapshots, options, run_checks, mid, layer_ids
+            )
+        else:
+            try:
+                try:
+                    verdicts = report_snapshots(
+                        snapshots,
+                        layer_names,
+                        report,
+                        options,
+                        run_checks,
+                        self.contour_cache,
                     )
+                finally:
+                    report.close()
+            except OSError as e:
+                font.enableUpdateInterface()
+                print("Red Arrow: Could not write the report: %s" % e)
+                Glyphs.showMacroWindow()
+                return
+            else:
+                print(
+                    "Red Arrow: %i errors written to %s" % (report.count, report.path)
+                )
+
+        # The names of the layers with errors, by glyph name
+        failed: "dict[str, list[str]]" = {}
+        for verdict, layer_name in zip(verdicts, layer_names):
+            glyph_name, error_count, exception = verdict
+            if exception is None:
+                layer_names_with_errors = failed.setdefault(glyph_name, [])
+                if error_count > 0:
+                    layer_names_with_errors.append(layer_name)
+            else:
+                self.logToConsole(
+                    "selectGlyphsWithErrors: Glyph '%s', layer '%s': %s"
+                    % (glyph_name, layer_name, exception)
+                )
+        for glyph_name, layer_names_with_errors in failed.items():
+            font.glyphs[glyph_name].selected = bool(layer_names_with_errors)
         font.enableUpdateInterface()
 
+        if all_layers:
+            failed_lines = [
+                "%s: %s" % (glyph_name, ", ".join(names))
+                for glyph_name, names in failed.items()
+                if names
+            ]
+            print(
+                "Red Arrow: %i of %i glyphs have errors in these layers:"
+                % (len(failed_lines), len(failed))
+            )
+            print("\n".join(failed_lines))
+            Glyphs.showMacroWindow()
+
+    @objc.python_method
+    def _scan_font(
+        self,
+        font: "GSFont",
+        snapshots: "list[tuple[str, LayerSnapshot]]",
+        options: "RedArrowOptionsDict",
+        run_checks: "list[str]",
+        master_id: str,
+        layer_ids: "list[str]",
+    ) -> "list[GlyphVerdictTuple]":
+        # Results from previous scans of the font are kept on disk
+        result_index = None
+        if font.filepath and Glyphs.defaults.get(full_libkey("resultCache"), True):
+            try:
+                # Room for the results of two scans, so that evicting the
+                # older entries keeps those of the current scan
+                result_index = ResultIndex(
+                    index_path(font.filepath), max(65536, 2 * len(snapshots))
+                )
+                result_index.open()
+            except OSError as e:
+                self.logToConsole("selectGlyphsWithErrors: Result cache: %s" % e)
+                result_index = None
+
+        try:
+            return scan_snapshots(
+                snapshots,
+                options,
+                run_checks,
+                self.contour_cache,
+                parallel=Glyphs.defaults.get(full_libkey("parallelScan"), False),
+                result_index=result_index,
+                master_id=master_id,
+                early_exit=True,
+                layer_ids=layer_ids,
+            )
+        finally:
+            if result_index is not None:
+                result_index.close()
+
     def setRedArrowDefaults_(self, _) -> None:
         font = Glyphs.font
         self.options["grid_length"] = font.gridLength if font else 1
@@ -293,10 +695,33 @@ class RedArrow(ReporterPlugin):
             self.load_defaults()
         else:
             # Apply changes for current session only
-            self.outline_check = OutlineCheck(None, self.options, self.run_checks)
-            self.current_layer = None
+            self._make_outline_check()
             Glyphs.redraw()
 
+    def toggleStats_(self, sender) -> None:
+        """
+        Start or stop collecting the timing statistics of the checks.
+        """
+        collect = self.check_stats is None
+        Glyphs.defaults[full_libkey("collectStats")] = collect
+        self.check_stats = CheckStats() if collect else None
+        sender.setState_(int(collect))
+        self._make_outline_check()
+        Glyphs.redraw()
+
+    def showStats_(self, _) -> None:
+        """
+        Print the timing statistics of the checks to the Macro panel.
+        """
+        if self.check_stats is None:
+            print(
+                "Red Arrow statistics are not collected. Choose Window > Collect Red "
+                "Arrow Statistics first."
+            )
+        else:
+            print(self.check_stats.report())
+        Glyphs.showMacroWindow()
+
     @objc.python_method
     def _update_outline_check(self, layer: "GSLayer") -> None:
         if (
@@ -309,94 +734,139 @@ class RedArrow(ReporterPlugin):
                 "_update_outline_check: '%s' from %s"
                 % (layer.parent.name, layer.parent.parent)
             )
+        # If the same layer was edited, only the changed nodes need to be checked
+        incremental = self.current_layer is layer
         self.current_layer = layer
         self.last_change_date = layer.parent.lastOperationInterval()
-        self.errors = []
+        if self.background_check is not None:
+            self._submit_background_check(layer, incremental)
+            return
+
+        errors = []
         if layer is not None and hasattr(layer, "parent"):
-            # start = time()
             self.options["grid_length"] = layer.parent.parent.gridLength
             self.outline_check.layer = layer
-            self.outline_check.check_layer()
-            # stop = time()
-            self.errors = self.outline_check.errors
-            # print(f"Updated layer check in {round((stop - start) * 1000)} ms.")
-            # print("\n".join([str(e) for e in self.errors]))
+            self.outline_check.check_layer(incremental)
+            errors = self.outline_check.errors
+        self._set_errors(errors)
+
+    @objc.python_method
+    def _submit_background_check(self, layer: "GSLayer", incremental: bool) -> None:
+        """
+        Read the layer geometry and check it on the worker thread. The results of
+        the previous check are drawn until the new ones arrive, but only while the
+        same layer is edited.
+        """
+        if not incremental:
+            self._set_errors([])
+        self.options["grid_length"] = layer.parent.parent.gridLength
+        try:
+            snapshot = LayerSnapshot.from_layer(layer, self.base_bounds)
+        except Exception as e:
+            self.logToConsole("_submit_background_check: %s" % str(e))
+            self._set_errors([])
+            return
+
+        self.background_check.submit(
+            layer, snapshot, self.options, incremental, layer.parent.name or ""
+        )
+
+    @objc.python_method
+    def _background_check_finished(self) -> None:
+        # Called on the worker thread
+        self.performSelectorOnMainThread_withObject_waitUntilDone_(
+            "backgroundCheckFinished:", None, False
+        )
+
+    def backgroundCheckFinished_(self, _) -> None:
+        """
+        Draw the results of a check that finished on the worker thread.
+        """
+        Glyphs.redraw()
+
+    @objc.python_method
+    def _take_background_result(self) -> None:
+        """
+        Use the results of the background check, if new ones have arrived for the
+        current layer.
+        """
+        result = self.background_check.take_result()
+        if result is not None and result[0] is self.current_layer:
+            self._set_errors(result[1])
+
+    @objc.python_method
+    def _set_errors(self, errors: "list[OutlineError | OutlineWarning]") -> None:
+        self.errors = errors
+        self.markers = self._build_markers()
+        self.error_grid = PointGrid(pos for pos in self.markers if pos is not None)
         if DEBUG:
             self.logToConsole("Errors: %s" % self.errors)
 
     @objc.python_method
-    def _draw_arrow(
-        self,
-        position: "NSPoint",
-        kind: str,
-        size: int,
-        vector: "PointTuple | None" = normal_vector,
-        level: str = "e",
+    def _add_arrow(
+        self, path: "NSBezierPath", marker: ErrorMarker, size: float
     ) -> None:
-        if vector is None:
-            vector = normal_vector
-        angle = atan2(vector[0], -vector[1])
-        size *= 2
-        head_ratio = 0.7
-        w = size * 0.5
-        tail_width = 0.3
+        """
+        Append a copy of the unit arrow, moved to the error position, rotated and
+        scaled, to a combined path.
 
-        chin = 0.5 * (w - w * tail_width)  # part under the head
+        Args:
+            path (NSBezierPath): The combined path
+            marker (ErrorMarker): The errors at the arrow position
+            size (float): The length of the arrow
+        """
+        scaled = NSAffineTransform.alloc().initWithTransform_(marker.transform)
+        scaled.scaleBy_(size)
+        arrow = self.unit_arrow.copy()
+        arrow.transformUsingAffineTransform_(scaled)
+        path.appendBezierPath_(arrow)
 
-        if level == "e":
-            arrow_color = error_color
-        else:
-            arrow_color = warning_color
-        NSColor.colorWithCalibratedRed_green_blue_alpha_(*arrow_color).set()
-        t = NSAffineTransform.transform()
-        t.translateXBy_yBy_(position.x, position.y)
-        t.rotateByRadians_(angle)
-        myPath = NSBezierPath.alloc().init()
+    @objc.python_method
+    def _draw_text_label(
+        self, marker: ErrorMarker, size: float, percent: float = 1.0
+    ) -> None:
+        scale = self.getScale()
+        myString, attrs, rr = self._label_rect(marker, size, scale)
+        if percent != 1:
+            attrs = dict(attrs)
+            color = text_color.colorWithAlphaComponent_(percent)
+            attrs[NSForegroundColorAttributeName] = color
 
-        myPath.moveToPoint_((0, 0))
-        myPath.relativeLineToPoint_((-size * head_ratio, w * 0.5))
-        myPath.relativeLineToPoint_((0, -chin))
-        myPath.relativeLineToPoint_((-size * (1 - head_ratio), 0))
-        myPath.relativeLineToPoint_((0, -w * tail_width))
-        myPath.relativeLineToPoint_((size * (1 - head_ratio), 0))
-        myPath.relativeLineToPoint_((0, -chin))
-        myPath.closePath()
-        myPath.transformUsingAffineTransform_(t)
-        myPath.fill()
-
-        percent = 1
-        if not self.show_labels:
-            percent = -points_distance(self.mouse_position, position) / size * 2 + 2
-        if self.show_labels or percent > 0.2:
-            self._draw_text_label(
-                transform=t,
-                text=kind,
-                size=size,
-                vector=vector,
-                percent=percent,
-            )
+        # Draw background box for the text label
+        myRect = NSBezierPath.bezierPathWithRoundedRect_xRadius_yRadius_(
+            NSInsetRect(NSOffsetRect(rr, 0, -1 / scale), -6 / scale, -3 / scale),
+            4 / scale,
+            4 / scale,
+        )
+
+        label_background.colorWithAlphaComponent_(0.8 * percent).setFill()
+        myRect.fill()
+
+        # text_color.colorWithAlphaComponent_(0.8 * percent).setStroke()
+        # myRect.setLineWidth_(0.05 * size)
+        # myRect.stroke()
+
+        myString.drawInRect_withAttributes_(rr, attrs)
 
     @objc.python_method
-    def _draw_text_label(self, transform, text, size, vector, percent=1.0) -> None:
-        if text is None:
-            return
+    def _label_rect(
+        self, marker: ErrorMarker, size: float, scale: float
+    ) -> "tuple[NSString, dict, NSRect]":
+        """
+        Return the string, the text attributes and the text rectangle of a label.
 
-        if vector is None:
-            vector = normal_vector
-        angle = atan2(vector[0], -vector[1])
-        text_size = 0.5 * size
+        Args:
+            marker (ErrorMarker): The errors the label belongs to
+            size (float): The arrow size
+            scale (float): The current zoom level
 
-        attrs = {
-            NSFontAttributeName: NSFont.systemFontOfSize_(text_size),
-            NSForegroundColorAttributeName: text_color.colorWithAlphaComponent_(
-                percent
-            ),
-        }
-        myString = NSString.string().stringByAppendingString_(text)
-        bbox = myString.sizeWithAttributes_(attrs)
+        Returns:
+            tuple[NSString, dict, NSRect]: The string, attributes and rectangle
+        """
+        angle = marker.angle
+        myString, attrs, bbox = self._label_metrics(marker.label, 0.5 * size, scale)
         bw = bbox.width
         bh = bbox.height
-        scale = self.getScale()
 
         text_pt = NSMakePoint(0, 0)
 
@@ -405,51 +875,51 @@ class RedArrow(ReporterPlugin):
         else:
             text_pt.x = -1.3 * size + bw / 2 * cos(angle) + bh / 2 * sin(angle)
 
-        text_pt = transform.transformPoint_(text_pt)
+        text_pt = marker.transform.transformPoint_(text_pt)
 
         rr = NSRect(
             origin=(text_pt.x - bw / 2, text_pt.y - bh / 2),
             size=(bw, bh),
         )
+        return myString, attrs, rr
 
-        # Draw background box for the text label
-        myRect = NSBezierPath.bezierPathWithRoundedRect_xRadius_yRadius_(
-            NSInsetRect(NSOffsetRect(rr, 0, -1 / scale), -6 / scale, -3 / scale),
-            4 / scale,
-            4 / scale,
-        )
+    @objc.python_method
+    def _label_metrics(
+        self, text: str, text_size: float, scale: float
+    ) -> "tuple[NSString, dict, NSSize]":
+        """
+        Return the string, the text attributes and the measured size of a label.
+        They are cached until the zoom level changes.
 
-        label_background.colorWithAlphaComponent_(0.8 * percent).setFill()
-        myRect.fill()
+        Args:
+            text (str): The label text
+            text_size (float): The font size in glyph units
+            scale (float): The current zoom level
 
-        # text_color.colorWithAlphaComponent_(0.8 * percent).setStroke()
-        # myRect.setLineWidth_(0.05 * size)
-        # myRect.stroke()
+        Returns:
+            tuple[NSString, dict, NSSize]: The string, attributes and size
+        """
+        if scale != self.label_cache_scale or len(self.label_cache) > 1000:
+            self.label_cache.clear()
+            self.label_cache_scale = scale
 
-        myString.drawInRect_withAttributes_(rr, attrs)
+        key = (text, text_size)
+        metrics = self.label_cache.get(key)
+        if metrics is None:
+            attrs = {
+                NSFontAttributeName: NSFont.systemFontOfSize_(text_size),
+                NSForegroundColorAttributeName: text_color,
+            }
+            string = NSString.string().stringByAppendingString_(text)
+            metrics = (string, attrs, string.sizeWithAttributes_(attrs))
+            self.label_cache[key] = metrics
+        return metrics
 
     @objc.python_method
-    def _draw_unspecified(
-        self,
-        position: "NSPoint",
-        kind: str,
-        size: int,
-        vector: "PointTuple | None" = normal_vector,
-        level: str = "e",
-    ) -> None:
-        if vector is None:
-            vector = normal_vector
-        angle = atan2(vector[1], vector[0])
+    def _draw_unspecified(self, marker: ErrorMarker, size: float) -> None:
+        position = marker.position
         circle_size = size * 1.3
-        if level == "e":
-            arrow_color = error_color
-        else:
-            arrow_color = warning_color
-        NSColor.colorWithCalibratedRed_green_blue_alpha_(*arrow_color).set()
-
-        t = NSAffineTransform.transform()
-        t.translateXBy_yBy_(position.x, position.y)
-        t.rotateByRadians_(angle)
+        self.arrow_colors[marker.level].set()
 
         myPath = NSBezierPath.alloc().init()
         myPath.setLineWidth_(0)
@@ -464,21 +934,28 @@ class RedArrow(ReporterPlugin):
         myPath.stroke()
         percent = -points_distance(self.mouse_position, position) / size * 2 + 2
         if self.show_labels or percent > 0.2:
-            self._draw_text_label(
-                transform=t,
-                text=kind,
-                size=size,
-                vector=vector,
-                percent=percent,
-            )
+            self._draw_text_label(marker, size, percent)
 
     @objc.python_method
-    def _draw_arrows(self, debug: bool = False) -> None:
-        size = Glyphs.defaults.get(full_libkey("arrowSize"), 10) / self.getScale()
+    def _build_markers(
+        self, debug: bool = False
+    ) -> "dict[tuple[int, int] | None, ErrorMarker]":
+        """
+        Group the errors by their rounded position and compute what is drawn for
+        each group.
+
+        Args:
+            debug (bool, optional): Whether to show the badness of errors. Defaults
+                to False.
+
+        Returns:
+            dict[tuple[int, int] | None, ErrorMarker]: The marker for each position.
+                Errors without position are grouped under None.
+        """
         errors_by_position: "dict[tuple[int, int] | None, list[OutlineError | OutlineWarning]]" = {}
         for e in self.errors:
-            if e.position is not None:
-                pos_key = (int(e.position.x), int(e.position.y))
+            if e.x is not None:
+                pos_key = (int(e.x), int(e.y))
                 if pos_key in errors_by_position:
                     errors_by_position[pos_key].append(e)
                 else:
@@ -488,6 +965,7 @@ class RedArrow(ReporterPlugin):
                     errors_by_position[None].append(e)
                 else:
                     errors_by_position[None] = [e]
+        markers = {}
         for pos, errors in errors_by_position.items():
             message = ""
             level = "w"
@@ -511,9 +989,49 @@ class RedArrow(ReporterPlugin):
                     vector = e.vector
             if pos is None:
                 x = 20 if self.current_layer is None else self.current_layer.width + 20
-                p = NSMakePoint(x, -10)
-                self._draw_unspecified(p, message.strip(", "), size, vector, level)
+                markers[pos] = ErrorMarker(
+                    NSMakePoint(x, -10), message.strip(", "), level, vector, True
+                )
             else:
-                self._draw_arrow(
-                    NSMakePoint(*pos), message.strip(", "), size, vector, level
+                markers[pos] = ErrorMarker(
+                    NSMakePoint(*pos), message.strip(", "), level, vector
+                )
+        return markers
+
+    @objc.python_method
+    def _draw_arrows(self) -> None:
+        size = Glyphs.defaults.get(full_libkey("arrowSize"), 10) / self.getScale()
+        near = set()
+        if not self.show_labels:
+            # Labels are shown up to 1.8 arrow sizes from the mouse pointer
+            near = set(
+                self.error_grid.query(
+                    self.mouse_position.x, self.mouse_position.y, 1.8 * size
                 )
+            )
+        # The arrows of each level are collected in one path, and the labels are
+        # drawn on top of all arrows
+        arrow_paths = {
+            "e": NSBezierPath.alloc().init(),
+            "w": NSBezierPath.alloc().init(),
+        }
+        labels = []
+        for pos, marker in self.markers.items():
+            if marker.unspecified:
+                self._draw_unspecified(marker, size)
+                continue
+
+            self._add_arrow(arrow_paths[marker.level], marker, 2 * size)
+            if self.show_labels:
+                labels.append((marker, 1))
+            elif pos in near:
+                d = points_distance(self.mouse_position, marker.position)
+                percent = 2 - d / size
+                if percent > 0.2:
+                    labels.append((marker, percent))
+
+        for level, path in arrow_paths.items():
+            self.arrow_colors[level].set()
+            path.fill()
+        for marker, percent in labels:
+            self._draw_text_label(marker, 2 * size, percent)
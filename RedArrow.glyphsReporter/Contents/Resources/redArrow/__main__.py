@@ -0,0 +1,230 @@
+"""
+Check the outlines of .glyphs files or .glyphspackages without Glyphs.
+
+Run from the folder that contains the redArrow module:
+
+    python -m redArrow MyFont.glyphs
+"""
+
+import argparse
+import sys
+from typing import Any, Sequence
+
+from redArrow.cache import ContourCache
+from redArrow.defaults import default_checks, default_options, typechecked_options
+from redArrow.glyphsFile import GlyphsSource
+from redArrow.outlineTestGlyphs import OutlineCheck
+from redArrow.report import ReportWriter, report_formats
+from redArrow.stats import CheckStats
+
+
+def _parse_option(value: str) -> tuple[str, Any]:
+    key, sep, v = value.partition("=")
+    if not sep or key not in default_options:
+        raise argparse.ArgumentTypeError(
+            "Options must be given as KEY=VALUE with one of the keys: %s"
+            % ", ".join(default_options)
+        )
+
+    if isinstance(default_options[key], bool):
+        if v.lower() in ("true", "yes", "1"):
+            return key, True
+        if v.lower() in ("false", "no", "0"):
+            return key, False
+        raise argparse.ArgumentTypeError(f"Invalid value for option {key}: '{v}'")
+
+    try:
+        return key, int(v)
+    except ValueError:
+        pass
+    try:
+        return key, float(v)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid value for option {key}: '{v}'")
+
+
+def _parse_check(value: str) -> str:
+    name = value if value.startswith("test_") else f"test_{value}"
+    if name not in default_checks:
+        raise argparse.ArgumentTypeError(
+            "Unknown check '%s', use one of: %s"
+            % (value, ", ".join(c[5:] for c in default_checks))
+        )
+    return name
+
+
+def check_font(
+    path: str,
+    options: dict[str, Any],
+    run_checks: Sequence[str],
+    masters: Sequence[str] | None = None,
+    cache: ContourCache | None = None,
+    stats: CheckStats | None = None,
+    max_errors: int | None = None,
+    report: ReportWriter | None = None,
+) -> int:
+    """
+    Check the master layers of a font and print the errors.
+
+    Args:
+        path (str): The path of the .glyphs file or .glyphspackage
+        options (dict[str, Any]): The options for each check. If the grid length
+            is not given, the grid length of the font is used.
+        run_checks (Sequence[str]): The names of the checks to be run
+        masters (Sequence[str] | None, optional): The names or ids of the masters
+            to check. Defaults to None, which means all masters.
+        cache (ContourCache | None, optional): The contour cache. Defaults to None.
+        stats (CheckStats | None, optional): The statistics of the checks are
+            collected in it, if given. Defaults to None.
+        max_errors (int | None, optional): The maximum number of errors to print
+            for each layer. The checks of a layer stop when it is reached. Defaults
+            to None, which means all errors.
+        report (ReportWriter | None, optional): The errors are written to it
+            instead of being printed, if given. Defaults to None.
+
+    Returns:
+        int: The number of errors and warnings
+    """
+    source = GlyphsSource(path)
+    source.read()
+
+    options = dict(options)
+    options.setdefault("grid_length", source.grid_length)
+    outline_check = OutlineCheck(
+        None,
+        typechecked_options({**default_options, **options}),
+        run_checks,
+        cache,
+        stats,
+    )
+
+    master_ids = None
+    if masters:
+        master_ids = [
+            master_id
+            for master_id, name in source.masters.items()
+            if master_id in masters or name in masters
+        ]
+
+    count = 0
+    for glyph_name, master_id, snapshot in source.snapshots(master_ids):
+        if stats is not None:
+            stats.begin(glyph_name)
+        master_name = source.masters[master_id]
+        for error in outline_check.iter_errors(snapshot, max_errors):
+            if report is None:
+                level = "warning" if error.level == "w" else "error"
+                print(f"{path}: {glyph_name} [{master_name}]: {level}: {error}")
+            else:
+                report.add(glyph_name, master_name, error)
+            count += 1
+    return count
+
+
+def main(args: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m redArrow",
+        description="Check the outlines of Glyphs source files for errors.",
+    )
+    parser.add_argument(
+        "fonts",
+        metavar="FONT",
+        nargs="+",
+        help="A .glyphs file or .glyphspackage",
+    )
+    parser.add_argument(
+        "-m",
+        "--master",
+        action="append",
+        dest="masters",
+        metavar="MASTER",
+        help="The name or id of a master to check. Can be given more than once. "
+        "By default, all masters are checked.",
+    )
+    parser.add_argument(
+        "-c",
+        "--check",
+        action="append",
+        dest="checks",
+        metavar="CHECK",
+        type=_parse_check,
+        help="A check to run, e.g. 'extrema'. Can be given more than once. "
+        "By default, all checks are run.",
+    )
+    parser.add_argument(
+        "-o",
+        "--option",
+        action="append",
+        dest="options",
+        metavar="KEY=VALUE",
+        type=_parse_option,
+        default=[],
+        help="An option for the checks as KEY=VALUE, e.g. 'ignore_warnings=true'. "
+        "Can be given more than once.",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        metavar="N",
+        help="Print at most N errors for each layer.",
+    )
+    parser.add_argument(
+        "-r",
+        "--report",
+        metavar="PATH",
+        help="Write one record per error to a JSON Lines or CSV file instead of "
+        "printing the errors. The format is chosen by the file name extension.",
+    )
+    parser.add_argument(
+        "--report-format",
+        choices=report_formats,
+        help="The format of the report file, if it can't be told from its name.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print the time, calls, errors and visited nodes of each check, and "
+        "the slowest glyphs.",
+    )
+    parsed = parser.parse_args(args)
+
+    options = dict(parsed.options)
+    run_checks = parsed.checks or default_checks
+    cache = ContourCache()
+    stats = CheckStats() if parsed.stats else None
+    report = None
+    if parsed.report:
+        try:
+            report = ReportWriter(parsed.report, parsed.report_format)
+        except OSError as e:
+            print(f"{parsed.report}: Could not write the report: {e}", file=sys.stderr)
+            return 2
+
+    count = 0
+    status = 0
+    for path in parsed.fonts:
+        try:
+            count += check_font(
+                path,
+                options,
+                run_checks,
+                parsed.masters,
+                cache,
+                stats,
+                parsed.max_errors,
+                report,
+            )
+        except (OSError, ValueError, KeyError) as e:
+            print(f"{path}: Could not check the font: {e}", file=sys.stderr)
+            status = 2
+    if report is not None:
+        report.close()
+    if stats is not None:
+        print(stats.report(), file=sys.stderr)
+    if status == 0 and count > 0:
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+from threading import Condition, Event, Thread
+from typing import TYPE_CHECKING, Callable, Sequence
+
+from redArrow.outlineTestGlyphs import CheckCancelled, OutlineCheck
+from redArrow.stats import CheckStats
+
+if TYPE_CHECKING:
+    from redArrow.cache import ContourCache
+    from redArrow.outlineTestGlyphs import OutlineError, OutlineWarning
+    from redArrow.snapshot import LayerSnapshot
+    from redArrow.typing import RedArrowOptionsDict
+
+
+class _CheckJob:
+    __slots__ = ("token", "name", "snapshot", "options", "incremental", "cancel")
+
+    def __init__(
+        self,
+        token: object,
+        name: str,
+        snapshot: "LayerSnapshot",
+        options: "RedArrowOptionsDict",
+        incremental: bool,
+    ) -> None:
+        self.token = token
+        self.name = name
+        self.snapshot = snapshot
+        self.options = options
+        self.incremental = incremental
+        self.cancel = Event()
+
+
+class BackgroundCheck:
+    """
+    Runs the outline checks of layer snapshots on a worker thread.
+
+    The snapshots are read on the main thread, where the Glyphs API may be used.
+    Only the newest submitted snapshot is checked: a check that is still running
+    when a new snapshot is submitted is cancelled, and its results are dropped.
+    """
+
+    def __init__(
+        self,
+        options: "RedArrowOptionsDict",
+        run_checks: Sequence[str],
+        cache: "ContourCache | None" = None,
+        stats: "CheckStats | None" = None,
+        on_result: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        Args:
+            options (RedArrowOptionsDict): The options for each check
+            run_checks (Sequence[str]): The names of the checks to be run
+            cache (ContourCache | None, optional): The contour cache. It is only
+                used by the worker thread and must not be shared with checks on
+                other threads. Defaults to None.
+            stats (CheckStats | None, optional): The statistics to count the checks
+                in. The worker counts in its own statistics, and adds them to these
+                after each check. Defaults to None.
+            on_result (Callable[[], None] | None, optional): Called on the worker
+                thread when new results are ready. Defaults to None.
+        """
+        self.stats = stats
+        self._worker_stats = None if stats is None else CheckStats()
+        self.outline_check = OutlineCheck(
+            None, dict(options), run_checks, cache, self._worker_stats
+        )
+        self.on_result = on_result
+        self._condition = Condition()
+        self._job: _CheckJob | None = None
+        self._running: _CheckJob | None = None
+        self._result: "tuple[object, list[OutlineError | OutlineWarning]] | None" = None
+        self._stopped = False
+        self._thread = Thread(target=self._run, name="RedArrowCheck", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        token: object,
+        snapshot: "LayerSnapshot",
+        options: "RedArrowOptionsDict",
+        incremental: bool = False,
+        name: str = "",
+    ) -> None:
+        """
+        Check a snapshot on the worker thread. A check that is still waiting or
+        running is cancelled.
+
+        Args:
+            token (object): Identifies the checked layer in the result
+            snapshot (LayerSnapshot): The layer geometry
+            options (RedArrowOptionsDict): The options for each check. The worker
+                keeps a copy.
+            incremental (bool, optional): Whether the snapshot is an edited version
+                of the previously submitted snapshot. Defaults to False.
+            name (str, optional): The glyph name, for the statistics. Defaults to
+                "".
+        """
+        job = _CheckJob(token, name, snapshot, dict(options), incremental)
+        with self._condition:
+            if self._running is not None:
+                self._running.cancel.set()
+            self._job = job
+            self._result = None
+            self._condition.notify()
+
+    def take_result(
+        self,
+    ) -> "tuple[object, list[OutlineError | OutlineWarning]] | None":
+        """
+        Return the results of the newest finished check, once.
+
+        Returns:
+            tuple[object, list[OutlineError | OutlineWarning]] | None: The token of
+                the checked layer and its errors, or None if no new results are
+                ready.
+        """
+        with self._condition:
+            result = self._result
+            self._result = None
+        return result
+
+    @property
+    def busy(self) -> bool:
+        """
+        Whether a check is waiting or running.
+        """
+        with self._condition:
+            return self._job is not None or self._running is not None
+
+    def stop(self) -> None:
+        """
+        Cancel the current check and end the worker thread.
+        """
+        with self._condition:
+            self._stopped = True
+            if self._running is not None:
+                self._running.cancel.set()
+            self._job = None
+            self._condition.notify()
+
+    def _run(self) -> None:
+        outline_check = self.outline_check
+        while True:
+            with self._condition:
+                while self._job is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+
+                job = self._running = self._job
+                self._job = None
+
+            if job.options != outline_check.options:
+                outline_check.options = job.options
+                # Setting the layer caches the options again
+                outline_check.layer = None
+            outline_check.cancel_event = job.cancel
+            if outline_check.stats is not None:
+                outline_check.stats.begin(job.name)
+            try:
+                outline_check.check_snapshot(job.snapshot, job.incremental)
+            except CheckCancelled:
+                errors = None
+            except Exception as e:
+                print("RedArrow: Check of '%s' failed: %s" % (job.name, e))
+                errors = []
+            else:
+                errors = outline_check.errors
+            if self.stats is not None and self._worker_stats is not None:
+                # The statistics may be shown on the main thread meanwhile
+                self.stats.merge(self._worker_stats)
+                self._worker_stats.reset()
+
+            with self._condition:
+                self._running = None
+                if errors is None or job.cancel.is_set():
+                    continue
+
+                self._result = (job.token, errors)
+            if self.on_result is not None:
+                self.on_result()
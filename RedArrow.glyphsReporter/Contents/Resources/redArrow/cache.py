@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from math import floor
+from typing import TYPE_CHECKING, Any, Hashable
+
+if TYPE_CHECKING:
+    from redArrow.snapshot import LayerSnapshot
+    from redArrow.typing import PointTuple
+
+
+# (node offset, error class, x, y, kind, badness, vector) with the node index
+# relative to the contour start and coordinates relative to the contour origin
+CachedErrorTuple = tuple[int, type, float, float, str, Any, Any]
+
+
+class ContourCache:
+    """
+    A font-wide cache of the errors found in contours, independent of the position
+    of the contours. Shapes that repeat in different places, like serifs, dots or
+    accents, only have to be checked once.
+
+    The least recently used entries are dropped when the cache grows beyond its
+    maximum size.
+    """
+
+    def __init__(self, max_size: int = 20000) -> None:
+        """
+        Args:
+            max_size (int, optional): The maximum number of cached contours. Defaults
+                to 20000.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, list[CachedErrorTuple]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ContourCache {len(self._entries)}/{self.max_size} entries, "
+            f"{self.hits} hits, {self.misses} misses>"
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> "list[CachedErrorTuple] | None":
+        """
+        Return the cached errors for a contour key, or None if the contour is not in
+        the cache.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, errors: "list[CachedErrorTuple]") -> None:
+        """
+        Store the errors for a contour key.
+        """
+        self._entries[key] = errors
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+def contour_key(
+    snapshot: "LayerSnapshot",
+    contour: int,
+    grid_length: float,
+    options_key: Hashable,
+) -> "tuple[Hashable, PointTuple]":
+    """
+    Build the cache key for a contour of a snapshot.
+
+    The coordinates are stored relative to an origin near the first node. The
+    origin is snapped to twice the grid length, so that rounding to the grid gives
+    the same results for all copies of a contour that share a cache entry.
+
+    Args:
+        snapshot (LayerSnapshot): The snapshot
+        contour (int): The index of the contour
+        grid_length (float): The grid length
+        options_key (Hashable): The check options that influence the results
+
+    Returns:
+        tuple[Hashable, PointTuple]: The key and the origin
+    """
+    start = snapshot.starts[contour]
+    end = snapshot.starts[contour + 1]
+    ox = snapshot.x[start]
+    oy = snapshot.y[start]
+    if grid_length:
+        period = 2 * grid_length
+        ox = floor(ox / period) * period
+        oy = floor(oy / period) * period
+    key = (
+        options_key,
+        snapshot.closed[contour],
+        snapshot.types[start:end].tobytes(),
+        snapshot.smooth[start:end].tobytes(),
+        tuple([x - ox for x in snapshot.x[start:end]]),
+        tuple([y - oy for y in snapshot.y[start:end]]),
+    )
+    return key, (ox, oy)
@@ -1,10 +1,16 @@
 from typing import TYPE_CHECKING
 
-import objc
-from AppKit import NSDecimalNumber
-
 from redArrow.typing import RedArrowOptionsDict
 
+try:
+    import objc
+    from AppKit import NSDecimalNumber
+except ImportError:
+    # Outside of Glyphs, e.g. when running from the command line, the options are
+    # plain Python values
+    objc = None
+    NSDecimalNumber = None
+
 if TYPE_CHECKING:
     from typing import Any
 
@@ -60,12 +66,15 @@ def typechecked_options(
         t = option_types.get(k, "float")
         if t == "bool":
             out[k] = bool(options.get(k, v))
+        elif t == "int":
+            out[k] = int(options.get(k, v))
         elif t == "float":
             v = options.get(k, v)
-            if isinstance(v, NSDecimalNumber):
+            if NSDecimalNumber is not None and isinstance(v, NSDecimalNumber):
                 out[k] = v.floatValue()
-            elif isinstance(v, objc._pythonify.OC_PythonFloat) or isinstance(
-                v, objc._pythonify.OC_PythonLong
+            elif objc is not None and (
+                isinstance(v, objc._pythonify.OC_PythonFloat)
+                or isinstance(v, objc._pythonify.OC_PythonLong)
             ):
                 out[k] = float(v)
             elif isinstance(v, float) or isinstance(v, int):
@@ -0,0 +1,305 @@
+import mmap
+import os
+import struct
+import sys
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Any, Sequence
+
+if TYPE_CHECKING:
+    from redArrow.snapshot import LayerSnapshot
+
+
+plugin_id = "de.kutilek.RedArrow"
+
+# Header: magic, capacity, number of entries, clock
+_header = struct.Struct("<8sIIQ")
+# Slot: key, number of errors, last used clock
+_slot = struct.Struct("<16siQ")
+_magic = b"RAIDX001"
+_empty_key = bytes(16)
+
+# The modules whose code influences the check results, relative to the redArrow
+# folder
+_result_modules = (
+    "outlineTestGlyphs.py",
+    "kernels.py",
+    "snapshot.py",
+    "cache.py",
+    "scan.py",
+    os.path.join("misc", "arrayTools.py"),
+    os.path.join("misc", "bezierTools.py"),
+    os.path.join("misc", "transform.py"),
+)
+
+
+def cache_dir() -> str:
+    """
+    Return the folder for cache files of the current platform.
+
+    Returns:
+        str: The path of the folder. It may not exist yet.
+    """
+    if sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    elif sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return os.path.join(base, plugin_id)
+
+
+def index_path(font_path: str) -> str:
+    """
+    Return the path of the result index file for a font.
+
+    Args:
+        font_path (str): The path of the font file
+
+    Returns:
+        str: The path of the index file in the cache folder
+    """
+    name = blake2b(os.path.abspath(font_path).encode("utf-8"), digest_size=16)
+    return os.path.join(cache_dir(), name.hexdigest() + ".idx")
+
+
+def options_digest(
+    options: "dict[str, Any]", run_checks: Sequence[str], early_exit: bool = False
+) -> bytes:
+    """
+    Return a hash of the check options, the selected checks and the source code of
+    the modules that influence the check results, so that results are not reused
+    after any of them has changed.
+
+    Args:
+        options (dict[str, Any]): The options for each check
+        run_checks (Sequence[str]): The names of the checks to be run
+        early_exit (bool, optional): Whether the results only tell if there are any
+            errors, instead of the number of errors. Defaults to False.
+
+    Returns:
+        bytes: The hash
+    """
+    h = blake2b(digest_size=16)
+    h.update(repr(sorted((k, repr(v)) for k, v in options.items())).encode("utf-8"))
+    h.update(repr(sorted(run_checks)).encode("utf-8"))
+    if early_exit:
+        h.update(b"early-exit")
+    folder = os.path.dirname(os.path.abspath(__file__))
+    for module in _result_modules:
+        with open(os.path.join(folder, module), "rb") as f:
+            h.update(f.read())
+    return h.digest()
+
+
+def layer_key(snapshot: "LayerSnapshot", master_id: str, digest: bytes) -> bytes:
+    """
+    Return the key of a layer for the result index.
+
+    Args:
+        snapshot (LayerSnapshot): The geometry of the layer
+        master_id (str): The id of the master the layer belongs to
+        digest (bytes): The hash of the options, see `options_digest`
+
+    Returns:
+        bytes: The 16-byte key
+    """
+    h = blake2b(digest, digest_size=16)
+    h.update(master_id.encode("utf-8"))
+    for a in (
+        snapshot.x,
+        snapshot.y,
+        snapshot.types,
+        snapshot.smooth,
+        snapshot.starts,
+        snapshot.closed,
+    ):
+        h.update(a.tobytes())
+    h.update(
+        repr(
+            (
+                snapshot.upm,
+                snapshot.bounds,
+                [(c.name, c.transform, c.bounds) for c in snapshot.components],
+            )
+        ).encode("utf-8")
+    )
+    key = h.digest()
+    # The all-zero key marks empty slots
+    return key if key != _empty_key else b"\x01" + key[1:]
+
+
+class ResultIndex:
+    """
+    A persistent map from layer keys to the number of errors found in the layer.
+
+    The entries are stored in an open-addressing hash table in a memory-mapped
+    file, so a lookup only touches a few bytes of the file. When the table holds
+    more than `max_entries`, the least recently used half of the entries is
+    dropped. Each lookup and insertion advances the clock that tells which entries
+    were used last.
+    """
+
+    def __init__(self, path: str, max_entries: int = 65536) -> None:
+        """
+        Args:
+            path (str): The path of the index file. It is created if needed.
+            max_entries (int, optional): The maximum number of entries. Defaults to
+                65536, which makes a file of about 4 MB. If the existing file
+                holds more entries, its size is kept.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        # Keep the table at most half full for short probe sequences
+        self.capacity = 1 << (2 * max_entries - 1).bit_length()
+        self._file = None
+        self._map: mmap.mmap | None = None
+        self._count = 0
+        self._clock = 0
+
+    def __enter__(self) -> "ResultIndex":
+        self.open()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def open(self) -> None:
+        """
+        Open the index file. A missing, damaged or differently sized file is
+        replaced, keeping the entries that can be read.
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        entries = []
+        if os.path.exists(self.path):
+            self._file = open(self.path, "r+b")
+            size = os.path.getsize(self.path)
+            if size >= _header.size:
+                self._map = mmap.mmap(self._file.fileno(), 0)
+                magic, capacity, count, clock = _header.unpack_from(self._map, 0)
+                if (
+                    magic == _magic
+                    and size == _header.size + capacity * _slot.size
+                    and capacity >= self.capacity
+                ):
+                    # A larger index is kept, so that scans of different sizes
+                    # don't rebuild it
+                    self.capacity = capacity
+                    self.max_entries = capacity // 2
+                    self._count = count
+                    self._clock = clock
+                    return
+
+                if magic == _magic and size == _header.size + capacity * _slot.size:
+                    entries = self._read_entries(capacity)
+                    self._clock = clock
+                self._map.close()
+            self._file.close()
+
+        self._create(entries)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._write_header()
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def get(self, key: bytes) -> int | None:
+        """
+        Return the number of errors stored for a key.
+
+        Args:
+            key (bytes): The key, see `layer_key`
+
+        Returns:
+            int | None: The number of errors, or None if the key is not in the index
+        """
+        m = self._map
+        mask = self.capacity - 1
+        slot = int.from_bytes(key[:8], "little") & mask
+        while True:
+            offset = _header.size + slot * _slot.size
+            end = offset + 16
+            slot_key = m[offset:end]
+            if slot_key == _empty_key:
+                return None
+
+            if slot_key == key:
+                _, errors, _ = _slot.unpack_from(m, offset)
+                self._clock += 1
+                _slot.pack_into(m, offset, key, errors, self._clock)
+                return errors
+
+            slot = (slot + 1) & mask
+
+    def put(self, key: bytes, errors: int) -> None:
+        """
+        Store the number of errors for a key.
+
+        Args:
+            key (bytes): The key, see `layer_key`
+            errors (int): The number of errors
+        """
+        if self._count >= self.max_entries:
+            self._evict()
+
+        self._clock += 1
+        if self._insert(key, errors, self._clock):
+            self._count += 1
+            self._write_header()
+
+    def _insert(self, key: bytes, errors: int, stamp: int) -> bool:
+        # Returns whether a new slot was used
+        m = self._map
+        mask = self.capacity - 1
+        slot = int.from_bytes(key[:8], "little") & mask
+        while True:
+            offset = _header.size + slot * _slot.size
+            end = offset + 16
+            slot_key = m[offset:end]
+            if slot_key == _empty_key or slot_key == key:
+                _slot.pack_into(m, offset, key, errors, stamp)
+                return slot_key == _empty_key
+
+            slot = (slot + 1) & mask
+
+    def _read_entries(self, capacity: int) -> list[tuple[bytes, int, int]]:
+        entries = []
+        for slot in range(capacity):
+            entry = _slot.unpack_from(self._map, _header.size + slot * _slot.size)
+            if entry[0] != _empty_key:
+                entries.append(entry)
+        return entries
+
+    def _evict(self) -> None:
+        # Keep the most recently used half of the entries
+        entries = self._read_entries(self.capacity)
+        entries.sort(key=lambda entry: entry[2], reverse=True)
+        keep = self.max_entries // 2
+        self._fill(entries[:keep])
+
+    def _create(self, entries: list[tuple[bytes, int, int]]) -> None:
+        self._file = open(self.path, "w+b")
+        self._file.truncate(_header.size + self.capacity * _slot.size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        entries.sort(key=lambda entry: entry[2], reverse=True)
+        keep = self.max_entries
+        self._fill(entries[:keep])
+
+    def _fill(self, entries: list[tuple[bytes, int, int]]) -> None:
+        m = self._map
+        start = _header.size
+        m[start:] = bytes(self.capacity * _slot.size)
+        for key, errors, stamp in entries:
+            self._insert(key, errors, stamp)
+        self._count = len(entries)
+        self._write_header()
+
+    def _write_header(self) -> None:
+        _header.pack_into(self._map, 0, _magic, self.capacity, self._count, self._clock)
@@ -0,0 +1,466 @@
+import os
+import re
+from math import radians
+from typing import TYPE_CHECKING, Any, Iterator
+
+from redArrow.misc.arrayTools import calcBounds, unionRect
+from redArrow.misc.transform import Transform
+from redArrow.snapshot import (
+    CURVE,
+    LINE,
+    OFFCURVE,
+    QCURVE,
+    ComponentSnapshot,
+    LayerSnapshot,
+)
+
+if TYPE_CHECKING:
+    from redArrow.typing import RectTuple, TransformTuple
+
+
+# Node types in Glyphs 2 (e.g. "100 0 LINE SMOOTH") and Glyphs 3 (e.g. (100,0,ls))
+# files
+node_types_v2: dict[str, int] = {
+    "LINE": LINE,
+    "CURVE": CURVE,
+    "QCURVE": QCURVE,
+    "OFFCURVE": OFFCURVE,
+}
+node_types_v3: dict[str, int] = {
+    "l": LINE,
+    "c": CURVE,
+    "q": QCURVE,
+    "o": OFFCURVE,
+}
+
+_token_re = re.compile(
+    r"""
+    \s*
+    (?:
+        "(?P<quoted>(?:[^"\\]|\\.)*)"
+        | (?P<data><[0-9A-Fa-f\s]*>)
+        | (?P<bare>[^\s{}()=;,"<>]+)
+        | (?P<punct>[{}()=;,])
+    )
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_escape_re = re.compile(r"\\(U[0-9A-Fa-f]{4}|[0-7]{1,3}|.)", re.DOTALL)
+_escapes = {"n": "\n", "t": "\t", "r": "\r", "a": "\a", "b": "\b", "f": "\f"}
+
+
+def _unescape_match(m: re.Match) -> str:
+    code = m.group(1)
+    if code[0] == "U" and len(code) == 5:
+        return chr(int(code[1:], 16))
+    if code[0] in "01234567":
+        return chr(int(code, 8))
+    return _escapes.get(code, code)
+
+
+class OpenStepParser:
+    """
+    A parser for the OpenStep property list format of .glyphs files.
+
+    Strings and numbers are returned as strings, dictionaries as dicts and arrays
+    as lists. Arrays can also be read element by element with `iter_array`, so that
+    large arrays like the glyphs of a font don't have to be held in memory at once.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.pos = 0
+
+    def _next_token(self) -> tuple[str, str]:
+        pos = self.pos
+        m = _token_re.match(self.text, pos)
+        if m is None:
+            if self.text[pos:].strip():
+                raise ValueError(f"Syntax error at position {pos}")
+            raise ValueError("Unexpected end of file")
+
+        self.pos = m.end()
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == "quoted" and "\\" in value:
+            value = _escape_re.sub(_unescape_match, value)
+        return kind, value
+
+    def _peek_token(self) -> tuple[str, str]:
+        pos = self.pos
+        token = self._next_token()
+        self.pos = pos
+        return token
+
+    def _expect(self, punct: str) -> None:
+        kind, value = self._next_token()
+        if kind != "punct" or value != punct:
+            raise ValueError(
+                f"Expected '{punct}' but found '{value}' at position {self.pos}"
+            )
+
+    def parse(self) -> Any:
+        """
+        Parse the next value.
+
+        Returns:
+            Any: The value
+        """
+        kind, value = self._next_token()
+        if kind == "punct":
+            if value == "{":
+                return self._parse_dict_body()
+            if value == "(":
+                return self._parse_array_body()
+            raise ValueError(f"Unexpected '{value}' at position {self.pos}")
+
+        return value
+
+    def _parse_dict_body(self) -> dict[str, Any]:
+        result = {}
+        for key in self._iter_keys():
+            result[key] = self.parse()
+        return result
+
+    def _parse_array_body(self) -> list[Any]:
+        return list(self._iter_array_body())
+
+    def iter_dict(self) -> Iterator[str]:
+        """
+        Read a dictionary key by key. For each key, the caller must read the value
+        with `parse` or `iter_array` before the next key can be read.
+
+        Yields:
+            Iterator[str]: The keys
+        """
+        self._expect("{")
+        yield from self._iter_keys()
+
+    def _iter_keys(self) -> Iterator[str]:
+        while True:
+            kind, value = self._next_token()
+            if kind == "punct":
+                if value == "}":
+                    return
+
+                raise ValueError(f"Unexpected '{value}' at position {self.pos}")
+
+            self._expect("=")
+            yield value
+            self._expect(";")
+
+    def iter_array(self) -> Iterator[Any]:
+        """
+        Read an array element by element.
+
+        Yields:
+            Iterator[Any]: The elements
+        """
+        self._expect("(")
+        yield from self._iter_array_body()
+
+    def _iter_array_body(self) -> Iterator[Any]:
+        kind, value = self._peek_token()
+        if kind == "punct" and value == ")":
+            self._next_token()
+            return
+
+        while True:
+            yield self.parse()
+            kind, value = self._next_token()
+            if kind == "punct" and value == ")":
+                return
+
+            if kind != "punct" or value != ",":
+                raise ValueError(f"Expected ',' or ')' at position {self.pos}")
+
+            # Allow a trailing comma
+            kind, value = self._peek_token()
+            if kind == "punct" and value == ")":
+                self._next_token()
+                return
+
+
+def parse_plist(text: str) -> Any:
+    """
+    Parse a complete OpenStep property list.
+
+    Args:
+        text (str): The property list
+
+    Returns:
+        Any: The value
+    """
+    return OpenStepParser(text).parse()
+
+
+def _read_text(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _parse_floats(value: str) -> list[float]:
+    # "{1, 0, 0, 1, 100, 0}" or "{100, 0}"
+    return [float(v) for v in value.strip("{}").split(",")]
+
+
+class GlyphsSource:
+    """
+    The outlines of a .glyphs file or .glyphspackage, read without Glyphs.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path (str): The path of the .glyphs file or .glyphspackage folder
+        """
+        self.path = path
+        self.format_version = 2
+        self.upm = 1000
+        self.grid_length = 1
+        # The master ids and names, in the order of the file
+        self.masters: dict[str, str] = {}
+
+        # The glyph name, master id and snapshot of each master layer
+        self._layers: list[tuple[str, str, LayerSnapshot]] = []
+
+    def read(self) -> None:
+        """
+        Read the font. The glyphs are parsed one after the other, and only the
+        geometry of the master layers is kept.
+        """
+        if os.path.isdir(self.path):
+            self._read_package()
+        else:
+            self._read_file()
+
+    def _read_file(self) -> None:
+        parser = OpenStepParser(_read_text(self.path))
+        for key in parser.iter_dict():
+            if key == "glyphs":
+                for glyph in parser.iter_array():
+                    self._add_glyph(glyph)
+            else:
+                self._set_font_info(key, parser.parse())
+
+    def _read_package(self) -> None:
+        fontinfo = parse_plist(_read_text(os.path.join(self.path, "fontinfo.plist")))
+        for key, value in fontinfo.items():
+            self._set_font_info(key, value)
+
+        glyphs_dir = os.path.join(self.path, "glyphs")
+        file_names = sorted(f for f in os.listdir(glyphs_dir) if f.endswith(".glyph"))
+
+        # Use the glyph order of the package
+        order_path = os.path.join(self.path, "order.plist")
+        if os.path.exists(order_path):
+            order = {
+                name: i for i, name in enumerate(parse_plist(_read_text(order_path)))
+            }
+        else:
+            order = {}
+        start = len(self._layers)
+        for file_name in file_names:
+            self._add_glyph(
+                parse_plist(_read_text(os.path.join(glyphs_dir, file_name)))
+            )
+        self._layers[start:] = sorted(
+            self._layers[start:], key=lambda item: order.get(item[0], len(order))
+        )
+
+    def _set_font_info(self, key: str, value: Any) -> None:
+        if key == ".formatVersion":
+            self.format_version = int(value)
+        elif key == "unitsPerEm":
+            self.upm = int(value)
+        elif key == "gridLength":
+            # Glyphs 2
+            self.grid_length = int(value)
+        elif key == "settings":
+            # Glyphs 3
+            if "gridLength" in value:
+                self.grid_length = int(value["gridLength"])
+        elif key == "fontMaster":
+            for master in value:
+                master_id = master["id"]
+                if "name" in master:
+                    name = master["name"]
+                else:
+                    # Glyphs 2 stores the parts of the name
+                    name = " ".join(
+                        master[k] for k in ("weight", "width", "custom") if k in master
+                    )
+                self.masters[master_id] = name or master_id
+
+    def _add_glyph(self, glyph: dict[str, Any]) -> None:
+        glyph_name = str(glyph["glyphname"])
+        for layer in glyph.get("layers", []):
+            master_id = layer.get("layerId")
+            if master_id in self.masters:
+                self._layers.append(
+                    (glyph_name, master_id, self._layer_snapshot(layer))
+                )
+
+    def snapshots(
+        self, master_ids: "list[str] | None" = None
+    ) -> Iterator[tuple[str, str, LayerSnapshot]]:
+        """
+        Return the snapshots of the master layers.
+
+        Composite glyphs need the bounds of their base glyphs, so they are finished
+        after all base glyphs they use have been seen.
+
+        Args:
+            master_ids (list[str] | None, optional): The ids of the masters to
+                include. Defaults to None, which means all masters.
+
+        Yields:
+            Iterator[tuple[str, str, LayerSnapshot]]: The glyph name, master id and
+                snapshot of each master layer, in glyph order
+        """
+        if master_ids is None:
+            master_ids = list(self.masters)
+
+        # The bounds of all master layers, by glyph name and master id
+        bounds: "dict[tuple[str, str], RectTuple | None]" = {}
+        # The snapshots with components whose base glyphs were not seen yet
+        pending = []
+        for glyph_name, master_id, snapshot in self._layers:
+            # The units per em are stored after the glyphs in .glyphs files
+            snapshot.upm = self.upm
+            if not self._finish_snapshot(glyph_name, master_id, snapshot, bounds):
+                pending.append((glyph_name, master_id, snapshot))
+
+        # Finish the composites in dependency order
+        while pending:
+            still_pending = [
+                item for item in pending if not self._finish_snapshot(*item, bounds)
+            ]
+            if len(still_pending) == len(pending):
+                # Missing base glyphs or circular references
+                for item in still_pending:
+                    self._finish_snapshot(*item, bounds, force=True)
+                break
+
+            pending = still_pending
+
+        for glyph_name, master_id, snapshot in self._layers:
+            if master_id in master_ids:
+                yield glyph_name, master_id, snapshot
+
+    def _layer_snapshot(self, layer: dict[str, Any]) -> LayerSnapshot:
+        snapshot = LayerSnapshot(self.upm)
+        if self.format_version >= 3:
+            for shape in layer.get("shapes", []):
+                if "ref" in shape:
+                    snapshot.components.append(self._component_v3(shape))
+                else:
+                    self._add_path_v3(snapshot, shape)
+        else:
+            for path in layer.get("paths", []):
+                self._add_path_v2(snapshot, path)
+            for component in layer.get("components", []):
+                snapshot.components.append(self._component_v2(component))
+        return snapshot
+
+    def _add_path_v2(self, snapshot: LayerSnapshot, path: dict[str, Any]) -> None:
+        nodes = []
+        for node in path.get("nodes", []):
+            x, y, node_type, *rest = node.split(" ", 3)
+            smooth = bool(rest) and rest[0].startswith("SMOOTH")
+            nodes.append((float(x), float(y), node_types_v2[node_type], smooth))
+        snapshot.add_contour(nodes, path.get("closed", "0") == "1")
+
+    def _add_path_v3(self, snapshot: LayerSnapshot, path: dict[str, Any]) -> None:
+        nodes = []
+        for node in path.get("nodes", []):
+            node_type = node[2]
+            nodes.append(
+                (
+                    float(node[0]),
+                    float(node[1]),
+                    node_types_v3[node_type[0]],
+                    node_type.endswith("s"),
+                )
+            )
+        snapshot.add_contour(nodes, path.get("closed", "0") == "1")
+
+    def _component_v2(self, component: dict[str, Any]) -> ComponentSnapshot:
+        if "transform" in component:
+            transform = tuple(_parse_floats(component["transform"]))
+        else:
+            transform = (1, 0, 0, 1, 0, 0)
+        return ComponentSnapshot(component["name"], transform)
+
+    def _component_v3(self, component: dict[str, Any]) -> ComponentSnapshot:
+        # Same order as in glyphsLib: translate, rotate, scale
+        t = Transform()
+        if "pos" in component:
+            x, y = (float(v) for v in component["pos"])
+            t = t.translate(x, y)
+        if "angle" in component:
+            t = t.rotate(radians(float(component["angle"])))
+        if "scale" in component:
+            sx, sy = (float(v) for v in component["scale"])
+            t = t.scale(sx, sy)
+        transform: "TransformTuple" = tuple(t)  # type: ignore
+        return ComponentSnapshot(component["ref"], transform)
+
+    def _finish_snapshot(
+        self,
+        glyph_name: str,
+        master_id: str,
+        snapshot: LayerSnapshot,
+        bounds: "dict[tuple[str, str], RectTuple | None]",
+        force: bool = False,
+    ) -> bool:
+        """
+        Set the bounds of the components and the layer, if the bounds of all base
+        glyphs are known.
+
+        Args:
+            glyph_name (str): The glyph name
+            master_id (str): The master id of the layer
+            snapshot (LayerSnapshot): The snapshot of the layer
+            bounds (dict[tuple[str, str], RectTuple | None]): The bounds of the
+                finished layers. The bounds of the layer are added.
+            force (bool, optional): Whether to finish the snapshot even if base
+                glyphs are missing. Defaults to False.
+
+        Returns:
+            bool: Whether the snapshot could be finished
+        """
+        if not force:
+            for component in snapshot.components:
+                if (component.name, master_id) not in bounds:
+                    return False
+
+        layer_bounds = snapshot.contour_bounds()
+        for component in snapshot.components:
+            key = (component.name, master_id)
+            if key not in bounds:
+                # The base glyph is missing
+                component.bounds = None
+                continue
+
+            base_bounds = bounds[key]
+            if base_bounds is None:
+                # The base glyph is empty
+                component.bounds = (0, 0, 0, 0)
+                continue
+
+            component.bounds = base_bounds
+            xMin, yMin, xMax, yMax = base_bounds
+            rect = calcBounds(
+                Transform(*component.transform).transformPoints(
+                    [(xMin, yMin), (xMin, yMax), (xMax, yMin), (xMax, yMax)]
+                )
+            )
+            layer_bounds = (
+                rect if layer_bounds is None else unionRect(layer_bounds, rect)
+            )
+
+        bounds[glyph_name, master_id] = layer_bounds
+        if layer_bounds is not None:
+            snapshot.bounds = layer_bounds
+        return True
@@ -0,0 +1,507 @@
+"""
+Batched geometry kernels for the outline checks.
+
+The kernels process all segments of a layer in one call. When NumPy is available
+and there are enough segments, the calculations are vectorized; otherwise an
+equivalent pure-Python implementation is used.
+"""
+
+from math import sqrt
+from typing import TYPE_CHECKING, Any, Sequence
+
+from redArrow.misc.arrayTools import normRect, pointInRect
+from redArrow.misc.bezierTools import calcCubicParameters, solveQuadratic, splitCubicAtT
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if TYPE_CHECKING:
+    from array import array
+
+    from redArrow.typing import CubicCurveTuple, PointTuple, RectTuple
+
+
+# (segment number, x, y, vector x, vector y, badness)
+ExtremumTuple = tuple[int, float, float, float, float, float | None]
+
+# (segment number, x, y, vector x, vector y)
+InflectionTuple = tuple[int, float, float, float, float]
+
+# The same value as epsilon in bezierTools.solveQuadratic
+epsilon = 1e-12
+
+# The minimum number of segments for the vectorized kernels. Setting up the arrays
+# takes longer than the pure-Python kernels for small layers, e.g. the one layer
+# that is checked when the Edit view is redrawn.
+vectorize_min_segments = 24
+
+
+def gather_segments(
+    xs: "array[float]", ys: "array[float]", indices: Sequence[tuple[int, ...]]
+) -> Any:
+    """
+    Collect the coordinates of segments given as node indices.
+
+    Args:
+        xs (array[float]): The x coordinates of all nodes
+        ys (array[float]): The y coordinates of all nodes
+        indices (Sequence[tuple[int, ...]]): The node indices of each segment
+
+    Returns:
+        Any: The segments as (N, 4, 2) array if they are processed by the vectorized
+            kernels, else as list of point tuples
+    """
+    if np is None or len(indices) < vectorize_min_segments:
+        return [tuple((xs[i], ys[i]) for i in segment) for segment in indices]
+
+    points = np.stack(
+        (np.frombuffer(xs, dtype=np.float64), np.frombuffer(ys, dtype=np.float64)),
+        axis=1,
+    )
+    return points[np.array(indices, dtype=np.intp)]
+
+
+def rect_distance(pt: "PointTuple", rect: "RectTuple") -> float:
+    """
+    Return the distance of a point to a rectangle, which is used as the badness of
+    an extremum.
+
+    Args:
+        pt (PointTuple): The point
+        rect (RectTuple): The rectangle
+
+    Returns:
+        float: The distance, 0 if the point is inside the rectangle
+    """
+    badness = 0.0
+    x, y = pt
+    if x < rect[0]:
+        # point is left from rect
+        if y < rect[1]:
+            # point is lower left from rect
+            badness = int(round(sqrt((rect[0] - x) ** 2 + (rect[1] - y) ** 2)))
+        elif y > rect[3]:
+            # point is upper left from rect
+            badness = int(round(sqrt((rect[0] - x) ** 2 + (rect[3] - y) ** 2)))
+        else:
+            badness = rect[0] - x
+    elif x > rect[2]:
+        # point is right from rect
+        if y < rect[1]:
+            # point is lower right from rect
+            badness = int(round(sqrt((rect[2] - x) ** 2 + (rect[1] - y) ** 2)))
+        elif y > rect[3]:
+            # point is upper right from rect
+            badness = int(round(sqrt((rect[2] - x) ** 2 + (rect[3] - y) ** 2)))
+        else:
+            badness = x - rect[2]
+    else:
+        # point is centered from rect, check for upper/lower
+        if y < rect[1]:
+            # point is lower center from rect
+            badness = rect[1] - y
+        elif y > rect[3]:
+            # point is upper center from rect
+            badness = y - rect[3]
+        else:
+            badness = 0
+    return badness
+
+
+def cubic_extrema(
+    segments: "Any", calculate_badness: bool = False
+) -> list[ExtremumTuple]:
+    """
+    Find the horizontal and vertical extrema of all cubic segments.
+
+    Segments whose control points lie inside the rectangle spanned by their oncurve
+    points are skipped, as they can't have extrema.
+
+    Args:
+        segments (Any): The segments as returned by `gather_segments`
+        calculate_badness (bool, optional): Whether to calculate the distance of
+            each extremum to the rectangle spanned by the oncurve points of its
+            segment. Defaults to False.
+
+    Returns:
+        list[ExtremumTuple]: The extrema, ordered by segment. For each segment, the
+            horizontal extrema come first.
+    """
+    if np is None or len(segments) < vectorize_min_segments:
+        return _cubic_extrema_py(_segment_tuples(segments), calculate_badness)
+    return _cubic_extrema_np(segments, calculate_badness)
+
+
+def _segment_tuples(segments: Any) -> "Sequence[CubicCurveTuple]":
+    # Arrays are converted for the pure-Python kernels
+    if hasattr(segments, "tolist"):
+        return [tuple(map(tuple, segment)) for segment in segments.tolist()]
+    return segments
+
+
+def _cubic_extrema_py(
+    segments: "Sequence[CubicCurveTuple]", calculate_badness: bool
+) -> list[ExtremumTuple]:
+    extrema: list[ExtremumTuple] = []
+    for n, (pt1, pt2, pt3, pt4) in enumerate(segments):
+        rect = normRect((pt1[0], pt1[1], pt4[0], pt4[1]))
+        if pointInRect(pt2, rect) and pointInRect(pt3, rect):
+            continue
+
+        (ax, ay), (bx, by), c, _ = calcCubicParameters(pt1, pt2, pt3, pt4)
+        ax *= 3.0
+        ay *= 3.0
+        bx *= 2.0
+        by *= 2.0
+        for roots in (
+            [t for t in solveQuadratic(ay, by, c[1]) if 0 < t < 1],
+            [t for t in solveQuadratic(ax, bx, c[0]) if 0 < t < 1],
+        ):
+            for _, _, (x3, y3), pt in splitCubicAtT(pt1, pt2, pt3, pt4, *roots)[:-1]:
+                x, y = pt
+                badness = rect_distance(pt, rect) if calculate_badness else None
+                extrema.append((n, x, y, x - x3, y - y3, badness))
+    return extrema
+
+
+def _quadratic_roots_np(a: Any, b: Any, c: Any) -> tuple[Any, Any]:
+    # Vectorized version of bezierTools.solveQuadratic. Missing roots are NaN.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        linear = np.abs(a) < epsilon
+        dd = b * b - 4.0 * a * c
+        real = dd >= 0.0
+        rdd = np.sqrt(np.where(real, dd, 0.0))
+        r1 = np.where(
+            linear,
+            np.where(np.abs(b) < epsilon, np.nan, -c / b),
+            np.where(real, (-b + rdd) / 2.0 / a, np.nan),
+        )
+        r2 = np.where(linear | ~real, np.nan, (-b - rdd) / 2.0 / a)
+    return r1, r2
+
+
+def _split_ends_np(a: Any, b: Any, c: Any, d: Any, t1: Any, t2: Any) -> tuple[Any, Any]:
+    # Vectorized version of the last two points of bezierTools._splitCubicAtT for
+    # the segment between t1 and t2. Returns the end point and the vector from the
+    # second control point to the end point.
+    delta = t2 - t1
+    a1 = a * delta**3
+    b1 = (3 * a * t1 + b) * delta**2
+    c1 = (2 * b * t1 + c + 3 * a * t1**2) * delta
+    d1 = a * t1**3 + b * t1**2 + c * t1 + d
+    pt2 = (c1 / 3.0) + d1
+    pt3 = (b1 + c1) / 3.0 + pt2
+    pt4 = a1 + d1 + c1 + b1
+    return pt4, pt4 - pt3
+
+
+def _cubic_extrema_np(segments: Any, calculate_badness: bool) -> list[ExtremumTuple]:
+    segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4, 2)
+    p0 = segments[:, 0]
+    p1 = segments[:, 1]
+    p2 = segments[:, 2]
+    p3 = segments[:, 3]
+
+    # Control hull vs. endpoint rect prefilter
+    lo = np.minimum(p0, p3)
+    hi = np.maximum(p0, p3)
+    outside = ((p1 < lo) | (p1 > hi) | (p2 < lo) | (p2 > hi)).any(axis=1)
+    candidates = np.flatnonzero(outside)
+    if not len(candidates):
+        return []
+
+    p0 = p0[candidates]
+    p1 = p1[candidates]
+    p2 = p2[candidates]
+    p3 = p3[candidates]
+    lo = lo[candidates]
+    hi = hi[candidates]
+
+    # Curve parameters for x and y, each of shape (K, 2)
+    c = (p1 - p0) * 3.0
+    b = (p2 - p1) * 3.0 - c
+    a = p3 - p0 - c - b
+
+    # Roots of the derivative. The slots are ordered like in the scalar version:
+    # horizontal extrema (roots for y) first, then vertical extrema (roots for x).
+    r1, r2 = _quadratic_roots_np(a * 3.0, b * 2.0, c)
+    t = np.stack((r1[:, 1], r2[:, 1], r1[:, 0], r2[:, 0]), axis=1)
+    valid = (t > 0) & (t < 1)
+
+    # The split start of each root is the previous valid root of the same axis
+    zeros = np.zeros(len(t))
+    t_prev = np.stack(
+        (
+            zeros,
+            np.where(valid[:, 0], t[:, 0], 0.0),
+            zeros,
+            np.where(valid[:, 2], t[:, 2], 0.0),
+        ),
+        axis=1,
+    )
+
+    rows, slots = np.nonzero(valid)
+    if not len(rows):
+        return []
+
+    t2 = t[rows, slots][:, None]
+    t1 = t_prev[rows, slots][:, None]
+    points, vectors = _split_ends_np(a[rows], b[rows], c[rows], p0[rows], t1, t2)
+
+    if calculate_badness:
+        lo = lo[rows]
+        hi = hi[rows]
+        below = points < lo
+        above = points > hi
+        dist = np.where(below, lo - points, np.where(above, points - hi, 0.0))
+        corner = (below | above).all(axis=1)
+        badness = np.where(
+            corner, np.round(np.hypot(dist[:, 0], dist[:, 1])), dist.sum(axis=1)
+        ).tolist()
+    else:
+        badness = [None] * len(rows)
+
+    return list(
+        zip(
+            candidates[rows].tolist(),
+            points[:, 0].tolist(),
+            points[:, 1].tolist(),
+            vectors[:, 0].tolist(),
+            vectors[:, 1].tolist(),
+            badness,
+        )
+    )
+
+
+def cubic_inflections(
+    segments: "Any", err_min: float = 0.3, err_max: float = 0.7
+) -> tuple[list[InflectionTuple], list[InflectionTuple]]:
+    """
+    Find the inflection points of all cubic segments.
+
+    Args:
+        segments (Any): The segments as returned by `gather_segments`
+        err_min (float, optional): The minimum allowed t of an inflection point.
+            Defaults to 0.3.
+        err_max (float, optional): The maximum allowed t of an inflection point.
+            Defaults to 0.7.
+
+    Returns:
+        tuple[list[InflectionTuple], list[InflectionTuple]]: The inflection points
+            that are allowed per minimum and maximum t, and the inflection points
+            that are considered errors, each ordered by segment.
+    """
+    if np is None or len(segments) < vectorize_min_segments:
+        return _cubic_inflections_py(_segment_tuples(segments), err_min, err_max)
+    return _cubic_inflections_np(segments, err_min, err_max)
+
+
+def _inflection_roots(
+    pt1: "PointTuple", pt2: "PointTuple", pt3: "PointTuple", pt4: "PointTuple"
+) -> list[float]:
+    # After https://github.com/mekkablue/InsertInflections
+    roots: list[float] = []
+
+    x1, y1 = pt1
+    x2, y2 = pt2
+    x3, y3 = pt3
+    x4, y4 = pt4
+
+    ax = x2 - x1
+    ay = y2 - y1
+    bx = x3 - x2 - ax
+    by = y3 - y2 - ay
+    cx = x4 - x3 - ax - bx - bx
+    cy = y4 - y3 - ay - by - by
+
+    c0 = (ax * by) - (ay * bx)
+    c1 = (ax * cy) - (ay * cx)
+    c2 = (bx * cy) - (by * cx)
+
+    if abs(c2) > 0.00001:
+        discr = (c1**2) - (4 * c0 * c2)
+        c2 *= 2
+        if abs(discr) < 0.000001:
+            root = -c1 / c2
+            if 0.001 < root < 0.999:
+                roots.append(root)
+        elif discr > 0:
+            discr = discr**0.5
+            root = (-c1 - discr) / c2
+            if 0.001 < root < 0.999:
+                roots.append(root)
+
+            root = (-c1 + discr) / c2
+            if 0.001 < root < 0.999:
+                roots.append(root)
+    elif c1 != 0.0:
+        root = -c0 / c1
+        if 0.001 < root < 0.999:
+            roots.append(root)
+    return roots
+
+
+def _cubic_inflections_py(
+    segments: "Sequence[CubicCurveTuple]", err_min: float, err_max: float
+) -> tuple[list[InflectionTuple], list[InflectionTuple]]:
+    ok_inflections: list[InflectionTuple] = []
+    err_inflections: list[InflectionTuple] = []
+    for n, (pt1, pt2, pt3, pt4) in enumerate(segments):
+        roots = _inflection_roots(pt1, pt2, pt3, pt4)
+        if not roots:
+            continue
+
+        for inflections, ts in (
+            (ok_inflections, [t for t in roots if err_min < t < err_max]),
+            (err_inflections, [t for t in roots if not err_min < t < err_max]),
+        ):
+            for _, _, (x3, y3), (x, y) in splitCubicAtT(pt1, pt2, pt3, pt4, *ts)[:-1]:
+                inflections.append((n, x, y, x - x3, y - y3))
+    return ok_inflections, err_inflections
+
+
+def _cubic_inflections_np(
+    segments: Any, err_min: float, err_max: float
+) -> tuple[list[InflectionTuple], list[InflectionTuple]]:
+    segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4, 2)
+    p0 = segments[:, 0]
+    p1 = segments[:, 1]
+    p2 = segments[:, 2]
+    p3 = segments[:, 3]
+
+    # Coefficients of the inflection equation
+    da = p1 - p0
+    db = p2 - p1 - da
+    dc = p3 - p2 - da - db - db
+    c0 = da[:, 0] * db[:, 1] - da[:, 1] * db[:, 0]
+    c1 = da[:, 0] * dc[:, 1] - da[:, 1] * dc[:, 0]
+    c2 = db[:, 0] * dc[:, 1] - db[:, 1] * dc[:, 0]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        quadratic = np.abs(c2) > 0.00001
+        discr = c1**2 - 4 * c0 * c2
+        double = quadratic & (np.abs(discr) < 0.000001)
+        two = quadratic & ~double & (discr > 0)
+        rdiscr = np.sqrt(np.where(two, discr, 0.0))
+        c2 = c2 * 2
+        linear = ~quadratic & (c1 != 0.0)
+        r1 = np.where(
+            double,
+            -c1 / c2,
+            np.where(two, (-c1 - rdiscr) / c2, np.where(linear, -c0 / c1, np.nan)),
+        )
+        r2 = np.where(two, (-c1 + rdiscr) / c2, np.nan)
+    t = np.stack((r1, r2), axis=1)
+    valid = (t > 0.001) & (t < 0.999)
+    ok = (t > err_min) & (t < err_max)
+
+    rows, slots = np.nonzero(valid)
+    if not len(rows):
+        return [], []
+
+    # The split start of the second root is the first root if both are in the same
+    # group of allowed or error inflections
+    first_in_group = valid[:, 0] & (ok[:, 0] == ok[:, 1])
+    t_prev = np.stack(
+        (np.zeros(len(t)), np.where(first_in_group, t[:, 0], 0.0)), axis=1
+    )
+
+    c = (p1 - p0) * 3.0
+    b = (p2 - p1) * 3.0 - c
+    a = p3 - p0 - c - b
+    t2 = t[rows, slots][:, None]
+    t1 = t_prev[rows, slots][:, None]
+    points, vectors = _split_ends_np(a[rows], b[rows], c[rows], p0[rows], t1, t2)
+
+    records = list(
+        zip(
+            rows.tolist(),
+            points[:, 0].tolist(),
+            points[:, 1].tolist(),
+            vectors[:, 0].tolist(),
+            vectors[:, 1].tolist(),
+        )
+    )
+    is_ok = ok[rows, slots].tolist()
+    return (
+        [r for r, o in zip(records, is_ok) if o],
+        [r for r, o in zip(records, is_ok) if not o],
+    )
+
+
+def fractional_points(
+    xs: "Sequence[float]",
+    ys: "Sequence[float]",
+    grid_length: float = 1,
+    ignore_point_zero: bool = True,
+) -> list[int]:
+    """
+    Find the points whose coordinates are not on the grid.
+
+    The coordinates may be those of a layer or of many layers, e.g. all nodes of a
+    font concatenated.
+
+    Args:
+        xs (Sequence[float]): The x coordinates of the points
+        ys (Sequence[float]): The y coordinates of the points
+        grid_length (float, optional): The grid length. If it is 0, no point is
+            off the grid. Defaults to 1.
+        ignore_point_zero (bool, optional): Whether float coordinates that are
+            whole multiples of the grid length are allowed. Otherwise, any float
+            coordinate is reported. Defaults to True.
+
+    Returns:
+        list[int]: The indices of the points with fractional coordinates
+    """
+    if not ignore_point_zero:
+        if getattr(xs, "typecode", None) == "d":
+            # Arrays of doubles can only hold float coordinates
+            return list(range(len(xs)))
+
+        return [
+            i
+            for i, (x, y) in enumerate(zip(xs, ys))
+            if not (isinstance(x, int) and isinstance(y, int))
+        ]
+
+    if grid_length == 0 or not len(xs):
+        return []
+
+    if np is None:
+        return _fractional_points_py(xs, ys, grid_length)
+    return _fractional_points_np(xs, ys, grid_length)
+
+
+def _fractional_points_py(
+    xs: "Sequence[float]", ys: "Sequence[float]", grid_length: float
+) -> list[int]:
+    if grid_length == 1:
+        return [
+            i
+            for i, (x, y) in enumerate(zip(xs, ys))
+            if not (abs(round(x) - x) < 0.001 and abs(round(y) - y) < 0.001)
+        ]
+
+    g = grid_length
+    return [
+        i
+        for i, (x, y) in enumerate(zip(xs, ys))
+        if not (abs(round(x / g) * g - x) < 0.001 and abs(round(y / g) * g - y) < 0.001)
+    ]
+
+
+def _fractional_points_np(
+    xs: "Sequence[float]", ys: "Sequence[float]", grid_length: float
+) -> list[int]:
+    points = np.stack(
+        (np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)), axis=1
+    )
+    if grid_length == 1:
+        rounded = np.round(points)
+    else:
+        rounded = np.round(points / grid_length) * grid_length
+    # NaN coordinates are reported, as in the scalar comparison
+    on_grid = (np.abs(rounded - points) < 0.001).all(axis=1)
+    return np.flatnonzero(~on_grid).tolist()
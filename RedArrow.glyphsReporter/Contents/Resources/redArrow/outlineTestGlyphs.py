@@ -1,26 +1,73 @@
 from math import atan2, cos, degrees, pi, sin, sqrt
-from typing import TYPE_CHECKING, Sequence
-
-from AppKit import NSMakePoint
-from GlyphsApp import GSCURVE, GSLINE, GSOFFCURVE, GSQCURVE
+from threading import Lock
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Sequence,
+)
 
+from redArrow.cache import contour_key
+from redArrow.kernels import (
+    cubic_extrema,
+    cubic_inflections,
+    fractional_points,
+    gather_segments,
+    rect_distance,
+)
 from redArrow.misc.arrayTools import normRect
 from redArrow.misc.bezierTools import (
-    calcCubicParameters,
     calcQuadraticParameters,
     epsilon,
-    solveQuadratic,
-    splitCubicAtT,
     splitQuadraticAtT,
 )
 from redArrow.misc.transform import Transform
+from redArrow.snapshot import CURVE, LINE, OFFCURVE, QCURVE, LayerSnapshot
 from redArrow.typing import RedArrowOptionsDict
 
+try:
+    from AppKit import NSMakePoint
+except ImportError:
+    # Outside of Glyphs, e.g. when running from the command line
+
+    class _Point(NamedTuple):
+        x: float
+        y: float
+
+    def NSMakePoint(x: float, y: float) -> "_Point":  # type: ignore
+        return _Point(x, y)
+
+
 if TYPE_CHECKING:
+    from threading import Event
+
     from AppKit import NSAffineTransformStruct, NSPoint, NSRect
-    from GlyphsApp import GSComponent, GSLayer, GSNode
+    from GlyphsApp import GSLayer, GSNode
+
+    from redArrow.cache import CachedErrorTuple, ContourCache
+    from redArrow.snapshot import ComponentSnapshot
+    from redArrow.stats import CheckStats
+    from redArrow.typing import (
+        PointTuple,
+        QuadraticCurveTuple,
+        RectTuple,
+        TransformTuple,
+        Vector2D,
+    )
 
-    from redArrow.typing import PointTuple, QuadraticCurveTuple, RectTuple, Vector2D
+    # A check compiled for the early-exit mode: the name, the methods by node
+    # type, the component method and the layer method
+    CompiledCheckTuple = tuple[
+        str,
+        list[Callable[[int], Any] | None],
+        Callable[[ComponentSnapshot], Any] | None,
+        Callable[[], Any] | None,
+    ]
 
 
 # Helper functions
@@ -60,13 +107,14 @@ def solve_linear(a: float, b: float) -> list[float]:
 
 
 def quad_with_explicit_oncurve_points(
-    quad: "Sequence[GSNode|NSPoint]",
+    quad: "Sequence[PointTuple]",
 ) -> "list[PointTuple]":
     """
-    Take a quadratic segment of GSNodes and add implied oncurve points
+    Take a quadratic segment of tuple points and add implied oncurve points
 
     Args:
-        quad (Sequence[GSNode]): The quadratic segment with implicit oncurve points
+        quad (Sequence[PointTuple]): The quadratic segment with implicit oncurve
+            points
 
     Returns:
         list[PointTuple]: The quadratic segment as tuple points with explicit oncurve points
@@ -74,161 +122,9 @@ def quad_with_explicit_oncurve_points(
     new_quad = [quad[0]]
     for i in range(1, len(quad) - 2):
         new_quad.append(quad[i])
-        new_quad.append(nodes_half_point(quad[i], quad[i + 1]))
+        new_quad.append(pts_half_point(quad[i], quad[i + 1]))
     new_quad.extend(quad[-2:])
-    # Convert to tuples
-    return [(p.x, p.y) for p in new_quad]
-
-
-def get_extrema_points_vectors(
-    roots: Sequence[float],
-    pt1: "PointTuple",
-    pt2: "PointTuple",
-    pt3: "PointTuple",
-    pt4: "PointTuple",
-) -> "tuple[list[PointTuple], list[Vector2D]]":
-    """
-    Calculate extremum points and the normal vectors for those points for a cubic
-    segment represented by four control points and the roots of the extrema.
-
-    Args:
-        roots (Sequence[float]): The extrema roots
-        pt1 (PointTuple): The first control point
-        pt2 (PointTuple): The second control point
-        pt3 (PointTuple): The third control point
-        pt4 (PointTuple): The fourth control point
-
-    Returns:
-        tuple[list[PointTuple], list[Vector2D]]: The extremum points and normal vectors
-    """
-    split_segments = [seg for seg in splitCubicAtT(pt1, pt2, pt3, pt4, *roots)[:-1]]
-    points = [pt[3] for pt in split_segments]
-    vectors = [pts_normal_vector(pt[2], pt[3]) for pt in split_segments]
-    return points, vectors
-
-
-def get_extrema_for_cubic(
-    node1: "GSNode",
-    node2: "GSNode",
-    node3: "GSNode",
-    node4: "GSNode",
-    h: bool = True,
-    v: bool = False,
-) -> "tuple[list[PointTuple], list[Vector2D]]":
-    """
-    Calculate extremum points and the normal vectors for those points for a cubic
-    segment represented by four control points as GSNodes.
-
-    Args:
-        node1 (GSNode): The first control point as GSNode
-        node2 (GSNode): The second control point as GSNode
-        node3 (GSNode): The third control point as GSNode
-        node4 (GSNode): The fourth control point as GSNode
-        h (bool, optional): Whether to find horizontal extrema. Defaults to True.
-        v (bool, optional): Whether to find vertical extrema. Defaults to False.
-
-    Returns:
-        tuple[list[PointTuple], list[Vector2D]]: The extremum points and normal vectors
-    """
-    pt1 = (node1.x, node1.y)
-    pt2 = (node2.x, node2.y)
-    pt3 = (node3.x, node3.y)
-    pt4 = (node4.x, node4.y)
-    (ax, ay), (bx, by), c, _ = calcCubicParameters(pt1, pt2, pt3, pt4)
-    ax *= 3.0
-    ay *= 3.0
-    bx *= 2.0
-    by *= 2.0
-    points: "list[PointTuple]" = []
-    vectors: "list[Vector2D]" = []
-    if h:
-        roots = [t for t in solveQuadratic(ay, by, c[1]) if 0 < t < 1]
-        points, vectors = get_extrema_points_vectors(roots, pt1, pt2, pt3, pt4)
-    if v:
-        roots = [t for t in solveQuadratic(ax, bx, c[0]) if 0 < t < 1]
-        v_points, v_vectors = get_extrema_points_vectors(roots, pt1, pt2, pt3, pt4)
-        points += v_points
-        vectors += v_vectors
-    return points, vectors
-
-
-def get_inflections_for_cubic(
-    pt1: "PointTuple",
-    pt2: "PointTuple",
-    pt3: "PointTuple",
-    pt4: "PointTuple",
-    err_min: float = 0.3,
-    err_max: float = 0.7,
-) -> "tuple[tuple[list[PointTuple], list[Vector2D]], tuple[list[PointTuple], list[Vector2D]]]":
-    """
-    Calculate inflection points and the normal vectors for those points for a cubic
-    segment represented by four control points.
-
-    Args:
-        pt1 (PointTuple): The first control point
-        pt2 (PointTuple): The second control point
-        pt3 (PointTuple): The third control point
-        pt4 (PointTuple): The fourth control point
-        err_min (float, optional): The minimum allowed t of an inflection point. Defaults to 0.3.
-        err_max (float, optional): The maximum allowed t of an inflection point. Defaults to 0.7.
-
-    Returns:
-        tuple[tuple[list[PointTuple], list[Vector2D]], tuple[list[PointTuple], list[Vector2D]]]:
-            The inflection points and normal vectors. The first part of the tuple are the
-            inflection points that are allowed per minimum and maximum t, the second part
-            are the inflection points that are considered errors.
-    """
-    # After https://github.com/mekkablue/InsertInflections
-    roots: list[float] = []
-
-    x1, y1 = pt1
-    x2, y2 = pt2
-    x3, y3 = pt3
-    x4, y4 = pt4
-
-    ax = x2 - x1
-    ay = y2 - y1
-    bx = x3 - x2 - ax
-    by = y3 - y2 - ay
-    cx = x4 - x3 - ax - bx - bx
-    cy = y4 - y3 - ay - by - by
-
-    c0 = (ax * by) - (ay * bx)
-    c1 = (ax * cy) - (ay * cx)
-    c2 = (bx * cy) - (by * cx)
-
-    if abs(c2) > 0.00001:
-        discr = (c1**2) - (4 * c0 * c2)
-        c2 *= 2
-        if abs(discr) < 0.000001:
-            root = -c1 / c2
-            if 0.001 < root < 0.999:
-                roots.append(root)
-        elif discr > 0:
-            discr = discr**0.5
-            root = (-c1 - discr) / c2
-            if 0.001 < root < 0.999:
-                roots.append(root)
-
-            root = (-c1 + discr) / c2
-            if 0.001 < root < 0.999:
-                roots.append(root)
-    elif c1 != 0.0:
-        root = -c0 / c1
-        if 0.001 < root < 0.999:
-            roots.append(root)
-
-    ok_inflections = []
-    err_inflections = []
-    for r in roots:
-        if err_min < r < err_max:
-            ok_inflections.append(r)
-        else:
-            err_inflections.append(r)
-    return (
-        get_extrema_points_vectors(ok_inflections, pt1, pt2, pt3, pt4),
-        get_extrema_points_vectors(err_inflections, pt1, pt2, pt3, pt4),
-    )
+    return new_quad
 
 
 def get_extrema_points_vectors_quad(
@@ -426,37 +322,113 @@ def nodes_half_point(node1: "GSNode | NSPoint", node2: "GSNode | NSPoint") -> "N
     return NSMakePoint(x, y)
 
 
+def pts_half_point(pt1: "PointTuple", pt2: "PointTuple") -> "PointTuple":
+    """
+    Return the halfway point between two tuple points.
+
+    Args:
+        pt1 (PointTuple): The first point
+        pt2 (PointTuple): The second point
+
+    Returns:
+        PointTuple: The halfway point
+    """
+    return (pt1[0] + pt2[0]) / 2, (pt1[1] + pt2[1]) / 2
+
+
+def transform_bounds(
+    bounds: "RectTuple",
+    matrix: "NSAffineTransformStruct | TransformTuple",
+) -> "RectTuple":
+    """
+    Transform a rectangle given as tuple with a matrix.
+
+    Args:
+        bounds (RectTuple): The rectangle as (xMin, yMin, xMax, yMax)
+        matrix (NSAffineTransformStruct | TransformTuple): The transformation matrix
+
+    Returns:
+        RectTuple: The normalized transformed rectangle, described by its lower left
+            and top right points
+    """
+    t = Transform(*matrix)
+    ll_x, ll_y = t.transformPoint((bounds[0], bounds[1]))
+    tr_x, tr_y = t.transformPoint((bounds[2], bounds[3]))
+    return normRect((ll_x, ll_y, tr_x, tr_y))
+
+
 def transform_rect(
     rect: "NSRect",
-    matrix: "NSAffineTransformStruct | tuple[float, float, float, float, float, float]",
+    matrix: "NSAffineTransformStruct | TransformTuple",
 ) -> "tuple[NSPoint, NSPoint]":
     """
     Transform a rectangle with a matrix.
 
     Args:
         rect (NSRect): The rectangle
-        matrix (NSAffineTransformStruct | tuple[float, float, float, float, float, float]):
-            The transformation matrix
+        matrix (NSAffineTransformStruct | TransformTuple): The transformation matrix
 
     Returns:
         tuple[NSPoint, NSPoint]: The transformed rectangle described by its lower left
             and top right points
     """
-    t = Transform(*matrix)
-    ll_x, ll_y = t.transformPoint((rect.origin.x, rect.origin.y))
-    tr_x, tr_y = t.transformPoint(
-        (rect.origin.x + rect.size.width, rect.origin.y + rect.size.height)
+    x = rect.origin.x
+    y = rect.origin.y
+    ll_x, ll_y, tr_x, tr_y = transform_bounds(
+        (x, y, x + rect.size.width, y + rect.size.height), matrix
     )
-    ll_x, ll_y, tr_x, tr_y = normRect((ll_x, ll_y, tr_x, tr_y))
     return NSMakePoint(ll_x, ll_y), NSMakePoint(tr_x, tr_y)
 
 
+# The maximum angles of semi-horizontal and semi-vertical lines to the horizontal
+# and vertical lines
+semi_horizontal_angle = atan2(1, 31)
+semi_vertical_angle = atan2(31, 1)
+
+
+# The descriptions of the errors, by kind id
+error_kinds: list[str] = []
+_kind_ids: dict[str, int] = {}
+_kind_ids_lock = Lock()
+
+
+def kind_id(kind: str) -> int:
+    """
+    Return the id of an error description. New descriptions get the next id.
+
+    Args:
+        kind (str): The description
+
+    Returns:
+        int: The index of the description in `error_kinds`
+    """
+    i = _kind_ids.get(kind)
+    if i is None:
+        # Errors may be created on several threads
+        with _kind_ids_lock:
+            i = _kind_ids.get(kind)
+            if i is None:
+                i = len(error_kinds)
+                error_kinds.append(kind)
+                _kind_ids[kind] = i
+    return i
+
+
 class OutlineError:
+    """
+    An outline error. The position is stored as plain coordinates and the
+    description as kind id, so that large numbers of errors stay small and don't
+    reference any objects of the font.
+    """
+
+    __slots__ = ("x", "y", "kind_id", "badness", "vector")
+
     level: str = "e"
 
     def __init__(
         self,
-        position: "GSNode | NSPoint | None" = None,
+        x: float | None = None,
+        y: float | None = None,
         kind: str = "Unknown error",
         badness: float | None = None,
         vector: "PointTuple | None" = None,
@@ -465,7 +437,9 @@ class OutlineError:
         An outline error.
 
         Args:
-            position (NSPoint | None, optional): The position of the error. Defaults to
+            x (float | None, optional): The x coordinate of the error, or None for
+                errors without position. Defaults to None.
+            y (float | None, optional): The y coordinate of the error. Defaults to
                 None.
             kind (str, optional): The description. Defaults to "Unknown error".
             badness (float | None, optional): The "badness" level. Defaults to None.
@@ -473,11 +447,32 @@ class OutlineError:
                 Defaults to None. It is used to determine the angle of the arrow
                 pointing at the error.
         """
-        self.position = position
-        self.kind = kind
+        if x is None:
+            self.x = self.y = None
+        else:
+            self.x = float(x)
+            self.y = float(y)
+        self.kind_id = kind_id(kind)
         self.badness = badness
         self.vector = vector
 
+    @property
+    def kind(self) -> str:
+        """
+        The description of the error.
+        """
+        return error_kinds[self.kind_id]
+
+    @property
+    def position(self) -> "NSPoint | None":
+        """
+        The position of the error as point, or None if it has no position.
+        """
+        if self.x is None:
+            return None
+
+        return NSMakePoint(self.x, self.y)
+
     def __repr__(self) -> str:
         """
         Return a string representation of the outline error.
@@ -486,17 +481,155 @@ class OutlineError:
             str: The description
         """
         r = self.kind
-        if self.position is not None:
-            r += f" at ({self.position.x}, {self.position.y})"
+        if self.x is not None:
+            r += f" at ({self.x}, {self.y})"
         if self.badness is not None:
             r += f" (badness {self.badness})"
         return r
 
 
 class OutlineWarning(OutlineError):
+    __slots__ = ()
+
     level: str = "w"
 
 
+class _ErrorFound(Exception):
+    # Stops the checks at the first error in `OutlineCheck.has_errors`
+    pass
+
+
+class CheckCancelled(Exception):
+    """
+    Raised by the checks when the cancel event of the outline check was set.
+    """
+
+    pass
+
+
+class CheckDefinition:
+    """
+    A check that can be run by the outline check.
+    """
+
+    __slots__ = ("name", "node_methods", "component_method", "layer_method", "cost")
+
+    def __init__(
+        self,
+        name: str,
+        node_methods: "dict[int, str] | None" = None,
+        component_method: str | None = None,
+        layer_method: str | None = None,
+        cost: int = 1,
+    ) -> None:
+        """
+        Args:
+            name (str): The name of the check, e.g. "test_extrema". It is used in the
+                list of checks to be run, and as the attribute of the outline check
+                that tells whether the check is enabled.
+            node_methods (dict[int, str] | None, optional): The names of the
+                OutlineCheck methods that run the check, by node type. They are
+                called with the index of a node in the snapshot. Defaults to None.
+            component_method (str | None, optional): The name of the OutlineCheck
+                method that runs the check for a ComponentSnapshot. Defaults to None.
+            layer_method (str | None, optional): The name of the OutlineCheck method
+                that runs the check once for the whole layer, after the node checks.
+                Defaults to None.
+            cost (int, optional): The relative cost of the check per node. Defaults
+                to 1.
+        """
+        self.name = name
+        self.node_methods = {} if node_methods is None else node_methods
+        self.component_method = component_method
+        self.layer_method = layer_method
+        self.cost = cost
+
+    def __repr__(self) -> str:
+        return f"<CheckDefinition '{self.name}'>"
+
+
+# The available checks by name. For each node, the enabled checks are run in this
+# order.
+check_registry: dict[str, CheckDefinition] = {}
+
+
+def register_check(definition: CheckDefinition) -> None:
+    """
+    Add a check to the registry, or replace a check of the same name.
+
+    Args:
+        definition (CheckDefinition): The check
+    """
+    check_registry[definition.name] = definition
+
+
+for _definition in (
+    CheckDefinition(
+        "test_extrema",
+        {CURVE: "_check_bbox_curve", QCURVE: "_check_extrema_qcurve"},
+        cost=4,
+    ),
+    CheckDefinition("test_inflections", {CURVE: "_check_inflections_curve"}, cost=4),
+    CheckDefinition(
+        "test_fractional_coords",
+        {
+            LINE: "_check_fractional_coordinates",
+            CURVE: "_check_fractional_coordinates",
+            QCURVE: "_check_fractional_coordinates",
+            OFFCURVE: "_check_fractional_coordinates",
+        },
+        component_method="_check_fractional_component_offset",
+    ),
+    CheckDefinition(
+        "test_smooth",
+        {
+            LINE: "_check_incorrect_smooth_connection",
+            CURVE: "_check_incorrect_smooth_connection",
+            QCURVE: "_check_incorrect_smooth_connection",
+        },
+        cost=3,
+    ),
+    CheckDefinition(
+        "test_spikes",
+        {LINE: "_check_spike", CURVE: "_check_spike", QCURVE: "_check_spike"},
+        cost=2,
+    ),
+    CheckDefinition(
+        "test_empty_segments",
+        {
+            LINE: "_check_empty_segment",
+            CURVE: "_check_empty_curve",
+            QCURVE: "_check_empty_segment",
+        },
+    ),
+    CheckDefinition("test_collinear", {LINE: "_check_collinear_line"}, cost=3),
+    CheckDefinition("test_zero_handles", {CURVE: "_check_zero_handles_curve"}),
+    CheckDefinition(
+        "test_semi_hv",
+        {
+            LINE: "_check_semi_hv_line",
+            CURVE: "_check_semi_hv_curve",
+            QCURVE: "_check_semi_hv_qcurve",
+        },
+        cost=2,
+    ),
+    CheckDefinition(
+        "test_short_segments",
+        {
+            LINE: "_check_short_segment",
+            CURVE: "_check_short_curve",
+            QCURVE: "_check_short_segment",
+        },
+    ),
+    CheckDefinition("test_bbox_handles", layer_method="_check_layer_bbox_handles"),
+    CheckDefinition(
+        "test_fractional_transform",
+        component_method="_check_fractional_transformation",
+    ),
+):
+    register_check(_definition)
+
+
 class OutlineCheck:
     """
     Reimplementation of FontLab's FontAudit.
@@ -507,6 +640,8 @@ class OutlineCheck:
         layer: "GSLayer | None",
         options: RedArrowOptionsDict | None = None,
         run_checks: Sequence[str] | None = None,
+        cache: "ContourCache | None" = None,
+        stats: "CheckStats | None" = None,
     ) -> None:
         """
         The outline check.
@@ -517,25 +652,31 @@ class OutlineCheck:
                 Defaults to None.
             run_checks (Sequence[str] | None, optional): The names of the checks to be
                 run. Defaults to None.
+            cache (ContourCache | None, optional): A cache for the results of
+                contours. It can be shared between several outline checks. Defaults
+                to None.
+            stats (CheckStats | None, optional): If given, the time, calls, errors
+                and visited nodes of each check method are counted in it. Defaults
+                to None.
         """
         self.options = RedArrowOptionsDict() if options is None else options
         self.run_checks = [] if run_checks is None else run_checks
+        self.cache = cache
+        self.stats = stats
+        # When this event is set, e.g. from another thread, the running check
+        # stops with CheckCancelled
+        self.cancel_event: "Event | None" = None
+        # The error positions of components, by base glyph bounds and
+        # transformation. Composites often use the same base glyphs in the same
+        # positions.
+        self._component_positions: "dict[tuple, PointTuple]" = {}
         self.reset()
-        self.layer = layer
 
         # Cached test run settings
-        self.test_fractional_coords = True
-        self.test_smooth = True
-        self.test_empty_segments = True
-        self.test_collinear = True
-        self.test_spikes = True
-        self.test_semi_hv = True
-        self.test_short_segments = True
-        self.test_extrema = True
-        self.test_inflections = True
-        self.test_zero_handles = True
-        self.test_bbox_handles = True
-        self.test_fractional_transform = True
+        for name in self.all_checks:
+            setattr(self, name, True)
+
+        self.layer = layer
 
     def reset(self) -> None:
         """
@@ -543,21 +684,35 @@ class OutlineCheck:
         """
         self.errors: list[OutlineError | OutlineWarning] = []
 
-        self.all_checks = [
-            "test_extrema",
-            "test_inflections",
-            "test_fractional_coords",
-            "test_fractional_transform",
-            "test_smooth",
-            "test_empty_segments",
-            "test_collinear",
-            "test_semi_hv",
-            # "test_closepath",
-            "test_zero_handles",
-            "test_bbox_handles",
-            "test_short_segments",
-            "test_spikes",
-        ]
+        self.all_checks = list(check_registry)
+
+        # Whether `_flag` stops the checks instead of adding an error
+        self._early_exit = False
+
+        # The geometry of the checked layer
+        self.snapshot = LayerSnapshot()
+
+        # The errors of each node of the snapshot, and the options they were found
+        # with. They are kept for incremental checks.
+        self._node_errors: "list[list[OutlineError]]" = []
+        self._node_errors_key: Hashable = None
+
+        # Results of the batched curve calculations, by segment end node index
+        self._extrema: "dict[int, list[tuple]]" = {}
+        self._inflections: "dict[int, list[tuple]]" = {}
+        # The vector, length, angle and back angle of the edge from the previous
+        # node to each node, calculated for the checked nodes before their checks
+        # run, so that the checks of neighbouring nodes share them
+        self._edge_dx: list[float] = []
+        self._edge_dy: list[float] = []
+        self._edge_length: list[float] = []
+        self._edge_angle: list[float] = []
+        self._edge_back_angle: list[float] = []
+        self._edges_snapshot: LayerSnapshot | None = None
+        # The nodes with fractional coordinates, found for all nodes of a snapshot
+        # at once when they are first needed
+        self._fractional: "set[int]" = set()
+        self._fractional_snapshot: LayerSnapshot | None = None
 
         # Curve type detection
         self.apparently_cubic = False
@@ -581,16 +736,6 @@ class OutlineCheck:
     def layer(self, value: "GSLayer | None") -> None:
         self._layer = value
         self.upm = 1000 if self.layer is None else self.layer.parent.parent.upm
-        if self._layer is not None:
-            try:
-                bounds = self._layer.bounds
-                self.bb_bottom = bounds.origin.y
-                self.bb_left = bounds.origin.x
-                self.bb_top = self.bb_bottom + bounds.size.height
-            except AttributeError:
-                self.bb_bottom = 0
-                self.bb_left = 0
-                self.bb_top = 0
         self._cache_options()
 
     def _normalize_upm(self, value: float) -> float:
@@ -655,194 +800,798 @@ class OutlineCheck:
                 else:
                     setattr(self, t, False)
 
-    def check_layer(self) -> None:
+        # Compile the enabled checks into a list of methods for each node type, so
+        # that only the enabled checks are dispatched for each node
+        enabled = [d for d in check_registry.values() if getattr(self, d.name, False)]
+        self._node_pipelines: "list[list[Callable[[int], Any]]]" = [
+            [
+                self._check_method(d.node_methods[node_type], d.name, "node")
+                for d in enabled
+                if node_type in d.node_methods
+            ]
+            for node_type in (LINE, CURVE, QCURVE, OFFCURVE)
+        ]
+        self._component_pipeline: "list[Callable[[ComponentSnapshot], Any]]" = [
+            self._check_method(d.component_method, d.name, "component")
+            for d in enabled
+            if d.component_method
+        ]
+        self._layer_pipeline: "list[Callable[[], Any]]" = [
+            self._check_method(d.layer_method, d.name, "layer")
+            for d in enabled
+            if d.layer_method
+        ]
+        # The enabled checks with their methods by node type, cheapest first, for
+        # the early-exit mode
+        self._checks_by_cost: "list[CompiledCheckTuple]" = [
+            (
+                d.name,
+                [
+                    (
+                        self._check_method(d.node_methods[node_type], d.name, "node")
+                        if node_type in d.node_methods
+                        else None
+                    )
+                    for node_type in (LINE, CURVE, QCURVE, OFFCURVE)
+                ],
+                (
+                    self._check_method(d.component_method, d.name, "component")
+                    if d.component_method
+                    else None
+                ),
+                (
+                    self._check_method(d.layer_method, d.name, "layer")
+                    if d.layer_method
+                    else None
+                ),
+            )
+            for d in sorted(enabled, key=lambda d: d.cost)
+        ]
+
+        if self.stats is None:
+            self.__dict__.pop("_calculate_cubic_segments", None)
+            self.__dict__.pop("_calculate_edges", None)
+        else:
+            self._calculate_cubic_segments = self.stats.wrap(
+                self,
+                OutlineCheck._calculate_cubic_segments.__get__(self),
+                "test_extrema, test_inflections",
+                "segments",
+            )
+            self._calculate_edges = self.stats.wrap(
+                self,
+                OutlineCheck._calculate_edges.__get__(self),
+                "test_smooth, test_spikes, test_collinear, test_semi_hv",
+                "nodes",
+            )
+
+        # The fractional nodes depend on the grid options
+        self._fractional_snapshot = None
+        # Whether any enabled check reads the edge table
+        self._edge_checks = (
+            self.test_smooth
+            or self.test_spikes
+            or self.test_collinear
+            or self.test_semi_hv
+        )
+
+        # The settings that influence the results of a contour
+        self._options_key = (
+            tuple(getattr(self, t) for t in self.all_checks),
+            self.extremum_calculate_badness,
+            self.fractional_ignore_point_zero,
+            self.extremum_ignore_badness_below,
+            self.smooth_connection_max_distance,
+            self.collinear_vectors_max_distance,
+            self.semi_hv_vectors_min_distance,
+            self.semi_hv_vectors_max_distance,
+            self.zero_handles_max_distance,
+            self.inflection_min,
+            self.spike_angle,
+            self.grid_length,
+            self.ignore_warnings,
+        )
+
+    def _check_method(
+        self, method_name: str, check_name: str, scope: str
+    ) -> "Callable[..., Any]":
+        """
+        Return a check method for the pipelines, wrapped for counting if the
+        statistics are enabled.
+        """
+        method = getattr(self, method_name)
+        if self.stats is None:
+            return method
+
+        return self.stats.wrap(self, method, check_name, scope)
+
+    def check_layer(self, incremental: bool = False) -> None:
+        """
+        Run the checks on the current layer. The results are stored in the `errors`
+        attribute.
+
+        Args:
+            incremental (bool, optional): Whether the layer is an edited version of
+                the previously checked layer. Only the nodes that were changed and
+                their neighbours are checked again, if possible. Defaults to False.
+        """
         self.errors = []
         if self.layer is None:
             return
 
-        for path in self.layer.paths:
-            for node in path.nodes:
-                node_type = node.type
-                if node_type == GSCURVE:
-                    self._run_curve_checks(node)
-                elif node_type == GSQCURVE:
-                    self._run_qcurve_checks(node)
-                elif node_type == GSLINE:
-                    self._run_line_checks(node)
-                else:
-                    self._run_offcurve_checks(node)
-
-        for component in self.layer.components:
-            self._run_component_checks(component)
-
-    # Checks for different node types
-
-    def _run_line_checks(self, node) -> None:
-        prev_node = node.prevNode
-        if self.test_fractional_coords:
-            self._check_fractional_coordinates(node)
-        if self.test_smooth:
-            self._check_incorrect_smooth_connection(node)
-        if self.test_empty_segments:
-            self._check_empty_lines_and_curves(prev_node, node)
-        if node.nextNode is not None and node.nextNode.type == GSLINE:
-            if self.test_collinear:
-                self._check_collinear_vectors(node)
-        if self.test_spikes:
-            self._check_spike(node)
-        if self.test_semi_hv:
-            if prev_node is not None:
-                self._check_semi_horizontal(prev_node, node)
-                self._check_semi_vertical(prev_node, node)
-        if self.test_short_segments:
-            self._check_short_lines_and_curves(prev_node, node)
-
-    def _run_curve_checks(self, node: "GSNode") -> None:
-        node4 = node
-        node3 = node4.prevNode  # control point 2
-        node2 = node3.prevNode  # control point 1
-        node1 = node2.prevNode
+        if self.stats is not None:
+            glyph = getattr(self.layer, "parent", None)
+            self.stats.begin(getattr(glyph, "name", None) or "")
+        self.check_snapshot(LayerSnapshot.from_layer(self.layer), incremental)
+
+    def check_snapshot(
+        self, snapshot: LayerSnapshot, incremental: bool = False
+    ) -> None:
+        """
+        Run the checks on the geometry of a layer that was read before. The results
+        are stored in the `errors` attribute. If the cancel event is set during the
+        check, it stops with CheckCancelled.
+
+        Args:
+            snapshot (LayerSnapshot): The layer geometry
+            incremental (bool, optional): Whether the snapshot is an edited version of
+                the previously checked snapshot. Defaults to False.
+        """
+        if self.stats is not None:
+            start = perf_counter()
+        previous = self.snapshot
+        self.errors = []
+        self.snapshot = snapshot
+        if snapshot.upm != self.upm:
+            self.upm = snapshot.upm
+            self._cache_options()
+        self.bb_left, self.bb_bottom, _, self.bb_top = snapshot.bounds
+
+        changed = None
+        if incremental and self._node_errors_key == self._options_key:
+            changed = snapshot.changed_nodes(previous)
+        self._node_errors_key = None
+        if changed is None:
+            self._check_all_contours()
+        else:
+            self._check_changed_nodes(changed)
+        self._node_errors_key = self._options_key
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise CheckCancelled
+
+        for check in self._layer_pipeline:
+            check()
+
+        self._check_curve_types()
+
+        for component in snapshot.components:
+            for check in self._component_pipeline:
+                check(component)
+
+        if self.stats is not None:
+            self.stats.add_layer(
+                perf_counter() - start, len(snapshot), len(self.errors)
+            )
+
+    def iter_errors(
+        self,
+        snapshot: LayerSnapshot | None = None,
+        max_count: int | None = None,
+        kinds: "Iterable[str] | None" = None,
+    ) -> "Iterator[OutlineError | OutlineWarning]":
+        """
+        Run the checks and yield the errors as they are found, in the same order
+        as `check_snapshot` finds them. The checks stop when the iteration is
+        stopped, so callers that only need some errors don't wait for the others.
+        The `errors` attribute stays empty. The contour cache is only used if the
+        number of errors is not limited.
+
+        Args:
+            snapshot (LayerSnapshot | None, optional): The layer geometry. Defaults
+                to None, which means the current layer is read.
+            max_count (int | None, optional): The maximum number of errors. Defaults
+                to None, which means all errors.
+            kinds (Iterable[str] | None, optional): The descriptions of the errors
+                to yield, e.g. "Fractional Coordinates". Defaults to None, which
+                means all errors.
+
+        Yields:
+            Iterator[OutlineError | OutlineWarning]: The errors
+        """
+        if snapshot is None:
+            if self.layer is None:
+                return
+
+            if self.stats is not None:
+                glyph = getattr(self.layer, "parent", None)
+                self.stats.begin(getattr(glyph, "name", None) or "")
+            snapshot = LayerSnapshot.from_layer(self.layer)
+        if max_count is not None and max_count <= 0:
+            return
+
+        # The descriptions are compared as strings, so that the filter doesn't
+        # add unknown descriptions to the registry of kind ids, and matches kinds
+        # that are not registered yet because no such error was found so far
+        wanted = None if kinds is None else set(kinds)
+        self.errors = []
+        self.snapshot = snapshot
+        # The errors of the nodes can't be used for incremental checks, because
+        # the iteration may be stopped before all nodes are checked
+        self._node_errors = [[] for _ in range(len(snapshot))]
+        self._node_errors_key = None
+        if snapshot.upm != self.upm:
+            self.upm = snapshot.upm
+            self._cache_options()
+        self.bb_left, self.bb_bottom, _, self.bb_top = snapshot.bounds
+
+        count = 0
+        seconds = 0.0
+        start = perf_counter()
+        try:
+            for errors in self._iter_error_batches(max_count is None):
+                for e in errors:
+                    if wanted is not None and e.kind not in wanted:
+                        continue
+
+                    count += 1
+                    # Don't count the time of the caller
+                    seconds += perf_counter() - start
+                    yield e
+                    if count == max_count:
+                        return
+
+                    start = perf_counter()
+            seconds += perf_counter() - start
+        finally:
+            self.errors = []
+            if self.stats is not None:
+                self.stats.add_layer(seconds, len(snapshot), count)
+
+    def _iter_error_batches(
+        self, use_cache: bool = True
+    ) -> "Iterator[list[OutlineError | OutlineWarning]]":
+        """
+        Run the checks step by step, and yield the errors of each node, of the
+        layer checks, and of each component.
+
+        Args:
+            use_cache (bool, optional): Whether to use the contour cache. Defaults to
+                True.
+        """
+        snapshot = self.snapshot
+        types = snapshot.types
+        pipelines = self._node_pipelines
+        node_errors = self._node_errors
+        starts = snapshot.starts
+        for contour in range(snapshot.contour_count):
+            start = starts[contour]
+            end = starts[contour + 1]
+            key = None
+            if use_cache and self.cache is not None:
+                key, origin = contour_key(
+                    snapshot, contour, self.grid_length, self._options_key
+                )
+                cached = self.cache.get(key)
+                if cached is not None:
+                    self._add_relative_errors(cached, start, origin)
+                    for i in range(start, end):
+                        yield node_errors[i]
+                    continue
+
+            if self.test_extrema or self.test_inflections:
+                self._calculate_cubic_segments(snapshot.cubic_segments([contour]))
+            if self._edge_checks:
+                self._calculate_edges(range(start, end))
+            for i in range(start, end):
+                self.errors = []
+                for check in pipelines[types[i]]:
+                    check(i)
+                node_errors[i] = self.errors
+                yield self.errors
+            # Only complete contours are stored
+            if key is not None:
+                self.cache.put(key, self._get_relative_errors(start, end, origin))
+
+        self.errors = []
+        for check in self._layer_pipeline:
+            check()
+        self._check_curve_types()
+        yield self.errors
+
+        for component in snapshot.components:
+            self.errors = []
+            for check in self._component_pipeline:
+                check(component)
+            yield self.errors
+
+    def has_errors(self, snapshot: LayerSnapshot) -> bool:
+        """
+        Find out whether the geometry of a layer has any errors or warnings,
+        without collecting them. The cheapest checks are run first for all nodes,
+        and the checks stop at the first error. No error objects are built, the
+        `errors` attribute stays empty.
+
+        Args:
+            snapshot (LayerSnapshot): The layer geometry
+
+        Returns:
+            bool: Whether the layer has at least one error or warning
+        """
+        self.errors = []
+        self.snapshot = snapshot
+        # The errors of the nodes are not known after an early exit
+        self._node_errors = []
+        self._node_errors_key = None
+        if snapshot.upm != self.upm:
+            self.upm = snapshot.upm
+            self._cache_options()
+        self.bb_left, self.bb_bottom, _, self.bb_top = snapshot.bounds
+
+        self._early_exit = True
+        try:
+            self._find_first_error()
+        except _ErrorFound:
+            return True
+        finally:
+            self._early_exit = False
+            self.errors = []
+        return False
+
+    def _find_first_error(self) -> None:
+        """
+        Run the checks check by check, cheapest first, until `_flag` raises
+        _ErrorFound.
+        """
+        snapshot = self.snapshot
+        self._check_curve_types()
+
+        # Contours with cached results don't need to be checked
+        contours = []
+        for contour in range(snapshot.contour_count):
+            if self.cache is not None:
+                key, _ = contour_key(
+                    snapshot, contour, self.grid_length, self._options_key
+                )
+                cached = self.cache.get(key)
+                if cached:
+                    raise _ErrorFound
+                if cached is not None:
+                    continue
+            contours.append(contour)
+        starts = snapshot.starts
+        nodes = [i for c in contours for i in range(starts[c], starts[c + 1])]
+        types = snapshot.types
+
+        segments_calculated = False
+        edges_calculated = False
+        edge_checks = ("test_smooth", "test_spikes", "test_collinear", "test_semi_hv")
+        for name, node_methods, component_method, layer_method in self._checks_by_cost:
+            if not segments_calculated and name in ("test_extrema", "test_inflections"):
+                self._calculate_cubic_segments(snapshot.cubic_segments(contours))
+                segments_calculated = True
+            if not edges_calculated and name in edge_checks:
+                self._calculate_edges(nodes)
+                edges_calculated = True
+            if any(node_methods):
+                for i in nodes:
+                    method = node_methods[types[i]]
+                    if method is not None:
+                        method(i)
+            if layer_method is not None:
+                layer_method()
+            if component_method is not None:
+                for component in snapshot.components:
+                    component_method(component)
+
+    def _check_all_contours(self) -> None:
+        """
+        Run the node checks for all contours of the snapshot, using the contour
+        cache where possible.
+        """
+        snapshot = self.snapshot
+        self._node_errors = [[] for _ in range(len(snapshot))]
+
+        # Look up the contours in the cache
+        contours = []
+        for contour in range(snapshot.contour_count):
+            if self.cache is None:
+                contours.append((contour, None, None, None))
+            else:
+                key, origin = contour_key(
+                    snapshot, contour, self.grid_length, self._options_key
+                )
+                contours.append((contour, key, origin, self.cache.get(key)))
+
+        if self.test_extrema or self.test_inflections:
+            self._calculate_cubic_segments(
+                snapshot.cubic_segments(
+                    [contour for contour, _, _, cached in contours if cached is None]
+                )
+            )
+
+        starts = snapshot.starts
+        if self._edge_checks:
+            self._calculate_edges(
+                [
+                    i
+                    for contour, _, _, cached in contours
+                    if cached is None
+                    for i in range(starts[contour], starts[contour + 1])
+                ]
+            )
+        for contour, key, origin, cached in contours:
+            start = starts[contour]
+            end = starts[contour + 1]
+            if cached is None:
+                self._check_nodes(range(start, end))
+                if key is not None:
+                    self.cache.put(key, self._get_relative_errors(start, end, origin))
+            else:
+                self._add_relative_errors(cached, start, origin)
+        self.errors = [e for node_errors in self._node_errors for e in node_errors]
+
+    def _check_changed_nodes(self, changed: Sequence[int]) -> None:
+        """
+        Run the node checks again for the changed nodes and the nodes whose checks
+        depend on them. The errors of all other nodes are kept from the previous
+        check.
+
+        Args:
+            changed (Sequence[int]): The indices of the changed nodes
+        """
+        snapshot = self.snapshot
+        dirty = set()
+        for i in changed:
+            dirty.add(i)
+            # The checks of the previous node look at the next node
+            prev_index = snapshot.prev[i]
+            if prev_index != -1:
+                dirty.add(prev_index)
+            # The checks of the next oncurve node look at the whole segment
+            next_index = snapshot.next_oncurve(i)
+            if next_index != -1:
+                dirty.add(next_index)
+        dirty_nodes = sorted(dirty)
+
+        if self.test_extrema or self.test_inflections:
+            self._calculate_cubic_segments(snapshot.cubic_segments_at(dirty_nodes))
+        if self._edge_checks:
+            # The checks of a node also look at the edge to the next node, and at
+            # the handles of the segment that ends at the node
+            edges = set()
+            for i in dirty_nodes:
+                edges.add(i)
+                edges.add(snapshot.next[i])
+                j = snapshot.prev[i]
+                while j != -1 and j != i and snapshot.types[j] == OFFCURVE:
+                    edges.add(j)
+                    j = snapshot.prev[j]
+            edges.discard(-1)
+            self._calculate_edges(sorted(edges))
+
+        self._check_nodes(dirty_nodes)
+        self.errors = [e for node_errors in self._node_errors for e in node_errors]
+
+    def _check_nodes(self, indices: Iterable[int]) -> None:
+        """
+        Run the node checks for some nodes and store their errors by node.
+
+        Args:
+            indices (Iterable[int]): The indices of the nodes in the snapshot
+        """
+        types = self.snapshot.types
+        pipelines = self._node_pipelines
+        node_errors = self._node_errors
+        cancel_event = self.cancel_event
+        for n, i in enumerate(indices):
+            if cancel_event is not None and not n & 255 and cancel_event.is_set():
+                raise CheckCancelled
+            self.errors = []
+            for check in pipelines[types[i]]:
+                check(i)
+            node_errors[i] = self.errors
+        self.errors = []
+
+    def _get_relative_errors(
+        self, start: int, end: int, origin: "PointTuple"
+    ) -> "list[CachedErrorTuple]":
+        """
+        Return the errors of the nodes from `start` to `end` with positions
+        relative to the origin, for storing them in the contour cache.
+        """
+        ox, oy = origin
+        return [
+            (
+                i - start,
+                e.__class__,
+                e.x - ox,
+                e.y - oy,
+                e.kind,
+                e.badness,
+                e.vector,
+            )
+            for i in range(start, end)
+            for e in self._node_errors[i]
+        ]
+
+    def _add_relative_errors(
+        self, errors: "list[CachedErrorTuple]", start: int, origin: "PointTuple"
+    ) -> None:
+        """
+        Add errors from the contour cache to the nodes from `start` on, moved to
+        the origin.
+        """
+        ox, oy = origin
+        node_errors = self._node_errors
+        for offset, error_class, x, y, kind, badness, vector in errors:
+            node_errors[start + offset].append(
+                error_class(x + ox, y + oy, kind, badness, vector)
+            )
+
+    def _calculate_cubic_segments(
+        self, indices: "list[tuple[int, int, int, int]]"
+    ) -> None:
+        """
+        Calculate the extrema and inflections of some cubic segments of the
+        snapshot in one batch.
+
+        Args:
+            indices (list[tuple[int, int, int, int]]): The node indices of the
+                segments, as returned by `LayerSnapshot.cubic_segments`
+        """
+        self._extrema = {}
+        self._inflections = {}
+        snapshot = self.snapshot
+        if not indices:
+            return
+
+        segments = gather_segments(snapshot.x, snapshot.y, indices)
         if self.test_extrema:
-            self._check_bbox_curve(node1, node2, node3, node4)
+            for n, x, y, vx, vy, badness in cubic_extrema(
+                segments, self.extremum_calculate_badness
+            ):
+                self._extrema.setdefault(indices[n][3], []).append(
+                    (x, y, vx, vy, badness)
+                )
+
         if self.test_inflections:
-            self._check_inflections_curve(node1, node2, node3, node4)
-        if self.test_fractional_coords:
-            self._check_fractional_coordinates(node)
-        if not self.curve_type_detected:
-            self._count_curve_segment()
-        if self.test_smooth:
-            self._check_incorrect_smooth_connection(node)
-        if self.test_spikes:
-            self._check_spike(node)
-        if self.test_empty_segments:
-            self._check_empty_lines_and_curves(node1, node4)
-        if self.test_zero_handles:
-            if node3 is not None:
-                self._check_zero_handles(node3, node4)
-            if not (node2 is None or node1 is None):
-                self._check_zero_handles(node2, node1)
-        if self.test_semi_hv:
-            if not (node2 is None or node1 is None):
-                # Start of curve
-                self._check_semi_horizontal(node1, node2, "handle")
-                self._check_semi_vertical(node1, node2, "handle")
-            if node3 is not None:
-                # End of curve
-                self._check_semi_horizontal(node3, node4, "handle")
-                self._check_semi_vertical(node3, node4, "handle")
-        if self.test_short_segments:
-            if not (node4 is None or node1 is None):
-                self._check_short_lines_and_curves(node1, node4)
-
-    def _run_offcurve_checks(self, node: "GSNode") -> None:
-        if self.test_fractional_coords:
-            self._check_fractional_coordinates(node)
-        if self.test_bbox_handles:
-            self._check_layer_bbox_handle(node)
-
-    def _run_qcurve_checks(self, node: "GSNode") -> None:
+            ok, err = cubic_inflections(
+                segments, self.inflection_min, 1 - self.inflection_min
+            )
+            for n, x, y, vx, vy in err:
+                self._inflections.setdefault(indices[n][3], []).append(
+                    (OutlineError, x, y, vx, vy)
+                )
+            if not self.ignore_warnings:
+                for n, x, y, vx, vy in ok:
+                    self._inflections.setdefault(indices[n][3], []).append(
+                        (OutlineWarning, x, y, vx, vy)
+                    )
+
+    def _calculate_edges(self, indices: Sequence[int]) -> None:
+        """
+        Calculate the vector, length, angle and back angle of the edges from the
+        previous node to some nodes of the snapshot.
+
+        Args:
+            indices (Sequence[int]): The indices of the end nodes of the edges
+        """
+        snapshot = self.snapshot
+        if self._edges_snapshot is not snapshot:
+            n = len(snapshot)
+            self._edge_dx = [0.0] * n
+            self._edge_dy = [0.0] * n
+            self._edge_length = [0.0] * n
+            self._edge_angle = [0.0] * n
+            self._edge_back_angle = [0.0] * n
+            self._edges_snapshot = snapshot
+        xs = snapshot.x
+        ys = snapshot.y
+        prev = snapshot.prev
+        edge_dx = self._edge_dx
+        edge_dy = self._edge_dy
+        edge_length = self._edge_length
+        edge_angle = self._edge_angle
+        edge_back_angle = self._edge_back_angle
+        for i in indices:
+            prev_index = prev[i]
+            if prev_index == -1:
+                continue
+
+            x = xs[i]
+            y = ys[i]
+            prev_x = xs[prev_index]
+            prev_y = ys[prev_index]
+            dx = x - prev_x
+            dy = y - prev_y
+            edge_dx[i] = dx
+            edge_dy[i] = dy
+            edge_length[i] = sqrt(dy**2 + dx**2)
+            edge_angle[i] = atan2(dy, dx)
+            # Not atan2(-dy, -dx), which differs for zero coordinate differences
+            edge_back_angle[i] = atan2(prev_y - y, prev_x - x)
+
+    def _flag(
+        self,
+        error_class: "type[OutlineError]",
+        x: float | None,
+        y: float | None,
+        kind: str,
+        badness: float | None = None,
+        vector: "PointTuple | None" = None,
+    ) -> None:
+        """
+        Add an error at a position given as coordinates.
+
+        Args:
+            error_class (type[OutlineError]): OutlineError or OutlineWarning
+            x (float | None): The x coordinate, or None for errors without position
+            y (float | None): The y coordinate
+            kind (str): The description
+            badness (float | None, optional): The "badness" level. Defaults to None.
+            vector (PointTuple | None, optional): The vector at the error position.
+                Defaults to None.
+        """
+        if self._early_exit:
+            raise _ErrorFound
+
+        self.errors.append(error_class(x, y, kind, badness, vector))
+
+    # Helpers to find the segment of a node
+
+    def _cubic_segment(self, i: int) -> tuple[int, int, int]:
+        """
+        Return the indices of the start node and the control points of the cubic
+        segment that ends at a node, or -1 where there is no node.
+        """
+        prev = self.snapshot.prev
+        i3 = prev[i]  # control point 2
+        i2 = -1 if i3 == -1 else prev[i3]  # control point 1
+        i1 = -1 if i2 == -1 else prev[i2]
+        return i1, i2, i3
+
+    def _quadratic_segment(self, i: int) -> tuple[int, list[int]]:
+        """
+        Return the index of the start node, or -1 if there is none, and the
+        indices of the control points of the quadratic segment that ends at a node.
+        """
+        snapshot = self.snapshot
+        prev = snapshot.prev
+        types = snapshot.types
+
         # Find the previous oncurve node
-        start_node = node.prevNode
-        start_node_index = node.index
+        start_index = prev[i]
         offcurves = []
-        while start_node.type == GSOFFCURVE:
-            offcurves.append(start_node)
-            start_node = start_node.prevNode
-            if start_node.index == start_node_index:
+        while start_index != -1 and types[start_index] == OFFCURVE:
+            offcurves.append(start_index)
+            start_index = prev[start_index]
+            if start_index == i:
                 # There seems to be no other oncurve node
                 break
         offcurves.reverse()
-        segment = [start_node] + offcurves + [node]
+        return start_index, offcurves
 
-        if self.test_extrema:
-            self._check_extrema_quad(segment)
+    # Node checks that find the nodes they need to look at
+
+    def _check_extrema_qcurve(self, i: int) -> None:
+        start_index, offcurves = self._quadratic_segment(i)
+        if start_index != -1:
+            self._check_extrema_quad([start_index] + offcurves + [i])
         # FIXME: Not implemented yet
         # if self.test_inflections:
-        #     self._check_inflections_quad(node)
-        if self.test_fractional_coords:
-            self._check_fractional_coordinates(node)
-        if not self.curve_type_detected:
-            self._count_qcurve_segment()
-        if self.test_smooth:
-            self._check_incorrect_smooth_connection(node)
-        pv = node.prevNode
-        nx = start_node.nextNode
-        if self.test_empty_segments:
-            self._check_empty_lines_and_curves(pv, node)
-        if self.test_semi_hv:
-            if nx is not None:
-                # Start of curve
-                self._check_semi_horizontal(start_node, nx, "handle")
-                self._check_semi_vertical(start_node, nx, "handle")
-
-            if pv is not None:
-                # End of curve
-                self._check_semi_horizontal(pv, node, "handle")
-                self._check_semi_vertical(pv, node, "handle")
-        if self.test_short_segments:
-            self._check_short_lines_and_curves(pv, node)
-        if self.test_spikes:
-            self._check_spike(node)
-
-    def _run_component_checks(self, component: "GSComponent") -> None:
-        if self.test_fractional_coords:
-            self._check_fractional_component_offset(component)
-        if self.test_fractional_transform:
-            self._check_fractional_transformation(component)
+        #     self._check_inflections_quad(segment)
+
+    def _check_empty_segment(self, i: int) -> None:
+        self._check_empty_lines_and_curves(self.snapshot.prev[i], i)
+
+    def _check_empty_curve(self, i: int) -> None:
+        i1, _, _ = self._cubic_segment(i)
+        self._check_empty_lines_and_curves(i1, i)
+
+    def _check_collinear_line(self, i: int) -> None:
+        snapshot = self.snapshot
+        next_index = snapshot.next[i]
+        if next_index != -1 and snapshot.types[next_index] == LINE:
+            self._check_collinear_vectors(i)
+
+    def _check_zero_handles_curve(self, i: int) -> None:
+        i1, i2, i3 = self._cubic_segment(i)
+        if i3 != -1:
+            self._check_zero_handles(i3, i)
+        if not (i2 == -1 or i1 == -1):
+            self._check_zero_handles(i2, i1)
+
+    def _check_semi_hv_line(self, i: int) -> None:
+        if self.snapshot.prev[i] != -1:
+            self._check_semi_horizontal(i)
+            self._check_semi_vertical(i)
+
+    def _check_semi_hv_curve(self, i: int) -> None:
+        i1, i2, i3 = self._cubic_segment(i)
+        if not (i2 == -1 or i1 == -1):
+            # Start of curve
+            self._check_semi_horizontal(i2, "handle")
+            self._check_semi_vertical(i2, "handle")
+        if i3 != -1:
+            # End of curve
+            self._check_semi_horizontal(i, "handle")
+            self._check_semi_vertical(i, "handle")
+
+    def _check_semi_hv_qcurve(self, i: int) -> None:
+        snapshot = self.snapshot
+        start_index, _ = self._quadratic_segment(i)
+        nx = -1 if start_index == -1 else snapshot.next[start_index]
+        pv = snapshot.prev[i]
+        if nx != -1:
+            # Start of curve
+            self._check_semi_horizontal(nx, "handle")
+            self._check_semi_vertical(nx, "handle")
+
+        if pv != -1:
+            # End of curve
+            self._check_semi_horizontal(i, "handle")
+            self._check_semi_vertical(i, "handle")
+
+    def _check_short_segment(self, i: int) -> None:
+        self._check_short_lines_and_curves(self.snapshot.prev[i], i)
+
+    def _check_short_curve(self, i: int) -> None:
+        i1, _, _ = self._cubic_segment(i)
+        self._check_short_lines_and_curves(i1, i)
 
     # Implementations for all the different checks
 
-    def _check_bbox_curve(
-        self, node0: "GSNode", node1: "GSNode", node2: "GSNode", node3: "GSNode"
-    ) -> None:
-        rect = normRect((node0.x, node0.y, node3.x, node3.y))
-        if not is_node_inside_rect(node1, rect) or not is_node_inside_rect(node2, rect):
-            extrema, vectors = get_extrema_for_cubic(
-                node0, node1, node2, node3, h=True, v=True
-            )
-            for i, pt in enumerate(extrema):
-                vector = vectors[i]
-                if abs(vector[1]) < 0.1:
-                    error_class = OutlineError
-                    desc = "Extremum relevant for hinting"
-                else:
-                    error_class = OutlineWarning
-                    desc = "Extremum"
-                if self.extremum_calculate_badness:
-                    badness = self._get_badness(pt, rect)
-                    if badness >= self.extremum_ignore_badness_below:
-                        self.errors.append(
-                            error_class(NSMakePoint(*pt), desc, badness, vector=vector)
-                        )
-                else:
-                    self.errors.append(
-                        error_class(NSMakePoint(*pt), desc, vector=vector)
-                    )
-
-    def _check_layer_bbox_handle(self, node: "GSNode") -> None:
-        if self.layer is None:
+    def _check_bbox_curve(self, i: int) -> None:
+        extrema = self._extrema.get(i)
+        if extrema is None:
             return
 
-        if node.x < self.bb_left:
-            self.errors.append(
-                OutlineError(node, "Handle outside bounding box", vector=(0, -1))
+        for x, y, vector_x, vector_y, badness in extrema:
+            vector = (vector_x, vector_y)
+            if abs(vector_y) < 0.1:
+                error_class = OutlineError
+                desc = "Extremum relevant for hinting"
+            else:
+                error_class = OutlineWarning
+                desc = "Extremum"
+            if self.extremum_calculate_badness:
+                if badness >= self.extremum_ignore_badness_below:
+                    self._flag(error_class, x, y, desc, badness, vector=vector)
+            else:
+                self._flag(error_class, x, y, desc, vector=vector)
+
+    def _check_layer_bbox_handles(self) -> None:
+        # The layer bounds are not known to the contour cache, so the handles are
+        # checked separately for the whole layer
+        types = self.snapshot.types
+        for i in range(len(types)):
+            if types[i] == OFFCURVE:
+                self._check_layer_bbox_handle(i)
+
+    def _check_layer_bbox_handle(self, i: int) -> None:
+        x = self.snapshot.x[i]
+        y = self.snapshot.y[i]
+
+        if x < self.bb_left:
+            self._flag(
+                OutlineError, x, y, "Handle outside bounding box", vector=(0, -1)
             )
             return
 
-        if node.y > self.bb_top:
-            self.errors.append(
-                OutlineError(node, "Handle outside bounding box", vector=(-1, 0))
+        if y > self.bb_top:
+            self._flag(
+                OutlineError, x, y, "Handle outside bounding box", vector=(-1, 0)
             )
             return
 
-        if node.y < self.bb_bottom:
-            self.errors.append(
-                OutlineError(node, "Handle outside bounding box", vector=(1, 0))
-            )
+        if y < self.bb_bottom:
+            self._flag(OutlineError, x, y, "Handle outside bounding box", vector=(1, 0))
             return
 
-    def _check_extrema_quad(self, segment: "Sequence[GSNode]") -> None:
-        quad = quad_with_explicit_oncurve_points(segment)
+    def _check_extrema_quad(self, segment: Sequence[int]) -> None:
+        xs = self.snapshot.x
+        ys = self.snapshot.y
+        quad = quad_with_explicit_oncurve_points([(xs[i], ys[i]) for i in segment])
         for i in range(0, len(quad) - 1, 2):
             extrema, vectors = get_extrema_for_quadratic(
                 quad[i], quad[i + 1], quad[i + 2], h=True, v=True
@@ -851,183 +1600,141 @@ class OutlineCheck:
                 # if self.extremum_calculate_badness:
                 # 	badness = self._get_badness(p, myRect)
                 # 	if badness >= self.extremum_ignore_badness_below:
-                # 		self.errors.append(OutlineError(NSMakePoint(*p), "Extremum", badness, vectors[i]))
+                # 		self._flag(OutlineError, *p, "Extremum", badness, vectors[i])
                 # else:
-                self.errors.append(
-                    OutlineError(NSMakePoint(*p), "Extremum", vector=vectors[i])
-                )
+                self._flag(OutlineError, *p, "Extremum", vector=vectors[i])
 
     def _get_badness(self, pointToCheck: "PointTuple", myRect: "RectTuple") -> float:
         # calculate distance of point to rect
-        badness = 0.0
-        x, y = pointToCheck
-        if x < myRect[0]:
-            # point is left from rect
-            if y < myRect[1]:
-                # point is lower left from rect
-                badness = int(round(sqrt((myRect[0] - x) ** 2 + (myRect[1] - y) ** 2)))
-            elif y > myRect[3]:
-                # point is upper left from rect
-                badness = int(round(sqrt((myRect[0] - x) ** 2 + (myRect[3] - y) ** 2)))
-            else:
-                badness = myRect[0] - x
-        elif x > myRect[2]:
-            # point is right from rect
-            if y < myRect[1]:
-                # point is lower right from rect
-                badness = int(round(sqrt((myRect[2] - x) ** 2 + (myRect[1] - y) ** 2)))
-            elif y > myRect[3]:
-                # point is upper right from rect
-                badness = int(round(sqrt((myRect[2] - x) ** 2 + (myRect[3] - y) ** 2)))
-            else:
-                badness = x - myRect[2]
-        else:
-            # point is centered from rect, check for upper/lower
-            if y < myRect[1]:
-                # point is lower center from rect
-                badness = myRect[1] - y
-            elif pointToCheck[1] > myRect[3]:
-                # point is upper center from rect
-                badness = y - myRect[3]
-            else:
-                badness = 0
-        return badness
+        return rect_distance(pointToCheck, myRect)
 
-    def _check_inflections_curve(
-        self,
-        node0: "GSNode | None",
-        node1: "GSNode | None",
-        node2: "GSNode | None",
-        node3: "GSNode",
-    ) -> None:
-        if node2 is None or node1 is None or node0 is None:
+    def _check_inflections_curve(self, i: int) -> None:
+        inflections = self._inflections.get(i)
+        if inflections is None:
             return
 
-        ok, err = get_inflections_for_cubic(
-            (node0.x, node0.y),
-            (node1.x, node1.y),
-            (node2.x, node2.y),
-            (node3.x, node3.y),
-            self.inflection_min,
-            1 - self.inflection_min,
-        )
-        ok_inflections, ok_vectors = ok
-        err_inflections, err_vectors = err
-        for i, p in enumerate(err_inflections):
-            self.errors.append(
-                OutlineError(NSMakePoint(*p), "Inflection", vector=err_vectors[i])
-            )
-
-        if self.ignore_warnings:
-            return
-
-        for i, p in enumerate(ok_inflections):
-            self.errors.append(
-                OutlineWarning(NSMakePoint(*p), "Inflection", vector=ok_vectors[i])
-            )
+        for error_class, x, y, vector_x, vector_y in inflections:
+            self._flag(error_class, x, y, "Inflection", vector=(vector_x, vector_y))
 
     def _check_inflections_quad(self, segment: "QuadraticCurveTuple") -> None:
         # FIXME: Not implemented
         inflections, vectors = get_inflections_for_quadratic(segment)
         for i, pt in enumerate(inflections):
             x, y = pt
-            self.errors.append(
-                OutlineError(NSMakePoint(x, y), "Inflection", vector=vectors[i])
-            )
-
-    def _count_curve_segment(self) -> None:
-        if self.apparently_quadratic:
-            self.errors.append(OutlineError(None, "Mixed cubic and quadratic segments"))
-            self.curve_type_detected = True
-        self.apparently_cubic = True
-
-    def _count_qcurve_segment(self) -> None:
-        if self.apparently_cubic:
-            self.errors.append(OutlineError(None, "Mixed cubic and quadratic segments"))
-            self.curve_type_detected = True
-        self.apparently_quadratic = True
-
-    def _check_fractional_coordinates(self, n: "GSNode") -> bool | None:
-        if self.fractional_ignore_point_zero:
-            n_prev = round_point(n, self.grid_length)
-            if abs(n_prev.x - n.x) < 0.001 and abs(n_prev.y - n.y) < 0.001:
-                return False
-        else:
-            if isinstance(n.x, int) and isinstance(n.y, int):
-                return False
-
-        self.errors.append(
-            OutlineError(
-                n,
-                "Fractional Coordinates",  # (%0.2f, %0.2f)" % (pt[0], pt[1]),
-                vector=None,
+            self._flag(OutlineError, x, y, "Inflection", vector=vectors[i])
+
+    def _check_curve_types(self) -> None:
+        types = self.snapshot.types
+        self.apparently_cubic = CURVE in types
+        self.apparently_quadratic = QCURVE in types
+        self.curve_type_detected = True
+        if self.apparently_cubic and self.apparently_quadratic:
+            self._flag(OutlineError, None, None, "Mixed cubic and quadratic segments")
+
+    def _check_fractional_coordinates(self, i: int) -> bool | None:
+        snapshot = self.snapshot
+        if self._fractional_snapshot is not snapshot:
+            self._fractional = set(
+                fractional_points(
+                    snapshot.x,
+                    snapshot.y,
+                    self.grid_length,
+                    self.fractional_ignore_point_zero,
+                )
             )
+            self._fractional_snapshot = snapshot
+        if i not in self._fractional:
+            return False
+
+        self._flag(
+            OutlineError,
+            snapshot.x[i],
+            snapshot.y[i],
+            "Fractional Coordinates",  # (%0.2f, %0.2f)" % (pt[0], pt[1]),
+            vector=None,
         )
         return None
 
-    def _get_component_error_position(self, component: "GSComponent") -> "NSPoint":
-        if component.component is None or self.layer is None:
-            return NSMakePoint(0, 0)
-
-        bbox = component.component.layers[self.layer.layerId].bounds
-        tbox = transform_rect(bbox, component.transform)
-        return nodes_half_point(*tbox)
+    def _get_component_error_position(
+        self, component: "ComponentSnapshot"
+    ) -> "PointTuple":
+        if component.bounds is None:
+            return 0, 0
+
+        key = (component.bounds, component.transform)
+        position = self._component_positions.get(key)
+        if position is None:
+            if len(self._component_positions) > 10000:
+                self._component_positions.clear()
+            xMin, yMin, xMax, yMax = transform_bounds(*key)
+            position = self._component_positions[key] = (
+                (xMin + xMax) / 2,
+                (yMin + yMax) / 2,
+            )
+        return position
 
-    def _check_fractional_component_offset(self, component: "GSComponent"):
+    def _check_fractional_component_offset(self, component: "ComponentSnapshot"):
         for value in component.transform[-2:]:
             if abs(round_value(value, self.grid_length) - value) > 0.001:
-                self.errors.append(
-                    OutlineError(
-                        self._get_component_error_position(component),
-                        f"Fractional component offset on ‘{component.componentName}’",
-                        vector=None,
-                    )
+                self._flag(
+                    OutlineError,
+                    *self._get_component_error_position(component),
+                    f"Fractional component offset on ‘{component.name}’",
+                    vector=None,
                 )
                 break
 
-    def _check_fractional_transformation(self, component: "GSComponent") -> None:
+    def _check_fractional_transformation(self, component: "ComponentSnapshot") -> None:
         for value in component.transform[:-2]:
             if abs(round(value) - value) > 0.001:
-                self.errors.append(
-                    OutlineWarning(
-                        self._get_component_error_position(component),
-                        (
-                            "Fractional component transformation "
-                            "on ‘%s’" % component.componentName
-                        ),
-                        vector=None,
-                    )
+                self._flag(
+                    OutlineWarning,
+                    *self._get_component_error_position(component),
+                    "Fractional component transformation on ‘%s’" % component.name,
+                    vector=None,
                 )
                 break
 
-    def _check_incorrect_smooth_connection(self, node: "GSNode") -> None:
+    def _check_incorrect_smooth_connection(self, i: int) -> None:
         """
         Check for nearly smooth connections.
         """
-        prev_node = node.prevNode
-        next_node = node.nextNode
+        snapshot = self.snapshot
+        prev_index = snapshot.prev[i]
+        next_index = snapshot.next[i]
 
-        if prev_node is None or next_node is None:
+        if prev_index == -1 or next_index == -1:
             return
 
+        xs = snapshot.x
+        ys = snapshot.y
+        x = xs[i]
+        y = ys[i]
+        prev_x = xs[prev_index]
+        prev_y = ys[prev_index]
+        next_x = xs[next_index]
+        next_y = ys[next_index]
+
         # angle of previous reference node to current node
-        phi1 = nodes_angle(prev_node, node)
-        phi2 = nodes_angle(node, next_node)
+        phi1 = self._edge_angle[i]
+        phi2 = self._edge_angle[next_index]
 
         # distance of the current node to next reference node
-        dist1 = nodes_distance(prev_node, node)
-        dist2 = nodes_distance(node, next_node)
+        dist1 = self._edge_length[i]
+        dist2 = self._edge_length[next_index]
 
         if dist1 >= dist2:
             # distance 1 is longer, check dist2 for correct angle
             dist = dist2
             phi = phi1
-            ref = next_node
+            ref_x = next_x
+            ref_y = next_y
         else:
             # distance 2 is longer, check dist1 for correct angle
             dist = dist1
             phi = phi2 - pi
-            ref = prev_node
+            ref_x = prev_x
+            ref_y = prev_y
 
         # Ignore short segments
         if dist > 2 * self.smooth_connection_max_distance:
@@ -1041,154 +1748,181 @@ class OutlineCheck:
             # E.g. line to curve: line is fixed, curve / tangent point is
             # flexible?
             # or always consider the longer segment more important?
-            projected_pt = NSMakePoint(
-                node.x + dist * cos(phi),
-                node.y + dist * sin(phi),
-            )
+            projected_x = round_value(x + dist * cos(phi), self.grid_length)
+            projected_y = round_value(y + dist * sin(phi), self.grid_length)
             # Compare projected position with actual position
-            badness = nodes_distance(round_point(projected_pt, self.grid_length), ref)
+            badness = sqrt((ref_y - projected_y) ** 2 + (ref_x - projected_x) ** 2)
             if self.grid_length == 0:
                 d = 0.49
             else:
                 d = self.grid_length * 0.49
             if d < badness:
-                if node.smooth or badness < self.smooth_connection_max_distance:
-                    self.errors.append(
-                        OutlineError(
-                            node,
-                            "Not quite smooth connection",
-                            badness,
-                            vector=nodes_normal_vector(prev_node, node),
-                        )
+                if snapshot.smooth[i] or badness < self.smooth_connection_max_distance:
+                    self._flag(
+                        OutlineError,
+                        x,
+                        y,
+                        "Not quite smooth connection",
+                        badness,
+                        vector=(self._edge_dx[i], self._edge_dy[i]),
                     )
 
-    def _check_empty_lines_and_curves(self, node0: "GSNode", node1: "GSNode") -> None:
-        if node0 is None or node1 is None:
+    def _check_empty_lines_and_curves(self, i0: int, i1: int) -> None:
+        if i0 == -1 or i1 == -1:
             return
 
-        if node0.x == node1.x and node0.y == node1.y:
-            self.errors.append(
-                OutlineError(
-                    node1,
-                    "Zero-length distance",
-                    vector=nodes_normal_vector(node0, node1),
-                )
+        xs = self.snapshot.x
+        ys = self.snapshot.y
+        x0 = xs[i0]
+        y0 = ys[i0]
+        x1 = xs[i1]
+        y1 = ys[i1]
+        if x0 == x1 and y0 == y1:
+            self._flag(
+                OutlineError,
+                x1,
+                y1,
+                "Zero-length distance",
+                vector=(x1 - x0, y1 - y0),
             )
 
-    def _check_short_lines_and_curves(self, node0: "GSNode", node1: "GSNode") -> None:
-        if node0 is None or node1 is None:
+    def _check_short_lines_and_curves(self, i0: int, i1: int) -> None:
+        if i0 == -1 or i1 == -1:
             return
 
-        if abs(node0.x - node1.x) <= 1 and abs(node0.y - node1.y) <= 1:
-            self.errors.append(
-                OutlineWarning(
-                    node0,
-                    "Short segment",
-                    vector=nodes_normal_vector(node0, node1),
-                )
+        xs = self.snapshot.x
+        ys = self.snapshot.y
+        x0 = xs[i0]
+        y0 = ys[i0]
+        x1 = xs[i1]
+        y1 = ys[i1]
+        if abs(x0 - x1) <= 1 and abs(y0 - y1) <= 1:
+            self._flag(
+                OutlineWarning,
+                x0,
+                y0,
+                "Short segment",
+                vector=(x1 - x0, y1 - y0),
             )
 
-    def _check_collinear_vectors(self, node: "GSNode") -> None:
+    def _check_collinear_vectors(self, i: int) -> None:
         """
         Check for consecutive lines that have nearly the same angle.
         """
-        prev_node = node.prevNode
-        next_node = node.nextNode
+        snapshot = self.snapshot
+        prev_index = snapshot.prev[i]
+        next_index = snapshot.next[i]
 
-        if prev_node is None or next_node is None:
+        if prev_index == -1 or next_index == -1:
             return
 
+        xs = snapshot.x
+        ys = snapshot.y
+        x = xs[i]
+        y = ys[i]
+        prev_x = xs[prev_index]
+        prev_y = ys[prev_index]
+        next_x = xs[next_index]
+        next_y = ys[next_index]
+
         # angle of previous reference point to current point
-        phi1 = nodes_angle(prev_node, node)
+        phi1 = self._edge_angle[i]
         # angle of current point to next reference point
         # could be used for angle check without distance check
-        # phi2 = nodes_angle(pt, next_ref)
+        # phi2 = self._edge_angle[next_index]
         # distance of pt to next reference point
-        dist = nodes_distance(node, next_node)
-        projected_pt = NSMakePoint(
-            node.x + dist * cos(phi1),
-            node.y + dist * sin(phi1),
-        )
-        badness = nodes_distance(round_point(projected_pt, self.grid_length), next_node)
+        dist = self._edge_length[next_index]
+        projected_x = round_value(x + dist * cos(phi1), self.grid_length)
+        projected_y = round_value(y + dist * sin(phi1), self.grid_length)
+        badness = sqrt((next_y - projected_y) ** 2 + (next_x - projected_x) ** 2)
         if badness < self.collinear_vectors_max_distance:
-            self.errors.append(
-                OutlineError(
-                    node,
-                    "Collinear vectors",
-                    badness,
-                    nodes_normal_vector(prev_node, next_node),
-                )
+            self._flag(
+                OutlineError,
+                x,
+                y,
+                "Collinear vectors",
+                badness,
+                (next_x - prev_x, next_y - prev_y),
             )
 
-    def _check_spike(self, node: "GSNode") -> None:
+    def _check_spike(self, i: int) -> None:
         """
         Check for consecutive segments that have a very narrow angle.
         """
-        prev_node = node.prevNode
-        next_node = node.nextNode
+        snapshot = self.snapshot
+        prev_index = snapshot.prev[i]
+        next_index = snapshot.next[i]
 
-        if prev_node is None or next_node is None:
+        if prev_index == -1 or next_index == -1:
             return
 
-        phi1 = nodes_angle(prev_node, node)
-        phi2 = nodes_angle(next_node, node)
+        phi1 = self._edge_angle[i]
+        phi2 = self._edge_back_angle[next_index]
         if abs(phi2 - phi1) < self.spike_angle:
-            self.errors.append(
-                OutlineWarning(
-                    node, "Spike", vector=nodes_normal_vector(prev_node, next_node)
-                )
+            xs = snapshot.x
+            ys = snapshot.y
+            self._flag(
+                OutlineWarning,
+                xs[i],
+                ys[i],
+                "Spike",
+                vector=(
+                    xs[next_index] - xs[prev_index],
+                    ys[next_index] - ys[prev_index],
+                ),
             )
 
-    def _check_semi_horizontal(
-        self, node0: "GSNode", node1: "GSNode", segment: str = "line"
-    ) -> None:
+    def _check_semi_horizontal(self, i: int, segment: str = "line") -> None:
         """
-        Check for semi-horizontal lines and handles.
+        Check for semi-horizontal lines and handles, from the previous node to a
+        node.
         """
-        if nodes_distance(node0, node1) > self.semi_hv_vectors_min_distance:
-            phi = nodes_angle(node0, node1)
-            rho = atan2(1, 31)
+        if self._edge_length[i] > self.semi_hv_vectors_min_distance:
+            phi = self._edge_angle[i]
+            rho = semi_horizontal_angle
             if (
                 0 < abs(phi) < rho
                 or 0 < abs(phi - pi) < rho
                 or 0 < abs(abs(phi) - pi) < rho
             ):
-                if abs(node1.y - node0.y) <= self.semi_hv_vectors_max_distance:
-                    self.errors.append(
-                        OutlineError(
-                            nodes_half_point(node0, node1),
-                            "Semi-horizontal %s" % segment,
-                            degrees(phi),
-                            nodes_normal_vector(node0, node1),
-                        )
-                    )
+                dy = self._edge_dy[i]
+                if abs(dy) <= self.semi_hv_vectors_max_distance:
+                    self._flag_semi_hv(i, "Semi-horizontal %s" % segment, phi)
 
-    def _check_semi_vertical(
-        self, node0: "GSNode", node1: "GSNode", segment: str = "line"
-    ) -> None:
+    def _check_semi_vertical(self, i: int, segment: str = "line") -> None:
         """
-        Check for semi-vertical lines and handles.
+        Check for semi-vertical lines and handles, from the previous node to a
+        node.
         """
         # TODO: Option to respect Italic angle?
-        if nodes_distance(node0, node1) > self.semi_hv_vectors_min_distance:
-            phi = nodes_angle(node0, node1)
-            rho = atan2(31, 1)
+        if self._edge_length[i] > self.semi_hv_vectors_min_distance:
+            phi = self._edge_angle[i]
+            rho = semi_vertical_angle
             if 0 < abs(phi - 0.5 * pi) < rho or 0 < abs(phi + 0.5 * pi) < rho:
-                if abs(node1.x - node0.x) <= self.semi_hv_vectors_max_distance:
-                    self.errors.append(
-                        OutlineError(
-                            nodes_half_point(node0, node1),
-                            "Semi-vertical %s" % segment,
-                            degrees(phi),
-                            nodes_normal_vector(node0, node1),
-                        )
-                    )
+                dx = self._edge_dx[i]
+                if abs(dx) <= self.semi_hv_vectors_max_distance:
+                    self._flag_semi_hv(i, "Semi-vertical %s" % segment, phi)
+
+    def _flag_semi_hv(self, i: int, kind: str, phi: float) -> None:
+        xs = self.snapshot.x
+        ys = self.snapshot.y
+        i0 = self.snapshot.prev[i]
+        self._flag(
+            OutlineError,
+            (xs[i0] + xs[i]) / 2,
+            (ys[i0] + ys[i]) / 2,
+            kind,
+            degrees(phi),
+            (self._edge_dx[i], self._edge_dy[i]),
+        )
 
-    def _check_zero_handles(self, node0, node1) -> None:
-        badness = nodes_distance(node0, node1)
+    def _check_zero_handles(self, i0: int, i1: int) -> None:
+        xs = self.snapshot.x
+        ys = self.snapshot.y
+        x0 = xs[i0]
+        y0 = ys[i0]
+        x1 = xs[i1]
+        y1 = ys[i1]
+        badness = sqrt((y1 - y0) ** 2 + (x1 - x0) ** 2)
         if badness <= self.zero_handles_max_distance:
-            self.errors.append(
-                OutlineError(
-                    node1, "Zero handle", badness, nodes_normal_vector(node0, node1)
-                )
-            )
+            self._flag(OutlineError, x1, y1, "Zero handle", badness, (x1 - x0, y1 - y0))
@@ -0,0 +1,69 @@
+from math import floor
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from redArrow.typing import PointTuple
+
+
+class PointGrid:
+    """
+    A uniform grid over points in glyph units, to find the points that are near a
+    position without measuring the distance to every point.
+    """
+
+    def __init__(self, points: "Iterable[PointTuple]", cell_size: float = 100) -> None:
+        """
+        Args:
+            points (Iterable[PointTuple]): The points. Duplicates are stored once.
+            cell_size (float, optional): The width and height of a grid cell in
+                glyph units. Defaults to 100.
+        """
+        self.cell_size = cell_size
+        self._cells: "dict[tuple[int, int], list[PointTuple]]" = {}
+        self._count = 0
+        for pt in set(points):
+            cell = (floor(pt[0] / cell_size), floor(pt[1] / cell_size))
+            self._cells.setdefault(cell, []).append(pt)
+            self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def query(self, x: float, y: float, radius: float) -> "list[PointTuple]":
+        """
+        Return the points that are closer to a position than a radius.
+
+        Args:
+            x (float): The x coordinate of the position
+            y (float): The y coordinate of the position
+            radius (float): The radius
+
+        Returns:
+            list[PointTuple]: The points
+        """
+        if not self._count or radius <= 0:
+            return []
+
+        s = self.cell_size
+        x_min = floor((x - radius) / s)
+        x_max = floor((x + radius) / s)
+        y_min = floor((y - radius) / s)
+        y_max = floor((y + radius) / s)
+        if (x_max - x_min + 1) * (y_max - y_min + 1) > len(self._cells):
+            # The range covers more cells than there are occupied cells
+            cells = list(self._cells.values())
+        else:
+            cells = [
+                self._cells[(cx, cy)]
+                for cx in range(x_min, x_max + 1)
+                for cy in range(y_min, y_max + 1)
+                if (cx, cy) in self._cells
+            ]
+
+        r2 = radius * radius
+        return [
+            pt
+            for cell in cells
+            for pt in cell
+            if (pt[0] - x) ** 2 + (pt[1] - y) ** 2 < r2
+        ]
@@ -0,0 +1,141 @@
+import csv
+import json
+from math import isfinite
+from typing import IO, TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from redArrow.outlineTestGlyphs import OutlineError, OutlineWarning
+
+
+# The fields of each error record, in the order of the CSV columns
+report_fields = (
+    "glyph",
+    "layer",
+    "kind",
+    "level",
+    "x",
+    "y",
+    "badness",
+    "vector_x",
+    "vector_y",
+)
+report_formats = ("jsonl", "csv")
+
+# The write buffer size of report files
+_buffer_size = 1 << 16
+
+
+def _number(value: Any) -> float | None:
+    # JSON has no NaN or infinity, so non-finite values are written as null
+    if value is None:
+        return None
+
+    value = float(value)
+    return value if isfinite(value) else None
+
+
+def report_format(path: str) -> str:
+    """
+    Return the report format for a file name: "csv" for files ending in ".csv",
+    "jsonl" otherwise.
+
+    Args:
+        path (str): The path of the report file
+
+    Returns:
+        str: The format
+    """
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+class ReportWriter:
+    """
+    Writes one record per outline error to a JSON Lines or CSV file.
+
+    The records are written as they are added, through a buffered file, so the
+    errors of a font don't need to be kept in memory. Use it as a context manager
+    to close the file:
+
+        with ReportWriter("errors.jsonl") as report:
+            for error in outline_check.iter_errors(snapshot):
+                report.add(glyph_name, layer_name, error)
+    """
+
+    def __init__(self, path: str, format: str | None = None) -> None:
+        """
+        Args:
+            path (str): The path of the report file. An existing file is replaced.
+            format (str | None, optional): "jsonl" or "csv". Defaults to None, which
+                means the format is chosen by the file name extension.
+
+        Raises:
+            ValueError: If the format is unknown.
+        """
+        if format is None:
+            format = report_format(path)
+        if format not in report_formats:
+            raise ValueError(
+                "Unknown report format '%s', use one of: %s"
+                % (format, ", ".join(report_formats))
+            )
+
+        self.path = path
+        self.format = format
+        self.count = 0
+        self._file: IO[str] = open(
+            path, "w", encoding="utf-8", newline="", buffering=_buffer_size
+        )
+        if format == "csv":
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(report_fields)
+        else:
+            self._encode = json.JSONEncoder(
+                ensure_ascii=False, allow_nan=False, separators=(",", ":")
+            ).encode
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def add(
+        self,
+        glyph_name: str,
+        layer_name: str,
+        error: "OutlineError | OutlineWarning",
+    ) -> None:
+        """
+        Write the record of an error. Coordinates and values that are not finite
+        numbers are written as null, or as empty fields in CSV files.
+
+        Args:
+            glyph_name (str): The name of the glyph
+            layer_name (str): The name of the layer or master
+            error (OutlineError | OutlineWarning): The error
+        """
+        vector = error.vector
+        record = (
+            glyph_name,
+            layer_name,
+            error.kind,
+            "warning" if error.level == "w" else "error",
+            _number(error.x),
+            _number(error.y),
+            _number(error.badness),
+            None if vector is None else _number(vector[0]),
+            None if vector is None else _number(vector[1]),
+        )
+        if self.format == "csv":
+            self._csv.writerow(record)
+        else:
+            self._file.write(self._encode(dict(zip(report_fields, record))))
+            self._file.write("\n")
+        self.count += 1
+
+    def close(self) -> None:
+        """
+        Flush and close the report file.
+        """
+        if not self._file.closed:
+            self._file.close()
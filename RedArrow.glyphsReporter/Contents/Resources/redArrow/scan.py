@@ -0,0 +1,284 @@
+import multiprocessing
+import multiprocessing.spawn
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Sequence
+
+from redArrow.cache import ContourCache
+from redArrow.diskCache import layer_key, options_digest
+from redArrow.outlineTestGlyphs import OutlineCheck
+
+if TYPE_CHECKING:
+    from redArrow.diskCache import ResultIndex
+    from redArrow.report import ReportWriter
+    from redArrow.snapshot import LayerSnapshot
+    from redArrow.typing import RedArrowOptionsDict
+
+
+# The result of checking one glyph: glyph name, number of errors (only 0 or 1 in
+# the early-exit mode), and the description of an exception that happened during
+# the check, if any
+GlyphVerdictTuple = tuple[str, int, str | None]
+
+
+# The contour cache of a worker process, kept between batches
+_worker_cache: ContourCache | None = None
+
+
+def find_python_executable() -> str | None:
+    """
+    Return the path of a Python interpreter that can run the worker processes.
+
+    Inside Glyphs, `sys.executable` is the app itself, so the interpreter of the
+    Python installation that Glyphs uses is looked up instead.
+
+    Returns:
+        str | None: The path of the interpreter, or None if none was found.
+    """
+    version = "%i.%i" % sys.version_info[:2]
+    candidates = [
+        os.path.join(sys.exec_prefix, "bin", f"python{version}"),
+        os.path.join(sys.exec_prefix, "bin", "python3"),
+        sys.executable,
+    ]
+    for path in candidates:
+        if not path or not os.access(path, os.X_OK):
+            continue
+
+        if os.path.basename(path).startswith("python"):
+            return path
+
+    return None
+
+
+def check_snapshots(
+    snapshots: "Sequence[tuple[str, LayerSnapshot]]",
+    options: "RedArrowOptionsDict",
+    run_checks: Sequence[str],
+    cache: ContourCache | None = None,
+    early_exit: bool = False,
+) -> list[GlyphVerdictTuple]:
+    """
+    Check layer snapshots one after the other.
+
+    Args:
+        snapshots (Sequence[tuple[str, LayerSnapshot]]): The glyph names and the
+            snapshots of their layers
+        options (RedArrowOptionsDict): The options for each check
+        run_checks (Sequence[str]): The names of the checks to be run
+        cache (ContourCache | None, optional): The contour cache. Defaults to None.
+        early_exit (bool, optional): Whether to stop checking a glyph at its first
+            error. The number of errors is then 1 for glyphs with errors. Defaults
+            to False.
+
+    Returns:
+        list[GlyphVerdictTuple]: The results for each glyph
+    """
+    outline_check = OutlineCheck(None, options, run_checks, cache)
+    verdicts = []
+    for glyph_name, snapshot in snapshots:
+        try:
+            if early_exit:
+                count = int(outline_check.has_errors(snapshot))
+            else:
+                outline_check.check_snapshot(snapshot)
+                count = len(outline_check.errors)
+            verdicts.append((glyph_name, count, None))
+        except Exception as e:
+            verdicts.append((glyph_name, 0, str(e)))
+    return verdicts
+
+
+def report_snapshots(
+    snapshots: "Sequence[tuple[str, LayerSnapshot]]",
+    layer_names: Sequence[str],
+    report: "ReportWriter",
+    options: "RedArrowOptionsDict",
+    run_checks: Sequence[str],
+    cache: ContourCache | None = None,
+) -> list[GlyphVerdictTuple]:
+    """
+    Check layer snapshots one after the other, and write their errors to a report
+    while they are checked.
+
+    Args:
+        snapshots (Sequence[tuple[str, LayerSnapshot]]): The glyph names and the
+            snapshots of their layers
+        layer_names (Sequence[str]): The layer name of each snapshot
+        report (ReportWriter): The report
+        options (RedArrowOptionsDict): The options for each check
+        run_checks (Sequence[str]): The names of the checks to be run
+        cache (ContourCache | None, optional): The contour cache. Defaults to None.
+
+    Returns:
+        list[GlyphVerdictTuple]: The results for each glyph
+    """
+    outline_check = OutlineCheck(None, options, run_checks, cache)
+    verdicts = []
+    for (glyph_name, snapshot), layer_name in zip(snapshots, layer_names):
+        count = 0
+        try:
+            for error in outline_check.iter_errors(snapshot):
+                report.add(glyph_name, layer_name, error)
+                count += 1
+        except OSError:
+            raise
+        except Exception as e:
+            verdicts.append((glyph_name, count, str(e)))
+        else:
+            verdicts.append((glyph_name, count, None))
+    return verdicts
+
+
+def _check_batch(
+    snapshots: "Sequence[tuple[str, LayerSnapshot]]",
+    options: "RedArrowOptionsDict",
+    run_checks: Sequence[str],
+    early_exit: bool,
+) -> list[GlyphVerdictTuple]:
+    # Runs in a worker process
+    global _worker_cache
+    if _worker_cache is None:
+        _worker_cache = ContourCache()
+    return check_snapshots(snapshots, options, run_checks, _worker_cache, early_exit)
+
+
+def scan_snapshots(
+    snapshots: "Sequence[tuple[str, LayerSnapshot]]",
+    options: "RedArrowOptionsDict",
+    run_checks: Sequence[str],
+    cache: ContourCache | None = None,
+    parallel: bool = False,
+    result_index: "ResultIndex | None" = None,
+    master_id: str = "",
+    early_exit: bool = False,
+    layer_ids: Sequence[str] | None = None,
+) -> list[GlyphVerdictTuple]:
+    """
+    Check layer snapshots, optionally in a pool of worker processes.
+
+    If a result index is given, the results of layers that were checked before
+    with the same geometry and options are taken from the index, and the new
+    results are added to it.
+
+    The parallel scan falls back to checking the snapshots in the current process
+    if there is only one core, no Python interpreter for the workers is found, or
+    the process pool can't be used.
+
+    Args:
+        snapshots (Sequence[tuple[str, LayerSnapshot]]): The glyph names and the
+            snapshots of their layers
+        options (RedArrowOptionsDict): The options for each check
+        run_checks (Sequence[str]): The names of the checks to be run
+        cache (ContourCache | None, optional): The contour cache for checks in the
+            current process. Defaults to None.
+        parallel (bool, optional): Whether to use a process pool. Defaults to False.
+        result_index (ResultIndex | None, optional): The opened persistent result
+            index. Defaults to None.
+        master_id (str, optional): The id of the master of the layers, used for the
+            result index. Defaults to "".
+        early_exit (bool, optional): Whether to only find out if each glyph has any
+            error, stopping at the first one. The number of errors is then 1 for
+            glyphs with errors. Defaults to False.
+        layer_ids (Sequence[str] | None, optional): The layer id of each snapshot,
+            used for the result index instead of the master id when the snapshots
+            are from different masters or special layers. Defaults to None.
+
+    Returns:
+        list[GlyphVerdictTuple]: The results for each glyph, in the order of the
+            snapshots
+    """
+    if result_index is None:
+        return _scan(snapshots, options, run_checks, cache, parallel, early_exit)
+
+    digest = options_digest(options, run_checks, early_exit)
+    if layer_ids is None:
+        layer_ids = [master_id] * len(snapshots)
+    keys = [
+        layer_key(snapshot, layer_id, digest)
+        for (_, snapshot), layer_id in zip(snapshots, layer_ids)
+    ]
+    known = [result_index.get(key) for key in keys]
+    missing = [i for i, errors in enumerate(known) if errors is None]
+    new_verdicts = iter(
+        _scan(
+            [snapshots[i] for i in missing],
+            options,
+            run_checks,
+            cache,
+            parallel,
+            early_exit,
+        )
+    )
+    verdicts = []
+    for i, errors in enumerate(known):
+        if errors is None:
+            verdict = next(new_verdicts)
+            if verdict[2] is None:
+                result_index.put(keys[i], verdict[1])
+        else:
+            verdict = (snapshots[i][0], errors, None)
+        verdicts.append(verdict)
+    return verdicts
+
+
+def _scan(
+    snapshots: "Sequence[tuple[str, LayerSnapshot]]",
+    options: "RedArrowOptionsDict",
+    run_checks: Sequence[str],
+    cache: ContourCache | None,
+    parallel: bool,
+    early_exit: bool,
+) -> list[GlyphVerdictTuple]:
+    workers = os.cpu_count() or 1
+    if parallel and workers > 1 and len(snapshots) > 1:
+        try:
+            return _scan_parallel(snapshots, options, run_checks, workers, early_exit)
+        except Exception as e:
+            print("Parallel scan failed, checking serially: %s" % e)
+
+    return check_snapshots(snapshots, options, run_checks, cache, early_exit)
+
+
+def _scan_parallel(
+    snapshots: "Sequence[tuple[str, LayerSnapshot]]",
+    options: "RedArrowOptionsDict",
+    run_checks: Sequence[str],
+    workers: int,
+    early_exit: bool,
+) -> list[GlyphVerdictTuple]:
+    executable = find_python_executable()
+    if executable is None:
+        raise RuntimeError("No Python interpreter found for the worker processes")
+
+    # Forking is not safe in a GUI app, so the workers are spawned
+    context = multiprocessing.get_context("spawn")
+
+    # Several batches per worker even out the different glyph complexities
+    batch_size = max(1, -(-len(snapshots) // (workers * 4)))
+    batches = []
+    for start in range(0, len(snapshots), batch_size):
+        end = start + batch_size
+        batches.append(snapshots[start:end])
+    options = dict(options)
+    run_checks = list(run_checks)
+    verdicts: list[GlyphVerdictTuple] = []
+    # The interpreter for spawned processes is a global setting of
+    # multiprocessing, so it is only changed while the workers are started, and
+    # restored for other users of multiprocessing, e.g. other plugins
+    previous_executable = multiprocessing.spawn.get_executable()
+    multiprocessing.spawn.set_executable(executable)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(batches)), mp_context=context
+        ) as executor:
+            futures = [
+                executor.submit(_check_batch, batch, options, run_checks, early_exit)
+                for batch in batches
+            ]
+            for future in futures:
+                verdicts.extend(future.result())
+    finally:
+        multiprocessing.spawn.set_executable(previous_executable)
+    return verdicts
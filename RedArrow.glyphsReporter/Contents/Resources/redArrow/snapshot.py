@@ -0,0 +1,532 @@
+from array import array
+from typing import TYPE_CHECKING, Any, Hashable, Iterable
+
+from redArrow.misc.arrayTools import calcBounds, unionRect
+from redArrow.misc.bezierTools import calcCubicBounds, calcQuadraticBounds
+
+if TYPE_CHECKING:
+    from GlyphsApp import GSComponent, GSGlyph, GSLayer
+
+    from redArrow.typing import RectTuple, TransformTuple
+
+
+# Node types as stored in a snapshot
+LINE = 0
+CURVE = 1
+QCURVE = 2
+OFFCURVE = 3
+
+# Map the node type strings of GSNode.type (GSLINE, GSCURVE, GSQCURVE, GSOFFCURVE)
+# to the snapshot node types
+node_types: dict[str, int] = {
+    "line": LINE,
+    "curve": CURVE,
+    "qcurve": QCURVE,
+    "offcurve": OFFCURVE,
+}
+
+
+class ComponentSnapshot:
+    __slots__ = ("name", "transform", "bounds")
+
+    def __init__(
+        self,
+        name: str,
+        transform: "TransformTuple",
+        bounds: "RectTuple | None" = None,
+    ) -> None:
+        """
+        The data of a component that is needed by the outline checks.
+
+        Args:
+            name (str): The name of the base glyph
+            transform (TransformTuple): The transformation matrix of the component
+            bounds (RectTuple | None, optional): The bounds of the base glyph's layer
+                before transformation. Defaults to None, which means the base glyph
+                is missing.
+        """
+        self.name = name
+        self.transform = transform
+        self.bounds = bounds
+
+    def __repr__(self) -> str:
+        return f"<ComponentSnapshot '{self.name}' {self.transform}>"
+
+
+class BaseBoundsCache:
+    """
+    The bounds of the layers of base glyphs. Composites that use the same base
+    glyph don't have to read its bounds from Glyphs again.
+
+    An entry is read again when the base glyph was changed since. Base layers with
+    components are not kept, because their bounds also change when their own base
+    glyphs are changed.
+    """
+
+    def __init__(self) -> None:
+        # The bounds and the time of the last change of the base glyph, by glyph
+        # name and layer id
+        self._entries: "dict[tuple[str, str], tuple[RectTuple | None, float]]" = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"<BaseBoundsCache {len(self._entries)} entries, "
+            f"{self.hits} hits, {self.misses} misses>"
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, base_glyph: "GSGlyph", layer_id: str, master_id: str | None = None
+    ) -> "RectTuple | None":
+        """
+        Return the bounds of a layer of a base glyph.
+
+        Args:
+            base_glyph (GSGlyph): The base glyph
+            layer_id (str): The id of the layer
+            master_id (str | None, optional): The id of the master whose layer is
+                used if the base glyph has no layer with the layer id. Defaults to
+                None.
+
+        Returns:
+            RectTuple | None: The bounds, or None if the base glyph has no such layer
+        """
+        key = (base_glyph.name, layer_id)
+        changed = base_glyph.lastOperationInterval()
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] == changed:
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        base_layer = base_glyph_layer(base_glyph, layer_id, master_id)
+        if base_layer is None:
+            bounds = None
+        else:
+            bounds = layer_bounds(base_layer)
+            if base_layer.components:
+                self._entries.pop(key, None)
+                return bounds
+
+        self._entries[key] = (bounds, changed)
+        return bounds
+
+
+class LayerSnapshot:
+    """
+    The geometry of a layer, copied once from the GSLayer into flat parallel arrays.
+
+    All nodes of all contours are stored one after the other. The nodes of contour
+    ``c`` are found at the indices ``starts[c]`` to ``starts[c + 1] - 1``. The
+    arrays ``prev`` and ``next`` hold the index of the previous and next node of
+    each node in its contour, or -1 if there is none (at the ends of open contours).
+
+    Snapshots with the same contours and node types, like the masters of a glyph,
+    can share these arrays and the results that only depend on them, see
+    `share_topology`.
+    """
+
+    __slots__ = (
+        "x",
+        "y",
+        "types",
+        "smooth",
+        "starts",
+        "closed",
+        "prev",
+        "next",
+        "components",
+        "bounds",
+        "upm",
+        "topology",
+    )
+
+    def __init__(self, upm: int = 1000) -> None:
+        self.x = array("d")
+        self.y = array("d")
+        self.types = array("b")
+        self.smooth = array("b")
+        self.starts = array("l", [0])
+        self.closed = array("b")
+        self.prev = array("l")
+        self.next = array("l")
+        self.components: list[ComponentSnapshot] = []
+        self.bounds: "RectTuple" = (0, 0, 0, 0)
+        self.upm = upm
+        # Results that only depend on the contours and node types, shared by
+        # snapshots with the same topology
+        self.topology: dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __repr__(self) -> str:
+        return (
+            f"<LayerSnapshot {len(self.closed)} contours, {len(self.types)} nodes, "
+            f"{len(self.components)} components>"
+        )
+
+    @property
+    def contour_count(self) -> int:
+        return len(self.closed)
+
+    def add_contour(
+        self, nodes: "Iterable[tuple[float, float, int, bool]]", closed: bool = True
+    ) -> None:
+        """
+        Append a contour to the snapshot.
+
+        Args:
+            nodes (Iterable[tuple[float, float, int, bool]]): The nodes of the contour
+                as tuples of x, y, node type and smooth flag
+            closed (bool, optional): Whether the contour is closed. Defaults to True.
+        """
+        self.topology = {}
+        start = len(self.types)
+        for x, y, node_type, smooth in nodes:
+            self.x.append(x)
+            self.y.append(y)
+            self.types.append(node_type)
+            self.smooth.append(smooth)
+        end = len(self.types)
+        if end == start:
+            # Ignore empty contours
+            return
+
+        last = end - 1
+        self.prev.append(last if closed else -1)
+        self.prev.extend(range(start, last))
+        self.next.extend(range(start + 1, end))
+        self.next.append(start if closed else -1)
+        self.starts.append(end)
+        self.closed.append(closed)
+
+    def share_topology(self, other: "LayerSnapshot") -> bool:
+        """
+        Use the topology arrays and the topology results of another snapshot, if
+        both have the same contours and node types. Neither snapshot may get new
+        contours afterwards.
+
+        Args:
+            other (LayerSnapshot): The other snapshot, e.g. of another master of the
+                same glyph
+
+        Returns:
+            bool: Whether the topology is shared
+        """
+        if self.topology is other.topology:
+            return True
+
+        if (
+            self.types != other.types
+            or self.starts != other.starts
+            or self.closed != other.closed
+        ):
+            return False
+
+        self.types = other.types
+        self.starts = other.starts
+        self.closed = other.closed
+        self.prev = other.prev
+        self.next = other.next
+        self.topology = other.topology
+        return True
+
+    def cubic_segments(
+        self, contours: "Iterable[int] | None" = None
+    ) -> list[tuple[int, int, int, int]]:
+        """
+        Return the node indices of all complete cubic segments. The results are
+        kept with the topology.
+
+        Args:
+            contours (Iterable[int] | None, optional): The indices of the contours to
+                include. Defaults to None, which means all contours.
+
+        Returns:
+            list[tuple[int, int, int, int]]: The indices of the start node, the two
+                control points and the end node of each segment, ordered by end node
+        """
+        key = ("cubic_segments", None if contours is None else tuple(contours))
+        segments = self.topology.get(key)
+        if segments is not None:
+            return segments
+
+        if key[1] is None:
+            segments = self.cubic_segments_at(range(len(self.types)))
+        else:
+            starts = self.starts
+            segments = self.cubic_segments_at(
+                i
+                for contour in key[1]
+                for i in range(starts[contour], starts[contour + 1])
+            )
+        self.topology[key] = segments
+        return segments
+
+    def cubic_segments_at(
+        self, indices: "Iterable[int]"
+    ) -> list[tuple[int, int, int, int]]:
+        """
+        Return the node indices of the complete cubic segments that end at some
+        nodes. Nodes that are not the end of a cubic segment are skipped.
+
+        Args:
+            indices (Iterable[int]): The indices of the end nodes
+
+        Returns:
+            list[tuple[int, int, int, int]]: The indices of the start node, the two
+                control points and the end node of each segment
+        """
+        prev = self.prev
+        types = self.types
+        segments = []
+        for i in indices:
+            if types[i] != CURVE:
+                continue
+
+            i3 = prev[i]
+            i2 = -1 if i3 == -1 else prev[i3]
+            i1 = -1 if i2 == -1 else prev[i2]
+            if i1 != -1:
+                segments.append((i1, i2, i3, i))
+        return segments
+
+    def next_oncurve(self, i: int) -> int:
+        """
+        Return the index of the next oncurve node after a node.
+
+        Args:
+            i (int): The index of the node
+
+        Returns:
+            int: The index of the next oncurve node, or -1 if there is none
+        """
+        next_ = self.next
+        types = self.types
+        j = next_[i]
+        while j != -1 and j != i and types[j] == OFFCURVE:
+            j = next_[j]
+        return -1 if j == i else j
+
+    def changed_nodes(self, other: "LayerSnapshot") -> list[int] | None:
+        """
+        Compare the snapshot to an older snapshot of the same layer.
+
+        Args:
+            other (LayerSnapshot): The older snapshot
+
+        Returns:
+            list[int] | None: The indices of the nodes whose coordinates or smooth
+                flags have changed, or None if the contours or node types differ
+        """
+        if (
+            self.types != other.types
+            or self.starts != other.starts
+            or self.closed != other.closed
+        ):
+            return None
+
+        if self.x == other.x and self.y == other.y and self.smooth == other.smooth:
+            return []
+
+        return [
+            i
+            for i, (x, y, smooth, other_x, other_y, other_smooth) in enumerate(
+                zip(self.x, self.y, self.smooth, other.x, other.y, other.smooth)
+            )
+            if x != other_x or y != other_y or smooth != other_smooth
+        ]
+
+    def contour_bounds(self) -> "RectTuple | None":
+        """
+        Calculate the bounds of the contours, including the extrema of curves.
+
+        Returns:
+            RectTuple | None: The bounds, or None if there are no nodes
+        """
+        xs = self.x
+        ys = self.y
+        types = self.types
+        prev = self.prev
+        rects = []
+        for i in range(len(types)):
+            node_type = types[i]
+            if node_type == OFFCURVE:
+                continue
+
+            pt = (xs[i], ys[i])
+            rects.append((xs[i], ys[i], xs[i], ys[i]))
+            if node_type == CURVE:
+                i3 = prev[i]
+                i2 = -1 if i3 == -1 else prev[i3]
+                i1 = -1 if i2 == -1 else prev[i2]
+                if i1 != -1:
+                    rects.append(
+                        calcCubicBounds(
+                            (xs[i1], ys[i1]), (xs[i2], ys[i2]), (xs[i3], ys[i3]), pt
+                        )
+                    )
+            elif node_type == QCURVE:
+                # Collect the segment back to the previous oncurve node
+                segment = [pt]
+                j = prev[i]
+                while j != -1 and j != i:
+                    segment.append((xs[j], ys[j]))
+                    if types[j] != OFFCURVE:
+                        break
+                    j = prev[j]
+                if j == -1:
+                    # No start point, only include the control points
+                    rects.append(calcBounds(segment))
+                    continue
+
+                if j == i:
+                    # The only oncurve node of the contour is the start and end
+                    segment.append(pt)
+
+                segment.reverse()
+                # Split into quadratic curves at the implied oncurve points
+                start = segment[0]
+                for k in range(1, len(segment) - 1):
+                    p1 = segment[k]
+                    if k == len(segment) - 2:
+                        end = segment[k + 1]
+                    else:
+                        p2 = segment[k + 1]
+                        end = ((p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2)
+                    rects.append(calcQuadraticBounds(start, p1, end))
+                    start = end
+
+        if not rects:
+            # Contours that only consist of offcurve points
+            if not types:
+                return None
+
+            return calcBounds(list(zip(xs, ys)))
+
+        bounds = rects[0]
+        for rect in rects[1:]:
+            bounds = unionRect(bounds, rect)
+        return bounds
+
+    @classmethod
+    def from_layer(
+        cls, layer: "GSLayer", base_bounds: BaseBoundsCache | None = None
+    ) -> "LayerSnapshot":
+        """
+        Read the geometry of a layer. Each node is only accessed once.
+
+        Args:
+            layer (GSLayer): The layer
+            base_bounds (BaseBoundsCache | None, optional): A cache of the bounds of
+                base glyphs, for the components. Defaults to None.
+
+        Returns:
+            LayerSnapshot: The snapshot of the layer geometry
+        """
+        snapshot = cls(layer.parent.parent.upm)
+        for path in layer.paths:
+            nodes = []
+            for node in path.nodes:
+                pt = node.position
+                nodes.append((pt.x, pt.y, node_types[node.type], node.smooth))
+            snapshot.add_contour(nodes, path.closed)
+
+        layer_id = layer.layerId
+        master_id = layer.associatedMasterId
+        snapshot.components = [
+            component_snapshot(component, layer_id, master_id, base_bounds)
+            for component in layer.components
+        ]
+
+        try:
+            bounds = layer.bounds
+            x = bounds.origin.x
+            y = bounds.origin.y
+            snapshot.bounds = (x, y, x + bounds.size.width, y + bounds.size.height)
+        except AttributeError:
+            pass
+        return snapshot
+
+
+def component_snapshot(
+    component: "GSComponent",
+    layer_id: str,
+    master_id: str | None = None,
+    base_bounds: BaseBoundsCache | None = None,
+) -> ComponentSnapshot:
+    """
+    Read the data of a component that is needed by the checks.
+
+    Args:
+        component (GSComponent): The component
+        layer_id (str): The id of the layer the component belongs to. It is used to
+            find the matching layer of the base glyph.
+        master_id (str | None, optional): The id of the master the layer is
+            associated with, see `base_glyph_layer`. Defaults to None.
+        base_bounds (BaseBoundsCache | None, optional): A cache of the bounds of
+            base glyphs. Defaults to None.
+
+    Returns:
+        ComponentSnapshot: The component snapshot
+    """
+    bounds = None
+    base_glyph = component.component
+    if base_glyph is not None:
+        if base_bounds is not None:
+            bounds = base_bounds.get(base_glyph, layer_id, master_id)
+        else:
+            base_layer = base_glyph_layer(base_glyph, layer_id, master_id)
+            if base_layer is not None:
+                bounds = layer_bounds(base_layer)
+    return ComponentSnapshot(
+        component.componentName, tuple(component.transform), bounds
+    )
+
+
+def base_glyph_layer(
+    base_glyph: "GSGlyph", layer_id: str, master_id: str | None = None
+) -> "GSLayer | None":
+    """
+    Return the layer of a base glyph that matches the layer of a component.
+
+    Args:
+        base_glyph (GSGlyph): The base glyph
+        layer_id (str): The id of the layer the component belongs to
+        master_id (str | None, optional): The id of the master the layer is
+            associated with. Its layer is used if the base glyph has no layer with
+            the same id, e.g. for brace or bracket layers. Defaults to None.
+
+    Returns:
+        GSLayer | None: The layer, or None if there is none
+    """
+    base_layer = base_glyph.layers[layer_id]
+    if base_layer is None and master_id is not None:
+        base_layer = base_glyph.layers[master_id]
+    return base_layer
+
+
+def layer_bounds(layer: "GSLayer") -> "RectTuple":
+    """
+    Return the bounds of a layer as tuple.
+
+    Args:
+        layer (GSLayer): The layer
+
+    Returns:
+        RectTuple: The bounds as (xMin, yMin, xMax, yMax)
+    """
+    b = layer.bounds
+    x = b.origin.x
+    y = b.origin.y
+    return (x, y, x + b.size.width, y + b.size.height)
@@ -0,0 +1,249 @@
+from threading import RLock
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from redArrow.outlineTestGlyphs import OutlineCheck
+
+
+class CheckTiming:
+    """
+    The counters of one check method, or of whole layer checks.
+    """
+
+    __slots__ = ("calls", "seconds", "errors", "nodes")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.errors = 0
+        self.nodes = 0
+
+    def add(self, other: "CheckTiming") -> None:
+        self.calls += other.calls
+        self.seconds += other.seconds
+        self.errors += other.errors
+        self.nodes += other.nodes
+
+    def __repr__(self) -> str:
+        return "<CheckTiming %i calls, %.3f ms, %i errors, %i nodes>" % (
+            self.calls,
+            self.seconds * 1000,
+            self.errors,
+            self.nodes,
+        )
+
+
+class CheckStats:
+    """
+    Wall time, calls, errors and visited nodes of each check method, by glyph.
+
+    The statistics are only collected by outline checks that were given a
+    CheckStats object. Their check methods are then wrapped by timing functions;
+    without it, the checks run without any overhead.
+
+    The counters may be read on one thread while checks on another thread add to
+    them: the counters are only changed and read while `lock` is held. Checks on
+    other threads should count in their own CheckStats and merge them.
+    """
+
+    def __init__(self) -> None:
+        self.lock = RLock()
+        # The check name of each method, e.g. "_check_spike": "test_spikes"
+        self.check_names: dict[str, str] = {}
+        # The counters of each method, by glyph name
+        self.glyphs: dict[str, dict[str, CheckTiming]] = {}
+        # The counters of the whole layer checks, by glyph name
+        self.layers: dict[str, CheckTiming] = {}
+        self.begin("")
+
+    def reset(self) -> None:
+        """
+        Clear all counters.
+        """
+        with self.lock:
+            self.glyphs.clear()
+            self.layers.clear()
+            self.begin(self.glyph_name)
+
+    def begin(self, glyph_name: str) -> None:
+        """
+        Set the name of the glyph that is checked next. The counters of the
+        following checks are added to this glyph.
+
+        Args:
+            glyph_name (str): The glyph name
+        """
+        with self.lock:
+            self.glyph_name = glyph_name
+            self._methods = self.glyphs.setdefault(glyph_name, {})
+
+    def add_layer(self, seconds: float, nodes: int, errors: int) -> None:
+        """
+        Count a whole layer check of the current glyph.
+
+        Args:
+            seconds (float): The duration of the check
+            nodes (int): The number of nodes of the layer
+            errors (int): The number of errors that were found
+        """
+        with self.lock:
+            timing = self.layers.get(self.glyph_name)
+            if timing is None:
+                timing = self.layers[self.glyph_name] = CheckTiming()
+            timing.calls += 1
+            timing.seconds += seconds
+            timing.nodes += nodes
+            timing.errors += errors
+
+    def merge(self, other: "CheckStats") -> None:
+        """
+        Add the counters of other statistics, e.g. of checks on a worker thread.
+
+        Args:
+            other (CheckStats): The statistics to add. They must not be changed
+                while they are merged.
+        """
+        with self.lock:
+            self.check_names.update(other.check_names)
+            for glyph_name, methods in other.glyphs.items():
+                own_methods = self.glyphs.setdefault(glyph_name, {})
+                for name, timing in methods.items():
+                    own_methods.setdefault(name, CheckTiming()).add(timing)
+            for glyph_name, timing in other.layers.items():
+                self.layers.setdefault(glyph_name, CheckTiming()).add(timing)
+
+    def wrap(
+        self,
+        outline_check: "OutlineCheck",
+        method: Callable[..., Any],
+        check_name: str,
+        scope: str = "node",
+    ) -> Callable[..., Any]:
+        """
+        Return a function that calls a check method and counts the call.
+
+        Args:
+            outline_check (OutlineCheck): The outline check the method belongs to
+            method (Callable[..., Any]): The bound check method
+            check_name (str): The name of the check, e.g. "test_spikes"
+            scope (str, optional): What the method is called for: "node" (with a
+                node index), "component", "layer" (once for the whole layer),
+                "segments" (with a list of segments), or "nodes" (with a list of
+                node indices). Defaults to "node".
+
+        Returns:
+            Callable[..., Any]: The wrapped method
+        """
+        name = method.__name__
+        lock = self.lock
+        with lock:
+            self.check_names[name] = check_name
+
+        def timed(*args: Any) -> Any:
+            errors = len(outline_check.errors)
+            start = perf_counter()
+            result = method(*args)
+            seconds = perf_counter() - start
+            with lock:
+                timing = self._methods.get(name)
+                if timing is None:
+                    timing = self._methods[name] = CheckTiming()
+                timing.seconds += seconds
+                timing.calls += 1
+                timing.errors += len(outline_check.errors) - errors
+                if scope == "node":
+                    timing.nodes += 1
+                elif scope == "layer":
+                    timing.nodes += len(outline_check.snapshot)
+                elif scope == "segments":
+                    timing.nodes += 4 * len(args[0])
+                elif scope == "nodes":
+                    timing.nodes += len(args[0])
+            return result
+
+        timed.__name__ = name
+        return timed
+
+    def totals(self) -> dict[str, CheckTiming]:
+        """
+        Return the counters of each method, summed up over all glyphs.
+
+        Returns:
+            dict[str, CheckTiming]: The counters by method name
+        """
+        totals: dict[str, CheckTiming] = {}
+        with self.lock:
+            for methods in self.glyphs.values():
+                for name, timing in methods.items():
+                    totals.setdefault(name, CheckTiming()).add(timing)
+        return totals
+
+    def report(self, max_glyphs: int = 10) -> str:
+        """
+        Return the statistics as a table of the check methods, sorted by their
+        total time, and a table of the slowest glyphs.
+
+        Args:
+            max_glyphs (int, optional): The number of glyphs to list. Defaults to 10.
+
+        Returns:
+            str: The report
+        """
+        with self.lock:
+            return self._report(max_glyphs)
+
+    def _report(self, max_glyphs: int) -> str:
+        layer_total = CheckTiming()
+        for timing in self.layers.values():
+            layer_total.add(timing)
+        lines = [
+            "Red Arrow statistics: %i layer checks of %i glyphs in %.2f ms"
+            % (layer_total.calls, len(self.layers), layer_total.seconds * 1000),
+            "",
+            "%-36s %-30s %8s %8s %8s %10s %9s"
+            % ("Method", "Check", "Calls", "Nodes", "Errors", "Total ms", "µs/call"),
+        ]
+        totals = sorted(self.totals().items(), key=lambda item: -item[1].seconds)
+        for name, t in totals:
+            lines.append(
+                "%-36s %-30s %8i %8i %8i %10.2f %9.2f"
+                % (
+                    name,
+                    self.check_names.get(name, ""),
+                    t.calls,
+                    t.nodes,
+                    t.errors,
+                    t.seconds * 1000,
+                    t.seconds / max(1, t.calls) * 1000000,
+                )
+            )
+
+        lines.extend(
+            [
+                "",
+                "%-36s %8s %8s %10s  %s"
+                % ("Glyph", "Checks", "Nodes", "ms/check", "Slowest method"),
+            ]
+        )
+        glyphs = sorted(
+            self.layers.items(),
+            key=lambda item: -item[1].seconds / max(1, item[1].calls),
+        )
+        for glyph_name, t in glyphs[:max_glyphs]:
+            slowest = ""
+            methods = self.glyphs.get(glyph_name)
+            if methods:
+                name, m = max(methods.items(), key=lambda item: item[1].seconds)
+                slowest = "%s (%.2f ms)" % (name, m.seconds / t.calls * 1000)
+            lines.append(
+                "%-36s %8i %8i %10.3f  %s"
+                % (
+                    glyph_name,
+                    t.calls,
+                    t.nodes // max(1, t.calls),
+                    t.seconds / max(1, t.calls) * 1000,
+                    slowest,
+                )
+            )
+        return "\n".join(lines)
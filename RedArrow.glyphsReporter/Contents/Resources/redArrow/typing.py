@@ -5,6 +5,7 @@ CubicCurveTuple: TypeAlias = tuple[PointTuple, PointTuple, PointTuple, PointTupl
 QuadraticCurveTuple: TypeAlias = tuple[PointTuple, PointTuple, PointTuple]
 RectTuple: TypeAlias = tuple[float, float, float, float]
 Vector2D: TypeAlias = tuple[float, float]
+TransformTuple: TypeAlias = tuple[float, float, float, float, float, float]
 
 
 class RedArrowOptionsDict(TypedDict):
@@ -0,0 +1,358 @@
+"""
+Measure the speed of the outline checks outside of Glyphs.
+
+Synthetic glyphs are built with the stand-in classes from `glyphs_stand_in.py`,
+then checked several times. The script reports the time per `check_layer` call
+and the statistics of each check method, e.g.:
+
+    python3 dev-scripts/benchmark.py --glyphs 200 --nodes 60 --quadratic 0.25
+
+Compare the output before and after a change on the same machine.
+"""
+
+import argparse
+import random
+from math import cos, pi, sin, tan
+from time import perf_counter
+
+from glyphs_stand_in import (
+    GSCURVE,
+    GSLINE,
+    GSOFFCURVE,
+    GSQCURVE,
+    GSComponent,
+    GSFont,
+    GSGlyph,
+    GSLayer,
+    GSNode,
+    GSPath,
+    NSMakePoint,
+)
+from redArrow.cache import ContourCache
+from redArrow.defaults import default_checks, default_options
+from redArrow.outlineTestGlyphs import OutlineCheck
+from redArrow.snapshot import LayerSnapshot
+from redArrow.stats import CheckStats
+
+
+def _coordinate(rng: random.Random, value: float, fractional: float) -> float:
+    if rng.random() < fractional:
+        return round(value, 1)
+    return float(round(value))
+
+
+def make_contour(
+    rng: random.Random,
+    center: tuple[float, float],
+    radius: tuple[float, float],
+    segments: int,
+    curve_ratio: float,
+    quadratic: bool,
+    quad_run: int,
+    jitter: float,
+    fractional: float,
+) -> GSPath:
+    """
+    Build a closed contour around an ellipse.
+
+    Args:
+        rng (random.Random): The random number generator
+        center (tuple[float, float]): The center of the ellipse
+        radius (tuple[float, float]): The horizontal and vertical radius
+        segments (int): The number of segments, i.e. oncurve nodes
+        curve_ratio (float): The probability of a segment being a curve
+        quadratic (bool): Whether the curves are quadratic
+        quad_run (int): The number of offcurve nodes of a quadratic curve
+        jitter (float): The maximum random offset of a node
+        fractional (float): The probability of a coordinate not being rounded
+
+    Returns:
+        GSPath: The contour
+    """
+    cx, cy = center
+    rx, ry = radius
+    step = 2 * pi / segments
+    angles = [i * step + rng.uniform(-0.2, 0.2) * step for i in range(segments)]
+    angles.append(angles[0] + 2 * pi)
+
+    def point(a: float, offset: float = 0.0) -> tuple[float, float]:
+        return (
+            cx + rx * cos(a) + rng.uniform(-offset, offset),
+            cy + ry * sin(a) + rng.uniform(-offset, offset),
+        )
+
+    def node(pt: tuple[float, float], node_type: str, smooth: bool = False) -> GSNode:
+        return GSNode(
+            NSMakePoint(
+                _coordinate(rng, pt[0], fractional),
+                _coordinate(rng, pt[1], fractional),
+            ),
+            node_type,
+            smooth,
+        )
+
+    nodes = []
+    for i in range(segments):
+        a0 = angles[i]
+        a1 = angles[i + 1]
+        end = point(a1, jitter)
+        if rng.random() >= curve_ratio:
+            nodes.append(node(end, GSLINE))
+            continue
+
+        if quadratic:
+            # Offcurve points on the tangents of a slightly larger ellipse
+            for j in range(quad_run):
+                a = a0 + (j + 0.5) * (a1 - a0) / quad_run
+                k = 1 / cos((a1 - a0) / (2 * quad_run))
+                nodes.append(
+                    node((cx + k * rx * cos(a), cy + k * ry * sin(a)), GSOFFCURVE)
+                )
+            nodes.append(node(end, GSQCURVE, rng.random() < 0.7))
+            continue
+
+        # Cubic approximation of the elliptic arc
+        h = 4 / 3 * tan((a1 - a0) / 4)
+        start = point(a0)
+        nodes.append(
+            node(
+                (
+                    start[0] - h * rx * sin(a0) + rng.uniform(-jitter, jitter),
+                    start[1] + h * ry * cos(a0) + rng.uniform(-jitter, jitter),
+                ),
+                GSOFFCURVE,
+            )
+        )
+        nodes.append(
+            node(
+                (
+                    end[0] + h * rx * sin(a1) + rng.uniform(-jitter, jitter),
+                    end[1] - h * ry * cos(a1) + rng.uniform(-jitter, jitter),
+                ),
+                GSOFFCURVE,
+            )
+        )
+        nodes.append(node(end, GSCURVE, rng.random() < 0.7))
+
+    # Like in Glyphs, the start node of the closed contour is the last node
+    return GSPath(nodes, closed=True)
+
+
+def make_font(
+    glyphs: int = 100,
+    nodes: int = 40,
+    contours: int = 2,
+    curve_ratio: float = 0.6,
+    quadratic: float = 0.0,
+    quad_run: int = 2,
+    components: float = 0.0,
+    jitter: float = 3.0,
+    fractional: float = 0.01,
+    seed: int = 0,
+) -> GSFont:
+    """
+    Build a font of synthetic glyphs with one master.
+
+    Args:
+        glyphs (int, optional): The number of glyphs. Defaults to 100.
+        nodes (int, optional): The number of oncurve nodes per glyph. Defaults to 40.
+        contours (int, optional): The number of contours per glyph. Defaults to 2.
+        curve_ratio (float, optional): The probability of a segment being a curve.
+            Defaults to 0.6.
+        quadratic (float, optional): The probability of a contour having quadratic
+            curves. Defaults to 0.0.
+        quad_run (int, optional): The number of offcurve nodes of a quadratic
+            curve. Defaults to 2.
+        components (float, optional): The probability of a glyph also having a
+            component of a previous glyph. Defaults to 0.0.
+        jitter (float, optional): The maximum random offset of a node, which
+            produces extremum, smooth and collinear errors. Defaults to 3.0.
+        fractional (float, optional): The probability of a coordinate not being
+            rounded. Defaults to 0.01.
+        seed (int, optional): The seed of the random number generator. Defaults
+            to 0.
+
+    Returns:
+        GSFont: The font
+    """
+    rng = random.Random(seed)
+    font = GSFont(1000)
+    per_contour = max(2, nodes // max(1, contours))
+    for g in range(glyphs):
+        glyph = GSGlyph(f"glyph{g:05d}")
+        layer = GSLayer("m01")
+        for c in range(contours):
+            size = 300 / (c + 1)
+            layer.addPath(
+                make_contour(
+                    rng,
+                    (350 + rng.uniform(-20, 20), 350 + rng.uniform(-20, 20)),
+                    (size * rng.uniform(0.8, 1.2), size * rng.uniform(0.8, 1.2)),
+                    per_contour,
+                    curve_ratio,
+                    rng.random() < quadratic,
+                    quad_run,
+                    jitter,
+                    fractional,
+                )
+            )
+        if g > 0 and rng.random() < components:
+            layer.addComponent(
+                GSComponent(
+                    f"glyph{rng.randrange(g):05d}",
+                    (1, 0, 0, 1, rng.randrange(-200, 200), rng.randrange(-200, 200)),
+                )
+            )
+        glyph.addLayer(layer)
+        font.addGlyph(glyph)
+    return font
+
+
+def run(
+    font: GSFont,
+    run_checks: list[str],
+    repeat: int = 5,
+    cache: bool = False,
+) -> None:
+    """
+    Check all layers of a font and print the timings.
+
+    Args:
+        font (GSFont): The font
+        run_checks (list[str]): The names of the checks to be run
+        repeat (int, optional): How often each layer is checked. Defaults to 5.
+        cache (bool, optional): Whether to use a contour cache. Defaults to False,
+            so that each repetition does the full work.
+    """
+    layers = [glyph.layers[0] for glyph in font.glyphs]
+    node_count = sum(len(p.nodes) for layer in layers for p in layer.paths)
+    contour_cache = ContourCache() if cache else None
+    outline_check = OutlineCheck(None, dict(default_options), run_checks, contour_cache)
+
+    # Reading the layers
+    snapshot_times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for layer in layers:
+            LayerSnapshot.from_layer(layer)
+        snapshot_times.append(perf_counter() - start)
+
+    # Whole check_layer calls, without statistics
+    layer_times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for layer in layers:
+            outline_check.layer = layer
+            outline_check.check_layer()
+        layer_times.append(perf_counter() - start)
+
+    # The individual checks
+    stats = CheckStats()
+    outline_check = OutlineCheck(
+        None, dict(default_options), run_checks, contour_cache, stats
+    )
+    for _ in range(repeat):
+        for layer in layers:
+            outline_check.layer = layer
+            outline_check.check_layer()
+
+    n = len(layers)
+    print(f"{n} layers, {node_count} nodes, {repeat} repetitions")
+    print(f"Checks: {', '.join(c[5:] for c in run_checks)}")
+    print()
+    print(
+        "%-28s %10.3f ms per layer (best of %i)"
+        % ("LayerSnapshot.from_layer", min(snapshot_times) / n * 1000, repeat)
+    )
+    print(
+        "%-28s %10.3f ms per layer (best of %i)"
+        % ("check_layer", min(layer_times) / n * 1000, repeat)
+    )
+    print(
+        "%-28s %10.3f µs per node"
+        % ("", min(layer_times) / max(1, node_count) * 1000000)
+    )
+    print()
+    print(stats.report(max_glyphs=5))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure the speed of the Red Arrow outline checks."
+    )
+    parser.add_argument("--glyphs", type=int, default=100, help="Number of glyphs")
+    parser.add_argument("--nodes", type=int, default=40, help="Oncurve nodes per glyph")
+    parser.add_argument("--contours", type=int, default=2, help="Contours per glyph")
+    parser.add_argument(
+        "--curves",
+        type=float,
+        default=0.6,
+        help="Probability of a segment being a curve",
+    )
+    parser.add_argument(
+        "--quadratic",
+        type=float,
+        default=0.0,
+        help="Probability of a contour having quadratic curves",
+    )
+    parser.add_argument(
+        "--quad-run",
+        type=int,
+        default=2,
+        help="Offcurve nodes per quadratic curve",
+    )
+    parser.add_argument(
+        "--components",
+        type=float,
+        default=0.0,
+        help="Probability of a glyph having a component",
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=3.0, help="Maximum random node offset"
+    )
+    parser.add_argument(
+        "--fractional",
+        type=float,
+        default=0.01,
+        help="Probability of a fractional coordinate",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Repetitions of each measurement"
+    )
+    parser.add_argument("--cache", action="store_true", help="Use a contour cache")
+    parser.add_argument(
+        "-c",
+        "--check",
+        action="append",
+        dest="checks",
+        metavar="CHECK",
+        help="A check to run, e.g. 'extrema'. Can be given more than once. "
+        "By default, all checks are run.",
+    )
+    args = parser.parse_args()
+
+    run_checks = default_checks
+    if args.checks:
+        run_checks = [c if c.startswith("test_") else f"test_{c}" for c in args.checks]
+        unknown = set(run_checks) - set(default_checks)
+        if unknown:
+            parser.error("Unknown checks: %s" % ", ".join(sorted(unknown)))
+
+    font = make_font(
+        glyphs=args.glyphs,
+        nodes=args.nodes,
+        contours=args.contours,
+        curve_ratio=args.curves,
+        quadratic=args.quadratic,
+        quad_run=args.quad_run,
+        components=args.components,
+        jitter=args.jitter,
+        fractional=args.fractional,
+        seed=args.seed,
+    )
+    run(font, run_checks, args.repeat, args.cache)
+
+
+if __name__ == "__main__":
+    main()
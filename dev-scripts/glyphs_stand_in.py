@@ -0,0 +1,203 @@
+"""
+A minimal pure-Python stand-in for the parts of the GlyphsApp API that Red Arrow
+reads, so that the outline checks can be run and timed outside of Glyphs.
+
+Only the attributes that are used by `LayerSnapshot.from_layer` and
+`OutlineCheck` are implemented.
+"""
+
+import os
+import sys
+from typing import Iterable, NamedTuple, Sequence
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "RedArrow.glyphsReporter",
+        "Contents",
+        "Resources",
+    ),
+)
+
+from redArrow.outlineTestGlyphs import transform_bounds  # noqa: E402
+from redArrow.snapshot import LayerSnapshot, node_types  # noqa: E402
+
+GSLINE = "line"
+GSCURVE = "curve"
+GSQCURVE = "qcurve"
+GSOFFCURVE = "offcurve"
+
+
+class NSPoint(NamedTuple):
+    x: float
+    y: float
+
+
+class NSSize(NamedTuple):
+    width: float
+    height: float
+
+
+class NSRect(NamedTuple):
+    origin: NSPoint
+    size: NSSize
+
+
+def NSMakePoint(x: float, y: float) -> NSPoint:
+    return NSPoint(x, y)
+
+
+def NSMakeRect(x: float, y: float, width: float, height: float) -> NSRect:
+    return NSRect(NSPoint(x, y), NSSize(width, height))
+
+
+class GSNode:
+    def __init__(
+        self, position: NSPoint, type: str = GSLINE, smooth: bool = False
+    ) -> None:
+        self.position = position
+        self.type = type
+        self.smooth = smooth
+        self.parent: "GSPath | None" = None
+
+    def __repr__(self) -> str:
+        return "<GSNode %g %g %s%s>" % (
+            self.position.x,
+            self.position.y,
+            self.type,
+            " smooth" if self.smooth else "",
+        )
+
+
+class GSPath:
+    def __init__(self, nodes: Iterable[GSNode] = (), closed: bool = True) -> None:
+        self.nodes: list[GSNode] = []
+        self.closed = closed
+        self.parent: "GSLayer | None" = None
+        for node in nodes:
+            node.parent = self
+            self.nodes.append(node)
+
+
+class GSComponent:
+    def __init__(
+        self,
+        componentName: str,
+        transform: Sequence[float] = (1, 0, 0, 1, 0, 0),
+    ) -> None:
+        self.componentName = componentName
+        self.transform = tuple(transform)
+        self.parent: "GSLayer | None" = None
+
+    @property
+    def position(self) -> NSPoint:
+        return NSMakePoint(*self.transform[4:])
+
+    @property
+    def component(self) -> "GSGlyph | None":
+        # The base glyph, looked up in the font of the layer
+        try:
+            return self.parent.parent.parent.glyphs[self.componentName]
+        except (AttributeError, KeyError):
+            return None
+
+
+class GSLayer:
+    def __init__(self, layerId: str = "m01") -> None:
+        self.layerId = layerId
+        self.associatedMasterId = layerId
+        self.paths: list[GSPath] = []
+        self.components: list[GSComponent] = []
+        self.parent: "GSGlyph | None" = None
+
+    @property
+    def shapes(self) -> list:
+        return self.paths + self.components
+
+    def addPath(self, path: GSPath) -> None:
+        path.parent = self
+        self.paths.append(path)
+
+    def addComponent(self, component: GSComponent) -> None:
+        component.parent = self
+        self.components.append(component)
+
+    @property
+    def bounds(self) -> NSRect:
+        upm = 1000 if self.parent is None else self.parent.parent.upm
+        snapshot = LayerSnapshot(upm)
+        for path in self.paths:
+            snapshot.add_contour(
+                [
+                    (n.position.x, n.position.y, node_types[n.type], n.smooth)
+                    for n in path.nodes
+                ],
+                path.closed,
+            )
+        rects = [snapshot.contour_bounds()] if snapshot.contour_count else []
+        for component in self.components:
+            base = component.component
+            if base is not None:
+                b = base.layers[self.layerId].bounds
+                x, y = b.origin
+                rect = (x, y, x + b.size.width, y + b.size.height)
+                rects.append(transform_bounds(rect, component.transform))
+        if not rects:
+            return NSMakeRect(0, 0, 0, 0)
+
+        xMin = min(r[0] for r in rects)
+        yMin = min(r[1] for r in rects)
+        xMax = max(r[2] for r in rects)
+        yMax = max(r[3] for r in rects)
+        return NSMakeRect(xMin, yMin, xMax - xMin, yMax - yMin)
+
+
+class _GlyphLayers(list):
+    # Like GSGlyph.layers, the layers can be accessed by index or by layer id.
+    # Unknown layer ids return None.
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for layer in self:
+                if layer.layerId == key:
+                    return layer
+            return None
+        return super().__getitem__(key)
+
+
+class GSGlyph:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.layers = _GlyphLayers()
+        self.parent: "GSFont | None" = None
+
+    def lastOperationInterval(self) -> float:
+        # The glyphs are not edited
+        return 0.0
+
+    def addLayer(self, layer: GSLayer) -> None:
+        layer.parent = self
+        self.layers.append(layer)
+
+
+class _FontGlyphs(list):
+    # Like GSFont.glyphs, the glyphs can be accessed by index or by name
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for glyph in self:
+                if glyph.name == key:
+                    return glyph
+            raise KeyError(key)
+        return super().__getitem__(key)
+
+
+class GSFont:
+    def __init__(self, upm: int = 1000) -> None:
+        self.upm = upm
+        self.glyphs = _FontGlyphs()
+        self.filepath = None
+
+    def addGlyph(self, glyph: GSGlyph) -> None:
+        glyph.parent = self
+        self.glyphs.append(glyph)